@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+
+default_max_bytes = 256 * 2**20
+
+
+def get_file_signature(files: list[Path]) -> str:
+    """Get a hash that changes whenever any of the files is replaced or modified.
+
+    Parameters
+    ----------
+    files
+        The files to make the signature of.
+
+    Returns
+    -------
+    A hex digest of each file's path, size, and modification time.
+
+    """
+    signature = []
+    for file in sorted(Path(f).resolve() for f in files):
+        stat = file.stat()
+        signature.append([str(file), stat.st_size, stat.st_mtime_ns])
+    return hashlib.sha1(json.dumps(signature).encode()).hexdigest()
+
+
+class FieldCache:
+    """An on-disk cache of arrays derived from a set of files, like simulation fields or radiative property tables.
+
+    Each array is written once, in whatever shape and dtype it's computed in, to an uncompressed .npy file. Later
+    requests memory map that file, so they return instantly and only the parts of the array that are actually used are
+    ever read from disk.
+
+    Parameters
+    ----------
+    directory
+        The directory to keep the cached arrays in. It's created if it doesn't exist, and can be shared by any number
+        of caches since each set of source files gets its own subdirectory.
+    source_files
+        The files the arrays are derived from. A cached array is only used if none of them have changed since it
+        was written.
+    max_bytes
+        The approximate amount of memory to use while writing arrays that can be computed one block at a time.
+
+    """
+    def __init__(self, directory: Path, source_files: list[Path], max_bytes: int = default_max_bytes):
+        source_paths = sorted(str(Path(f).resolve()) for f in source_files)
+        self._directory = Path(directory) / hashlib.sha1(json.dumps(source_paths).encode()).hexdigest()
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._source_files = source_files
+        self._max_bytes = max_bytes
+
+    def get(self, key: str, compute: Callable[[], np.ndarray]) -> np.memmap:
+        """Get an array from the cache, computing and writing it first if it isn't there.
+
+        Parameters
+        ----------
+        key
+            A name that identifies the array, like the name of the accessor that makes it.
+        compute
+            A function that makes the array. If it returns an object with an iter_blocks method, like
+            gcm.lazy.LazySolArray, the array is written one block of its first axis at a time and is never entirely in
+            memory.
+
+        Returns
+        -------
+        A read-only memory map of the array.
+
+        """
+        file = self._directory / f'{key}.{get_file_signature(self._source_files)}.npy'
+        if not file.exists():
+            self._remove_stale_files(key)
+            self._write(file, compute())
+        return np.load(file, mmap_mode='r')
+
+    def _write(self, file: Path, array: np.ndarray) -> None:
+        # Write to a temporary name first so that a crash never leaves a partial array behind
+        temporary_file = file.with_name(f'{file.name}.{os.getpid()}.tmp')
+        output = np.lib.format.open_memmap(temporary_file, mode='w+', dtype=array.dtype, shape=array.shape)
+        if hasattr(array, 'iter_blocks'):
+            bytes_per_row = array.nbytes // max(array.shape[0], 1)
+            for rows, block in array.iter_blocks(max(1, self._max_bytes // max(bytes_per_row, 1))):
+                output[rows] = block
+        else:
+            output[:] = array
+        output.flush()
+        del output
+        os.replace(temporary_file, file)
+
+    def _remove_stale_files(self, key: str) -> None:
+        for file in self._directory.glob(f'{key}.*.npy'):
+            if file.name.rsplit('.', 2)[0] == key:
+                file.unlink(missing_ok=True)
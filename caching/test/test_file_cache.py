@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pytest
+
+from caching.file_cache import FieldCache, get_file_signature
+from gcm.lazy import LazySolArray
+
+
+class TestGetFileSignature:
+    def test_modified_file_changes_the_signature(self, tmp_path):
+        file = tmp_path / 'file.nc'
+        file.write_bytes(b'0')
+        signature = get_file_signature([file])
+        os.utime(file, ns=(file.stat().st_atime_ns, file.stat().st_mtime_ns + 10**9))
+        assert get_file_signature([file]) != signature
+
+    def test_file_order_does_not_matter(self, tmp_path):
+        files = [tmp_path / 'a.nc', tmp_path / 'b.nc']
+        for file in files:
+            file.write_bytes(b'0')
+        assert get_file_signature(files) == get_file_signature(files[::-1])
+
+
+class TestFieldCache:
+    @pytest.fixture
+    def source_file(self, tmp_path):
+        file = tmp_path / 'source.nc'
+        file.write_bytes(b'0')
+        return file
+
+    @pytest.fixture
+    def cache(self, tmp_path, source_file) -> FieldCache:
+        return FieldCache(tmp_path / 'cache', [source_file])
+
+    @pytest.fixture
+    def field(self) -> np.ndarray:
+        return np.random.default_rng(0).random((10, 4, 3))
+
+    @pytest.fixture
+    def calls(self) -> list:
+        return []
+
+    @pytest.fixture
+    def compute(self, field, calls):
+        def compute() -> np.ndarray:
+            calls.append(1)
+            return field
+
+        return compute
+
+    def test_field_is_computed_once_and_memory_mapped(self, cache, compute, field, calls):
+        cache.get('field', compute)
+        cached = cache.get('field', compute)
+        assert isinstance(cached, np.memmap) and not cached.flags.writeable
+        assert np.array_equal(cached, field) and len(calls) == 1
+
+    def test_field_is_reused_by_later_instances(self, tmp_path, source_file, cache, compute, calls):
+        cache.get('field', compute)
+        FieldCache(tmp_path / 'cache', [source_file]).get('field', compute)
+        assert len(calls) == 1
+
+    def test_changed_source_file_replaces_the_field(self, cache, compute, source_file, calls):
+        cache.get('field', compute)
+        os.utime(source_file, ns=(source_file.stat().st_atime_ns, source_file.stat().st_mtime_ns + 10**9))
+        cache.get('field', compute)
+        assert len(calls) == 2 and len(list(cache._directory.glob('field.*.npy'))) == 1
+
+    def test_writing_a_field_keeps_fields_whose_key_starts_the_same(self, cache, compute):
+        cache.get('tau-400.5', compute)
+        cache.get('tau-400', compute)
+        assert len(list(cache._directory.glob('tau-400.5.*.npy'))) == 1
+
+    def test_lazy_field_is_written_one_block_at_a_time(self, tmp_path, source_file, field):
+        reads = []
+
+        def read(sols: slice) -> np.ndarray:
+            reads.append(sols)
+            return field[sols]
+
+        cache = FieldCache(tmp_path / 'cache', [source_file], max_bytes=4 * 3 * 8 * 4)
+        cached = cache.get('field', lambda: LazySolArray(read, field.shape, field.dtype))
+        assert np.array_equal(cached, field) and reads == [slice(0, 4), slice(4, 8), slice(8, 10)]
+
+    def test_no_temporary_files_are_left_behind(self, cache, compute):
+        cache.get('field', compute)
+        assert not list(cache._directory.glob('*.tmp'))
+
+    def test_different_source_files_use_different_directories(self, tmp_path, source_file, cache):
+        other_file = tmp_path / 'other.nc'
+        other_file.write_bytes(b'0')
+        assert FieldCache(tmp_path / 'cache', [other_file])._directory != cache._directory
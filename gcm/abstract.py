@@ -1,7 +1,62 @@
 import abc
 
+import numpy as np
+
+from gcm.local_time import LocalTimeMapper
+from gcm.sampler import GridSampler
+
 
 class AbstractSimulation(metaclass=abc.ABCMeta):
+    # The dtype of the fields of every object that isn't given its own. None keeps the dtype in the files.
+    default_dtype = None
+
+    @classmethod
+    def set_default_dtype(cls, dtype: np.dtype | None) -> None:
+        """Set the dtype of the fields returned by objects that weren't given their own dtype.
+
+        Calling this on AbstractSimulation changes every kind of simulation; calling it on a subclass only changes that
+        kind.
+
+        Parameters
+        ----------
+        dtype
+            The dtype, like np.float32. None returns fields in the dtype they have in the files.
+
+        """
+        cls.default_dtype = None if dtype is None else np.dtype(dtype)
+
+    @property
+    def dtype(self) -> np.dtype | None:
+        """Get the dtype this object's fields are returned as, or None if they keep the dtype in the files."""
+        return self._dtype if self._dtype is not None else type(self).default_dtype
+
+    def _get_dtype(self, native_dtype: np.dtype) -> np.dtype:
+        return np.dtype(native_dtype) if self.dtype is None else self.dtype
+
+    @abc.abstractmethod
+    def get_longitude_centers(self) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def get_local_time_centers(self) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def get_latitude_edges(self) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def get_longitude_edges(self) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def get_simulation_sol_edges(self) -> np.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def get_local_time_edges(self) -> np.ndarray:
+        pass
+
     @abc.abstractmethod
     def get_surface_pressure(self):
         pass
@@ -17,3 +72,23 @@ class AbstractSimulation(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def get_atmospheric_temperature(self):
         pass
+
+    def make_sampler(self) -> GridSampler:
+        """Make an object that samples this simulation's fields at many observation points at once.
+
+        Returns
+        -------
+        A sampler built from this simulation's grid.
+
+        """
+        return GridSampler(self)
+
+    def make_local_time_mapper(self) -> LocalTimeMapper:
+        """Make an object that moves this simulation's fields between universal time and local solar time.
+
+        Returns
+        -------
+        A mapper built from this simulation's longitudes and time of day.
+
+        """
+        return LocalTimeMapper(self.get_longitude_centers(), self.get_local_time_centers())
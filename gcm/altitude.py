@@ -0,0 +1,90 @@
+import numpy as np
+
+
+# The specific gas constant [J / kg / K] of Mars' atmosphere, using its mean molecular mass of 43.34 g/mol
+mars_gas_constant = 191.8
+
+# The mean surface gravity [m / s**2] of Mars
+mars_gravity = 3.72
+
+
+def get_altitude_edges(surface_elevation: np.ndarray, pressure: np.ndarray, temperature: np.ndarray,
+                       gas_constant: float = mars_gas_constant, gravity: float = mars_gravity) -> np.ndarray:
+    """Get the altitude of every layer boundary of many columns at once with the hypsometric equation.
+
+    Parameters
+    ----------
+    surface_elevation
+        The elevation [m] of the bottom of each column. It must broadcast to the shape of pressure without its last
+        axis, so the (lat, lon) elevation of a simulation works for its (sol, local time, lat, lon) columns.
+    pressure
+        The pressure [Pa] at the layer boundaries with shape (..., boundary). The boundaries can go from the top down
+        (like the Ames levels) or from the surface up (like the PCM levels).
+    temperature
+        The temperature [K] of each layer with shape (..., layer). There's one fewer layer than boundaries.
+    gas_constant
+        The specific gas constant [J / kg / K] of the atmosphere.
+    gravity
+        The gravitational acceleration [m / s**2], which is taken to be constant with altitude.
+
+    Returns
+    -------
+    The altitude [m] of each boundary, in the same order as the input boundaries.
+
+    Notes
+    -----
+    Each layer is taken to be isothermal, so it's gas_constant * temperature / gravity * ln(p_bottom / p_top) thick.
+    A layer whose top is at zero pressure has no finite top, so its top is put as far above its midpoint (the mean of
+    its boundary pressures) as its midpoint is above its bottom.
+
+    """
+    pressure = np.asarray(pressure, dtype=float)
+    temperature = np.asarray(temperature)
+    top_first = pressure.reshape(-1, pressure.shape[-1])[0, 0] < pressure.reshape(-1, pressure.shape[-1])[0, -1]
+    if top_first:
+        pressure = pressure[..., ::-1]
+        temperature = temperature[..., ::-1]
+
+    scale_height = gas_constant / gravity * temperature
+    bottom = pressure[..., :-1]
+    top = pressure[..., 1:]
+    with np.errstate(divide='ignore'):
+        thickness = np.where(top > 0, scale_height * np.log(bottom / top),
+                             2 * scale_height * np.log(2 * bottom / (bottom + top)))
+
+    altitude = np.empty(np.broadcast_shapes(pressure.shape[:-1], np.shape(surface_elevation)) + pressure.shape[-1:])
+    altitude[..., 0] = surface_elevation
+    np.cumsum(thickness, axis=-1, out=altitude[..., 1:])
+    altitude[..., 1:] += altitude[..., :1]
+    return altitude[..., ::-1] if top_first else altitude
+
+
+def get_altitude_centers(altitude_edges: np.ndarray, pressure: np.ndarray) -> np.ndarray:
+    """Get the altitude of the middle of every layer from the altitude of its boundaries.
+
+    Parameters
+    ----------
+    altitude_edges
+        The altitude [m] of each layer boundary with shape (..., boundary), like the output of get_altitude_edges.
+    pressure
+        The pressure [Pa] at the same boundaries.
+
+    Returns
+    -------
+    The altitude [m] of each layer's midpoint (the mean of its boundary pressures) with shape (..., layer).
+
+    Notes
+    -----
+    Each layer is isothermal, so the fraction of its thickness between one boundary and its midpoint is
+    ln(p_boundary / p_midpoint) / ln(p_boundary / p_other_boundary), whatever its temperature is. That makes this
+    much cheaper than integrating the temperature again. Layers that reach zero pressure have their midpoint half way
+    between their boundaries, to be consistent with get_altitude_edges.
+
+    """
+    pressure = np.asarray(pressure, dtype=float)
+    first = pressure[..., :-1]
+    second = pressure[..., 1:]
+    midpoint = (first + second) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.where((first > 0) & (second > 0), np.log(first / midpoint) / np.log(first / second), 0.5)
+    return altitude_edges[..., :-1] + (altitude_edges[..., 1:] - altitude_edges[..., :-1]) * fraction
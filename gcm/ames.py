@@ -1,17 +1,74 @@
+import hashlib
 from pathlib import Path
+from typing import Callable
 
 from netCDF4 import Dataset
 import numpy as np
 
+from caching.file_cache import FieldCache
 from gcm.abstract import AbstractSimulation
+from gcm.altitude import get_altitude_centers, get_altitude_edges
+from gcm.lazy import LazySolArray, default_max_bytes, get_sols_per_block, iterate_sol_blocks
+from gcm.memo import ArrayMemo, default_memo_bytes
+from gcm.pool import dataset_pool
+from gcm.solar_longitude import SolarLongitudeIndex
+from gcm.vertical import interpolate_to_levels
 
 
 class AmesSimulation(AbstractSimulation):
-    def __init__(self, version: int, mars_year: int):
+    """An object that pulls data from Ames simulations.
+
+    Parameters
+    ----------
+    version
+    mars_year
+    cache_directory
+        If given, the fields this object derives are cached in this directory (see FieldCache) and are returned as
+        read-only memory maps.
+    memo_bytes
+        The most bytes of arrays to keep in memory between calls (see ArrayMemo). Repeated calls return the same
+        array until the simulation files change. Use 0 to turn this off. Fields are always returned read-only, whether
+        or not they fit in the memo, so copy one to change it.
+    dtype
+        The dtype to return fields as, like np.float32. The default uses the class's default_dtype, which keeps the
+        dtype in the files unless set_default_dtype was called. Fields are converted one block of sols at a time as
+        they're read, so a converted field never needs a second copy in memory.
+
+    Notes
+    -----
+    The fixed, atmos_average, and atmos_diurn files are only opened the first time something is read from them. The
+    open files come from a process-wide pool, so every object of the same version and Mars year shares the same
+    handles. Call close (or use the object as a context manager) to give them back.
+
+    The sol axis accessors take an optional ls window of solar longitudes (see SolarLongitudeIndex). Without a cache
+    directory, only the sols in the window are read from the files. With one, the whole field is cached and the
+    window is taken from the memory map.
+
+    """
+    def __init__(self, version: int, mars_year: int, cache_directory: Path = None,
+                 memo_bytes: int = default_memo_bytes, dtype: np.dtype = None):
+        self._dtype = None if dtype is None else np.dtype(dtype)
         self._location = self._make_simulation_files_location(version, mars_year)
-        self._fixed = self._load_fixed()
-        self._atmos_average = self._load_atmos_average()
-        self._atmos_diurn = self._load_atmos_diurn()
+        self._dataset_files = {}
+        self._datasets = {}
+        self._cache_directory = cache_directory
+        self._cache = None
+        self._memo_bytes = memo_bytes
+        self._memo = None
+        self._solar_longitude_index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Release the files this object has opened."""
+        for pattern, dataset_file in self._dataset_files.items():
+            if pattern in self._datasets:
+                dataset_pool.release(dataset_file)
+        self._datasets = {}
 
     @staticmethod
     def _make_simulation_files_location(version: int, mars_year: int):
@@ -20,14 +77,89 @@ class AmesSimulation(AbstractSimulation):
             raise NotADirectoryError('The request files are not in a directory that exists.')
         return location
 
-    def _load_fixed(self):
-        return Dataset(list(self._location.glob('*fixed.nc'))[0])
-
-    def _load_atmos_average(self):
-        return Dataset(list(self._location.glob('*atmos_average.nc'))[0])
-
-    def _load_atmos_diurn(self):
-        return Dataset(list(self._location.glob('*atmos_diurn.nc'))[0])
+    @property
+    def _fixed(self) -> Dataset:
+        return self._get_dataset('*fixed.nc')
+
+    @property
+    def _atmos_average(self) -> Dataset:
+        return self._get_dataset('*atmos_average.nc')
+
+    @property
+    def _atmos_diurn(self) -> Dataset:
+        return self._get_dataset('*atmos_diurn.nc')
+
+    def _get_dataset(self, pattern: str) -> Dataset:
+        if pattern not in self._datasets:
+            self._datasets[pattern] = dataset_pool.acquire(self._get_dataset_file(pattern))
+        return self._datasets[pattern]
+
+    def _get_dataset_file(self, pattern: str) -> Path:
+        if pattern not in self._dataset_files:
+            files = list(self._location.glob(pattern))
+            if not files:
+                raise FileNotFoundError(f'Cannot find a file matching {pattern} at location {self._location}')
+            self._dataset_files[pattern] = files[0]
+        return self._dataset_files[pattern]
+
+    @property
+    def memo(self) -> ArrayMemo:
+        """Get the memo of arrays this object has already computed, including its hit and miss statistics."""
+        if self._memo is None:
+            self._memo = ArrayMemo(self._memo_bytes, self._get_source_files())
+        return self._memo
+
+    def _get_source_files(self) -> list[Path]:
+        return [self._get_dataset_file('*fixed.nc'), self._get_dataset_file('*atmos_diurn.nc')]
+
+    def _get_memoized(self, key: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        return self.memo.get(key, compute)
+
+    def _get_cached(self, key: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        if self.dtype is not None:
+            key = f'{key}-{self.dtype}'
+        if self._cache_directory is None:
+            return self._get_memoized(key, compute)
+        if self._cache is None:
+            self._cache = FieldCache(self._cache_directory, self._get_source_files())
+        return self._get_memoized(key, lambda: self._cache.get(key, compute))
+
+    def _get_windowed(self, key: str, compute: Callable[[slice | np.ndarray], np.ndarray],
+                      ls: tuple[float, float]) -> np.ndarray:
+        """Get a field for every sol, or for only the sols in a solar longitude window.
+
+        Parameters
+        ----------
+        key
+            The name that identifies the field for every sol.
+        compute
+            A function that makes the field for the sols it's given.
+        ls
+            The (start, stop) solar longitude [degrees] window. None gets every sol.
+
+        """
+        if ls is None:
+            return self._get_cached(key, lambda: compute(slice(None)))
+        sols = self.solar_longitude_index.get_sols(ls)
+        if self._cache_directory is not None:
+            return self._get_cached(key, lambda: compute(slice(None)))[sols]
+        return self._get_cached(f'{key}-ls_{ls[0]}_{ls[1]}', lambda: compute(sols))
+
+    def _get_sols(self, ls: tuple[float, float]) -> slice | np.ndarray:
+        return slice(None) if ls is None else self.solar_longitude_index.get_sols(ls)
+
+    @property
+    def solar_longitude_index(self) -> SolarLongitudeIndex:
+        """Get the index of which sols are in a solar longitude window.
+
+        Each sol's solar longitude is its value at the middle time of day.
+
+        """
+        if self._solar_longitude_index is None:
+            areo = self._atmos_diurn['areo'][:].data
+            areo = np.reshape(areo, (areo.shape[0], -1))
+            self._solar_longitude_index = SolarLongitudeIndex(areo[:, areo.shape[1] // 2])
+        return self._solar_longitude_index
 
     def get_latitude_centers(self) -> np.ndarray:
         return self._fixed['lat'][:].data
@@ -55,64 +187,445 @@ class AmesSimulation(AbstractSimulation):
 
     # To add from fixed: thin, emis, gice, phalf
 
-    def get_simulation_sol_centers(self):
-        return self._atmos_diurn['time'][:].data
+    def get_simulation_sol_centers(self, ls: tuple[float, float] = None):
+        return self._get_memoized('simulation_sol_centers',
+                                  lambda: self._atmos_diurn['time'][:].data)[self._get_sols(ls)]
 
     def get_simulation_sol_edges(self) -> np.ndarray:
-        return np.unique(self._atmos_diurn['time_bnds'][:].data)
+        return self._get_memoized('simulation_sol_edges', lambda: np.unique(self._atmos_diurn['time_bnds'][:].data))
 
-    def get_yearly_sol_centers(self):
-        return np.mod(self.get_simulation_sol_centers(), 668)
+    def get_yearly_sol_centers(self, ls: tuple[float, float] = None):
+        return self._get_memoized('yearly_sol_centers',
+                                  lambda: np.mod(self.get_simulation_sol_centers(), 668))[self._get_sols(ls)]
 
     def get_yearly_sol_edges(self):
-        return np.mod(self.get_simulation_sol_edges(), 668)
+        return self._get_memoized('yearly_sol_edges', lambda: np.mod(self.get_simulation_sol_edges(), 668))
 
     def get_local_time_centers(self):
-        return self._atmos_diurn['time_of_day_24'][:].data
+        return self._get_memoized('local_time_centers', lambda: self._atmos_diurn['time_of_day_24'][:].data)
 
     def get_local_time_edges(self):
-        return np.unique(self._atmos_diurn['time_of_day_edges_24'][:].data)
-
-    def get_solar_longitude_centers(self):
-        return np.mod(self._atmos_diurn['areo'][:].data, 360)
-
-    def get_surface_pressure(self):
-        return self._atmos_diurn['ps'][:].data
-
-    def get_surface_temperature(self):
-        return self._atmos_diurn['ts'][:].data
-
-    def get_atmospheric_temperature(self):
-        return np.moveaxis(self._atmos_diurn['temp'][:].data, 2, -1)
-
-    def get_dust_visible_extinction_optical_depth_per_pascal(self) -> np.ndarray:
-        return np.moveaxis(self._atmos_diurn['dustref'][:].data, 2, -1)
-
-    def get_ice_visible_extinction_optical_depth_per_pascal(self) -> np.ndarray:
-        return np.moveaxis(self._atmos_diurn['cldref'][:].data, 2, -1)
-
-    def get_atmospheric_pressure(self):
-        surface_pressure = self.get_surface_pressure()
+        return self._get_memoized('local_time_edges',
+                                  lambda: np.unique(self._atmos_diurn['time_of_day_edges_24'][:].data))
+
+    def get_solar_longitude_centers(self, ls: tuple[float, float] = None):
+        return self._get_memoized('solar_longitude_centers',
+                                  lambda: np.mod(self._atmos_diurn['areo'][:].data, 360))[self._get_sols(ls)]
+
+    def get_surface_pressure(self, ls: tuple[float, float] = None):
+        return self._get_windowed('surface_pressure', lambda sols: self._read_diurn_variable('ps', sols), ls)
+
+    def get_surface_temperature(self, ls: tuple[float, float] = None):
+        return self._get_windowed('surface_temperature', lambda sols: self._read_diurn_variable('ts', sols), ls)
+
+    def get_atmospheric_temperature(self, ls: tuple[float, float] = None):
+        return self._get_windowed('atmospheric_temperature', lambda sols: self._read_diurn_variable('temp', sols), ls)
+
+    def get_dust_visible_extinction_optical_depth_per_pascal(self, ls: tuple[float, float] = None) -> np.ndarray:
+        return self._get_windowed('dust_visible_extinction_optical_depth_per_pascal',
+                                  lambda sols: self._read_diurn_variable('dustref', sols), ls)
+
+    def get_ice_visible_extinction_optical_depth_per_pascal(self, ls: tuple[float, float] = None) -> np.ndarray:
+        return self._get_windowed('ice_visible_extinction_optical_depth_per_pascal',
+                                  lambda sols: self._read_diurn_variable('cldref', sols), ls)
+
+    def get_atmospheric_pressure(self, ls: tuple[float, float] = None):
+        def compute(sols: slice | np.ndarray) -> np.ndarray:
+            surface_pressure = self._read_diurn_variable('ps', sols)
+            ak = self.get_ak()
+            bk = self.get_bk()
+            dtype = self._get_dtype(np.result_type(surface_pressure, ak, bk))
+            pressure = np.multiply.outer(surface_pressure, bk, out=np.empty(surface_pressure.shape + bk.shape, dtype))
+            pressure += ak
+            return pressure
+
+        return self._get_windowed('atmospheric_pressure', compute, ls)
+
+    def get_dust_visible_column_optical_depth(self, max_bytes: int = default_max_bytes,
+                                              accumulate_in_float64: bool = True, ls: tuple[float, float] = None):
+        return self.get_column_optical_depth('dustref', max_bytes, accumulate_in_float64, ls)
+
+    def get_ice_visible_column_optical_depth(self, max_bytes: int = default_max_bytes,
+                                             accumulate_in_float64: bool = True, ls: tuple[float, float] = None):
+        return self.get_column_optical_depth('cldref', max_bytes, accumulate_in_float64, ls)
+
+    def get_column_optical_depth(self, name: str, max_bytes: int = default_max_bytes,
+                                 accumulate_in_float64: bool = True, ls: tuple[float, float] = None) -> np.ndarray:
+        """Get the column optical depth of any optical depth per pascal field in the diurn file.
+
+        Parameters
+        ----------
+        name
+            The name of the field in the diurn file, like "dustref" or "cldref".
+        max_bytes
+            The approximate amount of memory to use while integrating.
+        accumulate_in_float64
+            If True, integrate in float64 no matter what dtype this object returns. Otherwise, integrate in the
+            returned dtype, which is faster and uses less memory when that's float32.
+
+        Returns
+        -------
+        The column optical depth with shape (sol, local time, lat, lon).
+
+        Notes
+        -----
+        On the hybrid levels the pressure thickness of each layer is ps * diff(bk) + diff(ak), so the column integral
+        is two contractions of the field against diff(bk) and diff(ak). The pressure is never computed.
+
+        """
+        dtype = self._get_reduction_dtype(name, accumulate_in_float64)
+        ak_difference = np.diff(self.get_ak()).astype(dtype)
+        bk_difference = np.diff(self.get_bk()).astype(dtype)
+
+        def integrate(opacity: np.ndarray, surface_pressure: np.ndarray) -> np.ndarray:
+            return surface_pressure * np.einsum('...k,k->...', opacity, bk_difference) + \
+                np.einsum('...k,k->...', opacity, ak_difference)
+
+        return self._get_windowed(self._make_reduction_key(f'column_optical_depth-{name}', dtype),
+                                  lambda sols: self._reduce_per_pascal_field(name, integrate, max_bytes, dtype, sols),
+                                  ls)
+
+    def get_column_optical_depth_above(self, name: str, pressure: float, max_bytes: int = default_max_bytes,
+                                       accumulate_in_float64: bool = True,
+                                       ls: tuple[float, float] = None) -> np.ndarray:
+        """Get the optical depth of any optical depth per pascal field above a pressure level.
+
+        Parameters
+        ----------
+        name
+            The name of the field in the diurn file, like "dustref" or "cldref".
+        pressure
+            The pressure level [Pa]. The layer containing it contributes the fraction of its thickness above it.
+        max_bytes
+            The approximate amount of memory to use while integrating.
+        accumulate_in_float64
+            If True, integrate in float64 no matter what dtype this object returns. Otherwise, integrate in the
+            returned dtype, which is faster and uses less memory when that's float32.
+
+        Returns
+        -------
+        The optical depth above the pressure level with shape (sol, local time, lat, lon).
+
+        """
+        dtype = self._get_reduction_dtype(name, accumulate_in_float64)
+        ak = self.get_ak().astype(dtype)
+        bk = self.get_bk().astype(dtype)
+
+        def integrate(opacity: np.ndarray, surface_pressure: np.ndarray) -> np.ndarray:
+            thickness = self._get_thickness_above(surface_pressure, ak, bk, pressure)
+            return np.sum(opacity * thickness, axis=-1)
+
+        key = self._make_reduction_key(f'column_optical_depth_above-{name}-{pressure}', dtype)
+        return self._get_windowed(key, lambda sols: self._reduce_per_pascal_field(name, integrate, max_bytes, dtype,
+                                                                                   sols), ls)
+
+    def get_column_optical_depth_below(self, name: str, pressure: float, max_bytes: int = default_max_bytes,
+                                       accumulate_in_float64: bool = True,
+                                       ls: tuple[float, float] = None) -> np.ndarray:
+        """Get the optical depth of any optical depth per pascal field below a pressure level.
+
+        Parameters
+        ----------
+        name
+            The name of the field in the diurn file, like "dustref" or "cldref".
+        pressure
+            The pressure level [Pa]. The layer containing it contributes the fraction of its thickness below it.
+        max_bytes
+            The approximate amount of memory to use while integrating.
+        accumulate_in_float64
+            If True, integrate in float64 no matter what dtype this object returns. Otherwise, integrate in the
+            returned dtype, which is faster and uses less memory when that's float32.
+
+        Returns
+        -------
+        The optical depth below the pressure level with shape (sol, local time, lat, lon).
+
+        """
+        dtype = self._get_reduction_dtype(name, accumulate_in_float64)
+        ak = self.get_ak().astype(dtype)
+        bk = self.get_bk().astype(dtype)
+        ak_difference = np.diff(ak)
+        bk_difference = np.diff(bk)
+
+        def integrate(opacity: np.ndarray, surface_pressure: np.ndarray) -> np.ndarray:
+            thickness = self._get_thickness_above(surface_pressure, ak, bk, pressure)
+            return surface_pressure * np.einsum('...k,k->...', opacity, bk_difference) + \
+                np.einsum('...k,k->...', opacity, ak_difference) - np.sum(opacity * thickness, axis=-1)
+
+        key = self._make_reduction_key(f'column_optical_depth_below-{name}-{pressure}', dtype)
+        return self._get_windowed(key, lambda sols: self._reduce_per_pascal_field(name, integrate, max_bytes, dtype,
+                                                                                   sols), ls)
+
+    def get_cumulative_optical_depth(self, name: str, max_bytes: int = default_max_bytes,
+                                     accumulate_in_float64: bool = True, ls: tuple[float, float] = None) -> np.ndarray:
+        """Get the optical depth of any optical depth per pascal field from the model top down to each layer boundary.
+
+        Parameters
+        ----------
+        name
+            The name of the field in the diurn file, like "dustref" or "cldref".
+        max_bytes
+            The approximate amount of memory to use while integrating.
+        accumulate_in_float64
+            If True, integrate in float64 no matter what dtype this object returns. Otherwise, integrate in the
+            returned dtype, which is faster and uses less memory when that's float32.
+
+        Returns
+        -------
+        The cumulative optical depth with shape (sol, local time, lat, lon, level boundary). It's on the same
+        boundaries as get_atmospheric_pressure, so the first boundary is always 0 and the last is the column optical
+        depth.
+
+        """
+        dtype = self._get_reduction_dtype(name, accumulate_in_float64)
+        ak_difference = np.diff(self.get_ak()).astype(dtype)
+        bk_difference = np.diff(self.get_bk()).astype(dtype)
+
+        def integrate(opacity: np.ndarray, surface_pressure: np.ndarray) -> np.ndarray:
+            cumulative = np.zeros(opacity.shape[:-1] + (opacity.shape[-1] + 1,), dtype=dtype)
+            np.cumsum(opacity * bk_difference, axis=-1, out=cumulative[..., 1:])
+            cumulative[..., 1:] *= surface_pressure[..., None]
+            cumulative[..., 1:] += np.cumsum(opacity * ak_difference, axis=-1)
+            return cumulative
+
+        return self._get_windowed(self._make_reduction_key(f'cumulative_optical_depth-{name}', dtype),
+                                  lambda sols: self._reduce_per_pascal_field(name, integrate, max_bytes, dtype, sols),
+                                  ls)
+
+    def get_field_at_pressures(self, name: str, pressures: np.ndarray, max_bytes: int = default_max_bytes,
+                               ls: tuple[float, float] = None) -> np.ndarray:
+        """Interpolate any layer field in the diurn file onto fixed pressure levels.
+
+        Parameters
+        ----------
+        name
+            The name of the field in the diurn file, like "temp", "dustref" or "cldref".
+        pressures
+            The 1D pressure levels [Pa] to interpolate onto.
+        max_bytes
+            The approximate amount of memory to use while interpolating.
+        ls
+            The (start, stop) solar longitude [degrees] window. None gets every sol.
+
+        Returns
+        -------
+        The field with shape (sol, local time, lat, lon, pressure). Pressures greater than the pressure at the middle of
+        the bottom layer or less than the pressure at the middle of the top layer are NaN, since the field isn't
+        extrapolated past the layers.
+
+        Notes
+        -----
+        The field is interpolated linearly in log pressure (see gcm.vertical.interpolate_to_levels). Each layer is
+        placed at the mean of the pressures at its boundaries.
+
+        """
+        pressures = np.asarray(pressures, dtype=float)
+        variable = self._atmos_diurn[name]
         ak = self.get_ak()
         bk = self.get_bk()
-        return np.multiply.outer(surface_pressure, bk) + ak
-
-    def get_dust_visible_column_optical_depth(self):
-        visible_opacity = self.get_dust_visible_extinction_optical_depth_per_pascal()
-        return self._compute_optical_depth(visible_opacity)
+        ak_midpoints = (ak[:-1] + ak[1:]) / 2
+        bk_midpoints = (bk[:-1] + bk[1:]) / 2
+
+        def compute(sols: slice | np.ndarray) -> np.ndarray:
+            sol_indices = np.arange(variable.shape[0])[sols]
+            shape = (sol_indices.size,) + variable.shape[1:2] + variable.shape[3:] + variable.shape[2:3]
+            field = LazySolArray(lambda block: self._read_diurn_variable(name, sol_indices[block]), shape,
+                                 self._get_dtype(variable.dtype))
+            layer_pressure = LazySolArray(
+                lambda block: np.multiply.outer(self._read_diurn_variable('ps', sol_indices[block]), bk_midpoints) +
+                ak_midpoints, shape, np.float64)
+            return interpolate_to_levels(field, layer_pressure, pressures, log=True, max_bytes=max_bytes)
+
+        key = f'{name}-at_pressures-{hashlib.sha1(pressures.tobytes()).hexdigest()}'
+        return self._get_windowed(key, compute, ls)
+
+    def get_altitude_edges(self, max_bytes: int = default_max_bytes, ls: tuple[float, float] = None) -> np.ndarray:
+        """Get the altitude of every layer boundary.
+
+        Parameters
+        ----------
+        max_bytes
+            The approximate amount of memory to use while integrating.
+        ls
+            The (start, stop) solar longitude [degrees] window. None gets every sol.
+
+        Returns
+        -------
+        The altitude [m] above the areoid with shape (sol, local time, lat, lon, level boundary). It's on the same
+        boundaries as get_atmospheric_pressure, so the last boundary is the surface elevation.
+
+        Notes
+        -----
+        The altitudes are integrated up from the surface with the hypsometric equation (see
+        gcm.altitude.get_altitude_edges), one block of sols at a time.
+
+        """
+        return self._get_windowed('altitude_edges', lambda sols: self._compute_altitudes(sols, False, max_bytes), ls)
+
+    def get_altitude_centers(self, max_bytes: int = default_max_bytes, ls: tuple[float, float] = None) -> np.ndarray:
+        """Get the altitude of the middle of every layer.
+
+        Parameters
+        ----------
+        max_bytes
+            The approximate amount of memory to use while integrating.
+        ls
+            The (start, stop) solar longitude [degrees] window. None gets every sol.
+
+        Returns
+        -------
+        The altitude [m] above the areoid with shape (sol, local time, lat, lon, level). Each layer's middle is where
+        its pressure is the mean of the pressures at its boundaries.
+
+        """
+        return self._get_windowed('altitude_centers', lambda sols: self._compute_altitudes(sols, True, max_bytes), ls)
+
+    def _compute_altitudes(self, sols: slice | np.ndarray, centers: bool, max_bytes: int) -> np.ndarray:
+        """Compute the altitude of the layer boundaries or the layer midpoints one block of sols at a time."""
+        variable = self._atmos_diurn['temp']
+        ak = self.get_ak()
+        bk = self.get_bk()
+        surface_elevation = self.get_surface_elevation()
+        sol_indices = np.arange(variable.shape[0])[sols]
+        n_levels = variable.shape[2] if centers else ak.shape[0]
+        output = np.empty((sol_indices.size,) + variable.shape[1:2] + variable.shape[3:] + (n_levels,),
+                          dtype=self._get_dtype(np.float64))
+        bytes_per_sol = 8 * int(np.prod(variable.shape[1:])) * np.dtype(np.float64).itemsize
+        for block in iterate_sol_blocks(sol_indices.size, get_sols_per_block(bytes_per_sol, max_bytes)):
+            # Only this block's surface pressure is read, since the whole year may not fit in the memo
+            pressure = np.multiply.outer(self._read_diurn_variable('ps', sol_indices[block]), bk) + ak
+            temperature = self._read_diurn_variable('temp', sol_indices[block])
+            altitude_edges = get_altitude_edges(surface_elevation, pressure, temperature)
+            output[block] = get_altitude_centers(altitude_edges, pressure) if centers else altitude_edges
+        return output
+
+    def get_field_at_altitudes(self, name: str, altitudes: np.ndarray, max_bytes: int = default_max_bytes,
+                               ls: tuple[float, float] = None) -> np.ndarray:
+        """Interpolate any layer field in the diurn file onto fixed altitudes.
+
+        Parameters
+        ----------
+        name
+            The name of the field in the diurn file, like "temp", "dustref" or "cldref".
+        altitudes
+            The 1D altitudes [m] above the areoid to interpolate onto.
+        max_bytes
+            The approximate amount of memory to use while interpolating.
+        ls
+            The (start, stop) solar longitude [degrees] window. None gets every sol.
+
+        Returns
+        -------
+        The field with shape (sol, local time, lat, lon, altitude). Altitudes below the middle of the bottom layer or
+        above the middle of the top layer are NaN.
+
+        Notes
+        -----
+        If this object has a cache directory, the layers are placed at the cached get_altitude_centers, which is shared
+        with every other field interpolated onto altitudes. Otherwise, the layer altitudes are computed one block of
+        sols at a time as they're needed, so they're never entirely in memory.
+
+        """
+        altitudes = np.asarray(altitudes, dtype=float)
+        variable = self._atmos_diurn[name]
+
+        def compute(sols: slice | np.ndarray) -> np.ndarray:
+            sol_indices = np.arange(variable.shape[0])[sols]
+            shape = (sol_indices.size,) + variable.shape[1:2] + variable.shape[3:] + variable.shape[2:3]
+            field = LazySolArray(lambda block: self._read_diurn_variable(name, sol_indices[block]), shape,
+                                 self._get_dtype(variable.dtype))
+            if self._cache_directory is not None:
+                # With a cache, compute is always given every sol and the altitudes are a memory map
+                altitude = self.get_altitude_centers(max_bytes)
+            else:
+                altitude = LazySolArray(lambda block: self._compute_altitudes(sol_indices[block], True, max_bytes),
+                                        shape, np.float64)
+            return interpolate_to_levels(field, altitude, altitudes, max_bytes=max_bytes)
+
+        key = f'{name}-at_altitudes-{hashlib.sha1(altitudes.tobytes()).hexdigest()}'
+        return self._get_windowed(key, compute, ls)
 
-    def get_ice_visible_column_optical_depth(self):
-        visible_opacity = self.get_ice_visible_extinction_optical_depth_per_pascal()
-        return self._compute_optical_depth(visible_opacity)
+    @staticmethod
+    def _get_thickness_above(surface_pressure: np.ndarray, ak: np.ndarray, bk: np.ndarray,
+                             pressure: float) -> np.ndarray:
+        """Get how much of each layer's pressure thickness is at lower pressure than a pressure level."""
+        top = np.multiply.outer(surface_pressure, bk[:-1]) + ak[:-1]
+        return np.clip(pressure - top, 0, surface_pressure[..., None] * np.diff(bk) + np.diff(ak))
 
     @staticmethod
     def _get_closest_index(array: np.ndarray, value: float) -> int:
         return np.abs(array - value).argmin()
 
-    def _compute_optical_depth(self, simulation_optical_depth: np.ndarray) -> np.ndarray:
-        atmospheric_pressure = self.get_atmospheric_pressure()
-        p_diff = np.diff(atmospheric_pressure, axis=-1)
-        return np.sum(simulation_optical_depth * p_diff, axis=-1)
+    def _get_reduction_dtype(self, name: str, accumulate_in_float64: bool) -> np.dtype:
+        return np.dtype(np.float64) if accumulate_in_float64 else self._get_dtype(self._atmos_diurn[name].dtype)
+
+    @staticmethod
+    def _make_reduction_key(key: str, dtype: np.dtype) -> str:
+        # Results accumulated in float64 keep the key they've always had
+        return key if dtype == np.float64 else f'{key}-accumulated_in_{dtype}'
+
+    def _read_diurn_variable(self, name: str, sols: slice | np.ndarray = slice(None),
+                             max_bytes: int = default_max_bytes) -> np.ndarray:
+        """Read some sols of a diurn file variable into an array of this object's dtype one block of sols at a time.
+
+        Any level axis is moved to the end, so the output has shape (sol, local time, lat, lon[, level]).
+
+        """
+        variable = self._atmos_diurn[name]
+        sol_indices = np.arange(variable.shape[0])[sols]
+        shape = variable.shape[1:] if variable.ndim < 5 else variable.shape[1:2] + variable.shape[3:] + \
+            variable.shape[2:3]
+        output = np.empty((sol_indices.size,) + shape, dtype=self._get_dtype(variable.dtype))
+        bytes_per_sol = int(np.prod(variable.shape[1:])) * variable.dtype.itemsize
+        for block in iterate_sol_blocks(sol_indices.size, get_sols_per_block(bytes_per_sol, max_bytes)):
+            data = self._read_sols(variable, sol_indices[block])
+            output[block] = np.moveaxis(data, 2, -1) if variable.ndim == 5 else data
+        return output
+
+    @staticmethod
+    def _read_sols(variable, sol_indices: np.ndarray) -> np.ndarray:
+        # Consecutive sols are read as one hyperslab
+        if np.all(np.diff(sol_indices) == 1):
+            return variable[sol_indices[0]:sol_indices[-1] + 1].data
+        return variable[sol_indices].data
+
+    def _reduce_per_pascal_field(self, name: str, reduction: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                                 max_bytes: int, dtype: np.dtype, sols: slice | np.ndarray = slice(None)) -> np.ndarray:
+        """Apply a reduction to a per pascal field one block of sols at a time.
+
+        Parameters
+        ----------
+        name
+            The name of the field in the diurn file.
+        reduction
+            A function that takes a block of the field with shape (sol, local time, lat, lon, level) and the surface
+            pressure of the same sols, and returns an array whose first axis is sol.
+        max_bytes
+            The approximate amount of memory to use at once. The block size allows for a few temporary arrays the size
+            of the block of the field.
+        dtype
+            The dtype to do the reduction in. The field and surface pressure are converted to it as they're read.
+        sols
+            The sols to reduce. The default reduces every sol.
+
+        Returns
+        -------
+        The reduction of each block, concatenated along the sol axis, in this object's dtype.
+
+        """
+        variable = self._atmos_diurn[name]
+        sol_indices = np.arange(variable.shape[0])[sols]
+        bytes_per_sol = 4 * int(np.prod(variable.shape[1:])) * np.dtype(dtype).itemsize
+        output = None
+        for block_sols in iterate_sol_blocks(sol_indices.size, get_sols_per_block(bytes_per_sol, max_bytes)):
+            opacity = np.moveaxis(self._read_sols(variable, sol_indices[block_sols]).astype(dtype, copy=False), 2, -1)
+            surface_pressure = self._read_sols(self._atmos_diurn['ps'], sol_indices[block_sols])
+            block = reduction(opacity, surface_pressure.astype(dtype, copy=False))
+            if output is None:
+                # The reduction may be accumulated in a wider dtype than the field, but it's returned like the field
+                output = np.empty((sol_indices.size,) + block.shape[1:], dtype=self._get_dtype(variable.dtype))
+            output[block_sols] = block
+        return output
 
 
 if __name__ == '__main__':
@@ -0,0 +1,132 @@
+import numpy as np
+
+
+class SolarLongitudeClimatology:
+    """A climatology of a field binned by solar longitude and latitude that's built up one block of data at a time.
+
+    Each bin keeps a running count, mean, and variance (using Welford's method, extended to whole batches by Chan's
+    formula), a minimum and maximum, and a histogram. Memory use only depends on the number of bins, so any number of
+    sol blocks or Mars years can be added, and climatologies built by different workers can be merged.
+
+    Parameters
+    ----------
+    solar_longitude_edges
+        The edges of the solar longitude bins [degrees]. Solar longitudes are wrapped into [0, 360) before binning.
+    latitude_edges
+        The edges of the latitude bins [degrees].
+    histogram_edges
+        The edges of the histogram bins of the field's values.
+
+    Notes
+    -----
+    NaNs and points outside of the bins are ignored. Bins with no data have a NaN mean and variance.
+
+    """
+    def __init__(self, solar_longitude_edges: np.ndarray, latitude_edges: np.ndarray, histogram_edges: np.ndarray):
+        self.solar_longitude_edges = np.asarray(solar_longitude_edges, dtype=float)
+        self.latitude_edges = np.asarray(latitude_edges, dtype=float)
+        self.histogram_edges = np.asarray(histogram_edges, dtype=float)
+
+        shape = (self.solar_longitude_edges.shape[0] - 1, self.latitude_edges.shape[0] - 1)
+        self.count = np.zeros(shape, dtype=np.int64)
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self.minimum = np.full(shape, np.inf)
+        self.maximum = np.full(shape, -np.inf)
+        self.histogram = np.zeros(shape + (self.histogram_edges.shape[0] - 1,), dtype=np.int64)
+
+    @property
+    def mean(self) -> np.ndarray:
+        with np.errstate(invalid='ignore'):
+            return np.where(self.count > 0, self._mean, np.nan)
+
+    def get_variance(self, ddof: int = 0) -> np.ndarray:
+        """Get the variance of each bin.
+
+        Parameters
+        ----------
+        ddof
+            The delta degrees of freedom. Use 1 for the sample variance.
+
+        Returns
+        -------
+        The variance, which is NaN in bins with no more than ddof values.
+
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > ddof, self._m2 / (self.count - ddof), np.nan)
+
+    def add(self, values: np.ndarray, solar_longitude: np.ndarray, latitude: np.ndarray) -> None:
+        """Add a block of data to the climatology.
+
+        Parameters
+        ----------
+        values
+            The field values, with any shape.
+        solar_longitude
+            The solar longitude [degrees] of the values. It must broadcast to the shape of values.
+        latitude
+            The latitude [degrees] of the values. It must broadcast to the shape of values.
+
+        Examples
+        --------
+        Add one block of sols of a (sol, local time, lat, lon) field:
+
+        >>> climatology.add(tau[sols], ls[sols, :, None, None], latitude[:, None])
+
+        """
+        values, solar_longitude, latitude = \
+            (np.ravel(a) for a in np.broadcast_arrays(values, solar_longitude, latitude))
+        n_ls_bins, n_latitude_bins = self.count.shape
+        ls_bins = np.searchsorted(self.solar_longitude_edges, np.mod(solar_longitude, 360), side='right') - 1
+        latitude_bins = np.searchsorted(self.latitude_edges, latitude, side='right') - 1
+        keep = (ls_bins >= 0) & (ls_bins < n_ls_bins) & (latitude_bins >= 0) & (latitude_bins < n_latitude_bins) & \
+            ~np.isnan(values)
+        values = values[keep]
+        bins = ls_bins[keep] * n_latitude_bins + latitude_bins[keep]
+        n_bins = self.count.size
+
+        count = np.bincount(bins, minlength=n_bins)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.bincount(bins, weights=values, minlength=n_bins) / count
+        m2 = np.bincount(bins, weights=(values - mean[bins]) ** 2, minlength=n_bins)
+        self._combine(count.reshape(self.count.shape), mean.reshape(self.count.shape), m2.reshape(self.count.shape))
+
+        np.minimum.at(self.minimum.reshape(-1), bins, values)
+        np.maximum.at(self.maximum.reshape(-1), bins, values)
+
+        n_histogram_bins = self.histogram.shape[-1]
+        histogram_bins = np.searchsorted(self.histogram_edges, values, side='right') - 1
+        # Include the right edge in the last bin, like np.histogram does
+        histogram_bins[values == self.histogram_edges[-1]] = n_histogram_bins - 1
+        in_histogram = (histogram_bins >= 0) & (histogram_bins < n_histogram_bins)
+        self.histogram += np.bincount(bins[in_histogram] * n_histogram_bins + histogram_bins[in_histogram],
+                                      minlength=self.histogram.size).reshape(self.histogram.shape)
+
+    def merge(self, other: 'SolarLongitudeClimatology') -> None:
+        """Merge another climatology with the same bins into this one.
+
+        Parameters
+        ----------
+        other
+            The climatology to merge, like one built by another worker or from another Mars year.
+
+        """
+        if not (np.array_equal(self.solar_longitude_edges, other.solar_longitude_edges) and
+                np.array_equal(self.latitude_edges, other.latitude_edges) and
+                np.array_equal(self.histogram_edges, other.histogram_edges)):
+            raise ValueError('Only climatologies with the same bins can be merged.')
+        self._combine(other.count, other._mean, other._m2)
+        np.minimum(self.minimum, other.minimum, out=self.minimum)
+        np.maximum(self.maximum, other.maximum, out=self.maximum)
+        self.histogram += other.histogram
+
+    def _combine(self, count: np.ndarray, mean: np.ndarray, m2: np.ndarray) -> None:
+        total = self.count + count
+        has_data = count > 0
+        delta = np.where(has_data, mean - self._mean, 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fraction = np.where(has_data, count / total, 0)
+        self._mean += delta * fraction
+        self._m2 += np.where(has_data, m2, 0) + delta ** 2 * self.count * fraction
+        self.count = total
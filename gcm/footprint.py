@@ -0,0 +1,157 @@
+from collections import OrderedDict
+import hashlib
+
+import numpy as np
+
+from gcm.grid import GridAxis
+
+
+class FootprintWeights:
+    """The area weights of the grid cells that each pixel footprint overlaps.
+
+    The weights are stored sparsely, sorted by pixel. Make these with FootprintAverager.get_weights.
+
+    """
+    def __init__(self, pixels: np.ndarray, latitude_indices: np.ndarray, longitude_indices: np.ndarray,
+                 weights: np.ndarray, n_pixels: int):
+        self.pixels = pixels
+        self.latitude_indices = latitude_indices
+        self.longitude_indices = longitude_indices
+        self.weights = weights
+        self.n_pixels = n_pixels
+        self.pixel_starts = np.searchsorted(pixels, np.arange(n_pixels))
+
+
+class FootprintAverager:
+    """Average gridded simulation fields over the quadrilateral footprints of pixels.
+
+    Parameters
+    ----------
+    simulation
+        Any simulation. Its local time, latitude, and longitude edges define the grid the fields are on.
+    n_subsamples
+        The number of points along each side of a pixel used to find which cells it overlaps. Each pixel is split
+        into n_subsamples**2 pieces.
+    n_cached_geometries
+        The number of sets of pixel corners whose weights are kept for reuse.
+
+    Notes
+    -----
+    Each pixel is split into pieces by bilinearly interpolating its corners in 3D and projecting the result back onto
+    the sphere, so footprints that straddle the longitude seam or a pole are handled like any other. Each piece is
+    weighted by its area on the sphere and assigned to the cell it falls in, found by searching the grid edges. The
+    weights of a set of pixels only depend on their corners, so they're computed once and reused for every field.
+
+    The simulations' time axis is universal time, so when pixels are averaged at their own local solar times, each
+    cell a pixel overlaps is read at the universal time of that local time at the cell's longitude.
+
+    """
+    def __init__(self, simulation, n_subsamples: int = 8, n_cached_geometries: int = 8):
+        self._time_axis = GridAxis(simulation.get_local_time_edges(), period=24)
+        self._latitude_axis = GridAxis(simulation.get_latitude_edges())
+        self._longitude_axis = GridAxis(simulation.get_longitude_edges(), period=360)
+        self._n_subsamples = n_subsamples
+        self._n_cached_geometries = n_cached_geometries
+        self._cached_weights = OrderedDict()
+
+    def get_weights(self, latitude_corners: np.ndarray, longitude_corners: np.ndarray) -> FootprintWeights:
+        """Get the area weights of the cells each pixel overlaps.
+
+        Parameters
+        ----------
+        latitude_corners
+            The latitude [degrees] of each pixel's corners with shape (pixel, 4). The corners go around the pixel.
+        longitude_corners
+            The longitude [degrees] of each pixel's corners with shape (pixel, 4).
+
+        Returns
+        -------
+        The weights, normalized so each pixel's weights sum to 1.
+
+        """
+        latitude_corners = np.reshape(np.asarray(latitude_corners, dtype=float), (-1, 4))
+        longitude_corners = np.reshape(np.asarray(longitude_corners, dtype=float), (-1, 4))
+        key = hashlib.sha1(latitude_corners.tobytes() + longitude_corners.tobytes()).hexdigest()
+        if key in self._cached_weights:
+            self._cached_weights.move_to_end(key)
+            return self._cached_weights[key]
+
+        weights = self._compute_weights(latitude_corners, longitude_corners)
+        self._cached_weights[key] = weights
+        if len(self._cached_weights) > self._n_cached_geometries:
+            self._cached_weights.popitem(last=False)
+        return weights
+
+    def average(self, field: np.ndarray, latitude_corners: np.ndarray, longitude_corners: np.ndarray,
+                sol_indices: np.ndarray = None, local_times: np.ndarray = None) -> np.ndarray:
+        """Get the area-weighted average of a field over each pixel's footprint.
+
+        Parameters
+        ----------
+        field
+            The field to average. Without time indices, its shape is (..., lat, lon). With them, it's
+            (sol, local time, lat, lon[, ...]).
+        latitude_corners
+            The latitude [degrees] of each pixel's corners with shape (pixel, 4).
+        longitude_corners
+            The longitude [degrees] of each pixel's corners with shape (pixel, 4).
+        sol_indices
+            The sol index of each pixel. If this and local_times are given, each pixel is averaged at its own time.
+        local_times
+            The local solar time [hours] of each pixel.
+
+        Returns
+        -------
+        The averages. Without time indices, the shape is (..., pixel). With them, it's (pixel[, ...]).
+
+        """
+        weights = self.get_weights(latitude_corners, longitude_corners)
+        field = np.asarray(field)
+        if sol_indices is None and local_times is None:
+            values = field[..., weights.latitude_indices, weights.longitude_indices] * weights.weights
+            return np.add.reduceat(values, weights.pixel_starts, axis=-1)
+        sols = np.broadcast_to(sol_indices, (weights.n_pixels,))[weights.pixels]
+        local_times = np.broadcast_to(local_times, (weights.n_pixels,))[weights.pixels]
+        universal_times = local_times - self._longitude_axis.centers[weights.longitude_indices] / 15
+        time_indices = self._time_axis.get_nearest_indices(universal_times)
+        values = field[sols, time_indices, weights.latitude_indices, weights.longitude_indices]
+        values = values * np.reshape(weights.weights, weights.weights.shape + (1,) * (values.ndim - 1))
+        return np.add.reduceat(values, weights.pixel_starts, axis=0)
+
+    def _compute_weights(self, latitude_corners: np.ndarray, longitude_corners: np.ndarray) -> FootprintWeights:
+        n_pixels = latitude_corners.shape[0]
+        corners = self._to_cartesian(latitude_corners, longitude_corners)
+        c0, c1, c2, c3 = (corners[:, i, None, :] for i in range(4))
+
+        fractions = (np.arange(self._n_subsamples) + 0.5) / self._n_subsamples
+        u, v = (np.ravel(f)[None, :, None] for f in np.meshgrid(fractions, fractions))
+        points = (1 - u) * (1 - v) * c0 + u * (1 - v) * c1 + u * v * c2 + (1 - u) * v * c3
+        # The area on the sphere of each piece is the Jacobian of projecting the bilinear patch onto the sphere
+        du = (1 - v) * (c1 - c0) + v * (c2 - c3)
+        dv = (1 - u) * (c3 - c0) + u * (c2 - c1)
+        norm = np.linalg.norm(points, axis=-1)
+        areas = np.abs(np.sum(points * np.cross(du, dv), axis=-1)) / norm**3
+
+        latitudes = np.degrees(np.arcsin(np.clip(points[..., 2] / norm, -1, 1)))
+        longitudes = np.degrees(np.arctan2(points[..., 1], points[..., 0]))
+        latitude_indices = self._latitude_axis.get_nearest_indices(latitudes)
+        longitude_indices = self._longitude_axis.get_nearest_indices(longitudes)
+
+        # Combine the pieces of each pixel that fall in the same cell
+        n_latitudes = self._latitude_axis.n_cells
+        n_longitudes = self._longitude_axis.n_cells
+        pixels = np.arange(n_pixels)[:, None]
+        keys = (pixels * n_latitudes + latitude_indices) * n_longitudes + longitude_indices
+        unique_keys, inverse = np.unique(np.ravel(keys), return_inverse=True)
+        weights = np.bincount(inverse, weights=np.ravel(areas))
+        entry_pixels = unique_keys // (n_latitudes * n_longitudes)
+        weights /= np.bincount(entry_pixels, weights=weights, minlength=n_pixels)[entry_pixels]
+        return FootprintWeights(entry_pixels, unique_keys // n_longitudes % n_latitudes, unique_keys % n_longitudes,
+                                weights, n_pixels)
+
+    @staticmethod
+    def _to_cartesian(latitude: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+        latitude = np.radians(latitude)
+        longitude = np.radians(longitude)
+        return np.stack([np.cos(latitude) * np.cos(longitude), np.cos(latitude) * np.sin(longitude),
+                         np.sin(latitude)], axis=-1)
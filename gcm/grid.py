@@ -0,0 +1,66 @@
+import numpy as np
+
+
+class GridAxis:
+    """One axis of a simulation grid, described by its cell edges.
+
+    Parameters
+    ----------
+    edges
+        The cell edges. These can be ascending or descending.
+    period
+        The period of the axis, if it's periodic. If the edges span more than one period, the last cell is assumed to
+        duplicate the first (like the PCM's 360 degree seam column) and is never used for interpolation.
+
+    """
+    def __init__(self, edges: np.ndarray, period: float = None):
+        edges = np.asarray(edges, dtype=float)
+        # Negating a descending axis makes it ascending without changing any indices
+        self._sign = -1 if edges[-1] < edges[0] else 1
+        self._edges = edges * self._sign
+        self._centers = (self._edges[1:] + self._edges[:-1]) / 2
+        self.centers = self._centers * self._sign
+        self._period = period
+        self.n_cells = self._centers.shape[0]
+        if period is not None and self._edges[-1] - self._edges[0] > period * (1 + 1e-6):
+            self._n_unique = self.n_cells - 1
+        else:
+            self._n_unique = self.n_cells
+
+    def _prepare(self, values: np.ndarray, origin: float) -> np.ndarray:
+        values = np.asarray(values, dtype=float) * self._sign
+        if self._period is not None:
+            values = np.mod(values - origin, self._period) + origin
+        return values
+
+    def get_nearest_indices(self, values: np.ndarray) -> np.ndarray:
+        """Get the index of the cell each value is in.
+
+        Values outside of a non-periodic axis get the closest cell.
+
+        """
+        values = self._prepare(values, self._edges[0])
+        indices = np.searchsorted(self._edges, values, side='right') - 1
+        return np.clip(indices, 0, self._n_unique - 1)
+
+    def get_linear_indices(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the indices of the cell centers on either side of each value and the weight of the upper one.
+
+        Values outside of a non-periodic axis get the closest center.
+
+        """
+        centers = self._centers[:self._n_unique]
+        if self._n_unique == 1:
+            indices = np.zeros(np.shape(values), dtype=int)
+            return indices, indices, np.zeros(np.shape(values))
+        values = self._prepare(values, centers[0])
+        lower = np.searchsorted(centers, values, side='right') - 1
+        if self._period is not None:
+            upper = (lower + 1) % self._n_unique
+            upper_centers = np.where(upper == 0, centers[0] + self._period, centers[upper])
+            weights = (values - centers[lower]) / (upper_centers - centers[lower])
+        else:
+            lower = np.clip(lower, 0, self._n_unique - 2)
+            upper = lower + 1
+            weights = np.clip((values - centers[lower]) / (centers[upper] - centers[lower]), 0, 1)
+        return lower, upper, weights
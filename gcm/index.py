@@ -0,0 +1,159 @@
+import json
+from pathlib import Path
+import re
+
+from netCDF4 import Dataset
+import numpy as np
+
+
+class MonthlyFileIndex:
+    """An index of which sol and local time each record of a simulation's monthly files holds, and of the solar
+    longitude of each sol.
+
+    The index is built the first time a simulation directory is used and is saved next to the data. Later instances
+    read the saved index instead of opening every file, and only rebuild it if the files have changed.
+
+    Parameters
+    ----------
+    location
+        The directory containing the monthly files.
+    pattern
+        The glob pattern matching the monthly files.
+    records_per_sol
+        The number of records each file has per sol.
+
+    Notes
+    -----
+    The files are ordered by the first value of their time variable, not by the order the filesystem lists them in.
+    If the index cannot be written (for instance if the data are on a read-only mount) it is kept in memory.
+
+    """
+    filename = 'monthly_file_index.json'
+    _format_version = 2
+
+    def __init__(self, location: Path, pattern: str = 'diagfi*.nc', records_per_sol: int = 24):
+        self._location = location
+        self._pattern = pattern
+        self.records_per_sol = records_per_sol
+        self._index = self._load()
+
+        self.files = [self._location / f['name'] for f in self._index['files']]
+        self.record_offsets = np.concatenate(([0], np.cumsum([f['n_records'] for f in self._index['files']])))
+        self.sol_offsets = self.record_offsets // self.records_per_sol
+
+    @property
+    def n_sols(self) -> int:
+        return int(self.sol_offsets[-1])
+
+    def get_latitude(self) -> np.ndarray:
+        return np.array(self._index['latitude'])
+
+    def get_longitude(self) -> np.ndarray:
+        return np.array(self._index['longitude'])
+
+    def get_solar_longitude(self) -> np.ndarray:
+        """Get the solar longitude [degrees] of each sol, which is the value at the sol's middle record.
+
+        Returns
+        -------
+        The solar longitudes, which are NaN for files without an Ls variable.
+
+        """
+        return np.concatenate([f['solar_longitude'] for f in self._index['files']]).astype(float)
+
+    def locate(self, sols: np.ndarray, local_times: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Get the file and record that hold each (sol, local time) pair.
+
+        Parameters
+        ----------
+        sols
+            The sol indices of the Mars year.
+        local_times
+            The hour indices. These must be broadcastable with sols.
+
+        Returns
+        -------
+        The index of the file in files, and the record offset within that file.
+
+        """
+        records = np.asarray(sols) * self.records_per_sol + np.asarray(local_times)
+        if np.any((records < 0) | (records >= self.record_offsets[-1])):
+            raise IndexError('A requested sol or local time is outside of the simulation.')
+        file_indices = np.searchsorted(self.record_offsets, records, side='right') - 1
+        return file_indices, records - self.record_offsets[file_indices]
+
+    def split_sols(self, sols: np.ndarray):
+        """Split sol indices by the file that holds them.
+
+        Parameters
+        ----------
+        sols
+            Sorted sol indices of the Mars year.
+
+        Yields
+        ------
+        The index of the file in files, the position of the sols in the input, and the sols relative to the start of
+        that file. Files that hold none of the sols are skipped and never opened.
+
+        """
+        file_indices = np.searchsorted(self.sol_offsets, sols, side='right') - 1
+        for file_index in np.unique(file_indices):
+            positions = np.flatnonzero(file_indices == file_index)
+            yield int(file_index), positions, sols[positions] - self.sol_offsets[file_index]
+
+    def _load(self) -> dict:
+        files = list(self._location.glob(self._pattern))
+        if not files:
+            raise FileNotFoundError(f'Cannot find any files matching {self._pattern} at location {self._location}')
+        try:
+            index = json.loads((self._location / self.filename).read_text())
+        except (OSError, ValueError):
+            index = None
+        if index is None or not self._is_current(index, files):
+            index = self._build(files)
+            try:
+                (self._location / self.filename).write_text(json.dumps(index))
+            except OSError:
+                pass
+        return index
+
+    def _is_current(self, index: dict, files: list[Path]) -> bool:
+        if index.get('format_version') != self._format_version or index.get('pattern') != self._pattern:
+            return False
+        indexed_signatures = {f['name']: {'size': f['size'], 'mtime_ns': f['mtime_ns']} for f in index['files']}
+        return indexed_signatures == {f.name: self._get_signature(f) for f in files}
+
+    def _build(self, files: list[Path]) -> dict:
+        entries = []
+        for file in files:
+            with Dataset(file) as dataset:
+                n_records = dataset.dimensions['Time'].size
+                start = float(dataset['Time'][0]) if 'Time' in dataset.variables else self._get_file_number(file)
+                if 'Ls' in dataset.variables:
+                    solar_longitude = dataset['Ls'][self.records_per_sol // 2::self.records_per_sol]
+                    solar_longitude = np.ma.filled(solar_longitude.astype(float), np.nan).tolist()
+                else:
+                    solar_longitude = [None] * (n_records // self.records_per_sol)
+            if n_records % self.records_per_sol:
+                raise ValueError(f'{file.name} does not contain a whole number of sols.')
+            entries.append({'name': file.name, **self._get_signature(file), 'n_records': n_records, 'start': start,
+                            'solar_longitude': solar_longitude})
+        entries.sort(key=lambda f: (f['start'], self._get_file_number(self._location / f['name'])))
+        # The start time is only used to order the files, so it isn't saved in the index
+        for entry in entries:
+            del entry['start']
+        with Dataset(self._location / entries[0]['name']) as dataset:
+            latitude = dataset['latitude'][:].data.tolist()
+            longitude = dataset['longitude'][:].data.tolist()
+        return {'format_version': self._format_version, 'pattern': self._pattern, 'files': entries,
+                'latitude': latitude, 'longitude': longitude}
+
+    @staticmethod
+    def _get_signature(file: Path) -> dict:
+        stat = file.stat()
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    @staticmethod
+    def _get_file_number(file: Path) -> int:
+        number = re.findall(r'\d+', file.stem)
+        return int(number[-1]) if number else 0
@@ -0,0 +1,120 @@
+from typing import Callable, Iterator
+
+import numpy as np
+
+
+default_max_bytes = 256 * 2**20
+
+
+def get_sols_per_block(bytes_per_sol: int, max_bytes: int = default_max_bytes) -> int:
+    """Get the number of sols that can be worked on at once without going over a memory budget.
+
+    Parameters
+    ----------
+    bytes_per_sol
+        The number of bytes one sol of work needs, including any temporary arrays.
+    max_bytes
+        The memory budget. At least one sol is always returned, even if it needs more than the budget.
+
+    Returns
+    -------
+    The number of sols per block.
+
+    """
+    return max(1, int(max_bytes // max(bytes_per_sol, 1)))
+
+
+def iterate_sol_blocks(n_sols: int, sols_per_block: int) -> Iterator[slice]:
+    """Iterate over consecutive blocks of sol indices.
+
+    Parameters
+    ----------
+    n_sols
+        The total number of sols.
+    sols_per_block
+        The maximum number of sols in each block.
+
+    Yields
+    ------
+    A slice of sol indices.
+
+    """
+    if sols_per_block < 1:
+        raise ValueError('sols_per_block must be at least 1.')
+    for start in range(0, n_sols, sols_per_block):
+        yield slice(start, min(start + sols_per_block, n_sols))
+
+
+class LazySolArray:
+    """An array whose data are only read or computed when they're indexed, one block of sols at a time.
+
+    Parameters
+    ----------
+    read
+        A function that takes a slice of sol indices and returns the data for those sols.
+    shape
+        The shape of the full array. The first axis must be sol.
+    dtype
+        The data type of the array.
+
+    Notes
+    -----
+    Indexing with an integer or slice along the first axis only reads those sols; any other indices are applied to
+    the block afterwards. Use iter_blocks to work through the whole array with a bounded amount of memory, or
+    np.asarray to read all of it at once.
+
+    """
+    def __init__(self, read: Callable[[slice], np.ndarray], shape: tuple[int, ...], dtype: np.dtype):
+        self._read = read
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(shape={self.shape}, dtype={self.dtype})'
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self) -> int:
+        return self.size * self.dtype.itemsize
+
+    def __getitem__(self, key):
+        key = key if isinstance(key, tuple) else (key,)
+        if not key or key[0] is Ellipsis:
+            return np.asarray(self)[key]
+        first, rest = key[0], (slice(None),) + key[1:]
+        sols = range(self.shape[0])[first]
+        if isinstance(sols, int):
+            return self._read(slice(sols, sols + 1))[0][key[1:]]
+        if not len(sols):
+            return np.empty((0,) + self.shape[1:], dtype=self.dtype)[rest]
+        return self._read(slice(sols.start, sols.stop if sols.stop >= 0 else None, sols.step))[rest]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        array = self._read(slice(None))
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    def iter_blocks(self, sols_per_block: int) -> Iterator[tuple[slice, np.ndarray]]:
+        """Iterate over the array one block of sols at a time.
+
+        Parameters
+        ----------
+        sols_per_block
+            The maximum number of sols to read at once.
+
+        Yields
+        ------
+        The slice of sol indices in the block, and the data for those sols.
+
+        """
+        for sols in iterate_sol_blocks(self.shape[0], sols_per_block):
+            yield sols, self._read(sols)
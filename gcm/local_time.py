@@ -0,0 +1,107 @@
+import numpy as np
+
+
+class LocalTimeMapper:
+    """Move simulation fields between universal time and local solar time.
+
+    The simulations output the whole planet at the same instants, so the time axis of their (sol, time, lat, lon)
+    fields is universal time. At longitude lon, universal time t is local time t + lon / 15. This object precomputes
+    which time index (and interpolation weight) each longitude needs and does the conversion with a single gather.
+
+    Parameters
+    ----------
+    longitude_centers
+        The longitude [degrees] of each column of the fields.
+    time_centers
+        The universal time [hours] of each time index of the fields. They must be evenly spaced over the sol.
+
+    Notes
+    -----
+    Each sol's diurnal cycle is treated as periodic, so a local time whose universal time falls before the first or
+    after the last time index wraps around within the same sol rather than moving to the adjacent one.
+
+    """
+    def __init__(self, longitude_centers: np.ndarray, time_centers: np.ndarray):
+        self._longitude_hours = np.asarray(longitude_centers, dtype=float) / 15
+        self._time_centers = np.asarray(time_centers, dtype=float)
+        self._n_times = self._time_centers.shape[0]
+        self._time_step = 24 / self._n_times
+        self._indices = {}
+
+    def get_fixed_local_time(self, field: np.ndarray, local_times: np.ndarray, interpolate: bool = True) -> np.ndarray:
+        """Get a field at fixed local times everywhere, like a map of 2 pm at every longitude.
+
+        Parameters
+        ----------
+        field
+            The field with shape (sol, universal time, lat, lon[, ...]).
+        local_times
+            The local time [hours] of each map.
+        interpolate
+            If True, linearly interpolate between the two time indices on either side of each local time. Otherwise,
+            use the closest one.
+
+        Returns
+        -------
+        The field with shape (sol, local time, lat, lon[, ...]).
+
+        """
+        universal_times = np.atleast_1d(local_times)[:, None] - self._longitude_hours
+        return self._gather(field, universal_times, interpolate)
+
+    def universal_to_local(self, field: np.ndarray, interpolate: bool = False) -> np.ndarray:
+        """Convert a field from being indexed by universal time to being indexed by local time.
+
+        Parameters
+        ----------
+        field
+            The field with shape (sol, universal time, lat, lon[, ...]).
+        interpolate
+            If True, linearly interpolate between time indices. Otherwise, use the closest one.
+
+        Returns
+        -------
+        The field with shape (sol, local time, lat, lon[, ...]), where the local times are the same as the universal
+        times of the input.
+
+        """
+        return self.get_fixed_local_time(field, self._time_centers, interpolate)
+
+    def local_to_universal(self, field: np.ndarray, interpolate: bool = False) -> np.ndarray:
+        """Convert a field from being indexed by local time back to being indexed by universal time.
+
+        Parameters
+        ----------
+        field
+            The field with shape (sol, local time, lat, lon[, ...]), like the output of universal_to_local.
+        interpolate
+            If True, linearly interpolate between time indices. Otherwise, use the closest one.
+
+        Returns
+        -------
+        The field with shape (sol, universal time, lat, lon[, ...]).
+
+        """
+        local_times = self._time_centers[:, None] + self._longitude_hours
+        return self._gather(field, local_times, interpolate)
+
+    def _gather(self, field: np.ndarray, times: np.ndarray, interpolate: bool) -> np.ndarray:
+        field = np.asarray(field)
+        key = (times.tobytes(), interpolate)
+        if key not in self._indices:
+            self._indices[key] = self._make_indices(times, interpolate)
+        lower, upper, weights = self._indices[key]
+        # The index arrays broadcast against the sol and lat axes and any trailing axes
+        shape = (1,) + times.shape[:1] + (1,) + times.shape[1:] + (1,) * (field.ndim - 4)
+        values = np.take_along_axis(field, np.reshape(lower, shape), axis=1)
+        if upper is None:
+            return values
+        weights = np.reshape(weights, shape)
+        return values * (1 - weights) + np.take_along_axis(field, np.reshape(upper, shape), axis=1) * weights
+
+    def _make_indices(self, times: np.ndarray, interpolate: bool) -> tuple:
+        positions = np.mod((times - self._time_centers[0]) / self._time_step, self._n_times)
+        if not interpolate:
+            return np.mod(np.round(positions).astype(int), self._n_times), None, None
+        lower = np.floor(positions).astype(int)
+        return lower, np.mod(lower + 1, self._n_times), positions - lower
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from pathlib import Path
+import threading
+from typing import Callable, Hashable
+
+import numpy as np
+
+from caching.file_cache import get_file_signature
+
+
+default_memo_bytes = 2**26
+
+
+class ArrayMemo:
+    """A least-recently-used memo of arrays whose total size is bounded in bytes rather than in entries.
+
+    Parameters
+    ----------
+    max_bytes
+        The most bytes of arrays to hold at once. The least recently used arrays are evicted to stay under it, and an
+        array bigger than this is returned without being memoized.
+    source_files
+        The files the arrays are derived from. The memo is cleared whenever any of them changes.
+
+    Notes
+    -----
+    Every array this returns is made read-only, since callers of a memoized array all get the same one. Arrays that
+    are too big to memoize are made read-only too, so whether a caller can change an array never depends on its size
+    or on max_bytes; copy an array to change it. Memory maps don't count toward max_bytes since their data live on disk. The default
+    max_bytes is small enough for coordinates and windows of fields, not whole years of fields.
+
+    """
+    def __init__(self, max_bytes: int = default_memo_bytes, source_files: list[Path] = None):
+        self.max_bytes = max_bytes
+        self._source_files = source_files or []
+        self._signature = self._get_signature()
+        self._arrays = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._arrays)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(entries={len(self)}, nbytes={self.nbytes}, max_bytes={self.max_bytes}, ' \
+               f'hits={self.hits}, misses={self.misses}, evictions={self.evictions})'
+
+    def get(self, key: Hashable, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Get an array from the memo, computing it first if it isn't there.
+
+        Parameters
+        ----------
+        key
+            A hashable key that identifies the array, including any arguments used to make it.
+        compute
+            A function that makes the array.
+
+        Returns
+        -------
+        The read-only array.
+
+        """
+        with self._lock:
+            signature = self._get_signature()
+            if signature != self._signature:
+                self._clear()
+                self._signature = signature
+            if key in self._arrays:
+                self._arrays.move_to_end(key)
+                self.hits += 1
+                return self._arrays[key]
+            self.misses += 1
+
+        array = compute()
+        if isinstance(array, np.ndarray):
+            array.flags.writeable = False
+        size = self._get_size(array)
+        if size > self.max_bytes:
+            return array
+
+        with self._lock:
+            if key in self._arrays:
+                return self._arrays[key]
+            self._arrays[key] = array
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._arrays.popitem(last=False)
+                self.nbytes -= self._get_size(evicted)
+                self.evictions += 1
+        return array
+
+    def clear(self) -> None:
+        """Remove every array from the memo."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        self._arrays.clear()
+        self.nbytes = 0
+
+    def _get_signature(self) -> str:
+        return get_file_signature(self._source_files) if self._source_files else ''
+
+    @staticmethod
+    def _get_size(array) -> int:
+        if isinstance(array, np.memmap) or not isinstance(array, np.ndarray):
+            return 0
+        return array.nbytes
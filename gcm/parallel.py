@@ -0,0 +1,72 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable
+
+from gcm.ames import AmesSimulation
+from gcm.pcm import PlanetaryClimateModelSimulation
+
+
+simulation_models = {'ames': AmesSimulation, 'pcm': PlanetaryClimateModelSimulation}
+
+
+def print_progress(n_completed: int, n_total: int, simulation: tuple[str, int, int]) -> None:
+    """Print which simulation just finished. This can be used as the progress callback of map_simulations."""
+    model, version, mars_year = simulation
+    print(f'{n_completed}/{n_total}: finished {model} v{version:02} MY{mars_year:02}', flush=True)
+
+
+def map_simulations(reduction: Callable[[Any], Any], simulations: list[tuple[str, int, int]],
+                    max_workers: int = None, progress: Callable[[int, int, tuple[str, int, int]], None] = None,
+                    **simulation_kwargs) -> list:
+    """Apply a reduction to many simulations at once on a pool of processes.
+
+    Each simulation is built and reduced entirely in a worker process, so only the (presumably small) result of the
+    reduction is sent back to this process.
+
+    Parameters
+    ----------
+    reduction
+        A function that takes a simulation object and returns something small, like a zonal mean or a few sols of a
+        field. It must be picklable, so it has to be defined at the top level of a module.
+    simulations
+        The (model, version, mars_year) of each simulation, where model is "ames" or "pcm".
+    max_workers
+        The number of processes to use. The default uses every core. Use 1 to run everything in this process, which
+        makes debugging a reduction much easier.
+    progress
+        A function that's called with (number completed, total number, simulation) each time a simulation finishes,
+        like print_progress.
+    simulation_kwargs
+        Any keyword arguments to give to every simulation object, like cache_directory.
+
+    Returns
+    -------
+    The result of each reduction, in the same order as simulations no matter what order they finish in.
+
+    """
+    for model, _, _ in simulations:
+        if model not in simulation_models:
+            raise ValueError(f'{model} is not a known model. Use one of {list(simulation_models)}.')
+
+    results = [None] * len(simulations)
+    if max_workers == 1:
+        for index, simulation in enumerate(simulations):
+            results[index] = _reduce_simulation(reduction, simulation, simulation_kwargs)
+            if progress is not None:
+                progress(index + 1, len(simulations), simulation)
+        return results
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_reduce_simulation, reduction, simulation, simulation_kwargs): index
+                   for index, simulation in enumerate(simulations)}
+        for n_completed, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            results[index] = future.result()
+            if progress is not None:
+                progress(n_completed, len(simulations), simulations[index])
+    return results
+
+
+def _reduce_simulation(reduction: Callable[[Any], Any], simulation: tuple[str, int, int], simulation_kwargs: dict):
+    model, version, mars_year = simulation
+    with simulation_models[model](version, mars_year, **simulation_kwargs) as simulation_object:
+        return reduction(simulation_object)
@@ -1,9 +1,20 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
 from pathlib import Path
+import tempfile
 
 from netCDF4 import Dataset
 import numpy as np
 
+from caching.file_cache import FieldCache
 from gcm.abstract import AbstractSimulation
+from gcm.altitude import get_altitude_centers, get_altitude_edges, mars_gravity
+from gcm.index import MonthlyFileIndex
+from gcm.lazy import LazySolArray
+from gcm.memo import ArrayMemo, default_memo_bytes
+from gcm.pool import dataset_pool
+from gcm.solar_longitude import SolarLongitudeIndex
 
 
 class PlanetaryClimateModelSimulation(AbstractSimulation):
@@ -13,6 +24,22 @@ class PlanetaryClimateModelSimulation(AbstractSimulation):
     ----------
     version
     mars_year
+    cache_directory
+        If given, each field is cached for the whole year in this directory (see FieldCache) the first time it's
+        requested. Later requests, including windowed ones, are read-only views of the memory mapped cache.
+    memo_bytes
+        The most bytes of arrays to keep in memory between calls (see ArrayMemo). Repeated calls with the same
+        arguments return the same array until the monthly files change. Use 0 to turn this off. The fields that aren't
+        lazy are always returned read-only, whether or not they fit in the memo, so copy one to change it.
+    dtype
+        The dtype to return fields as, like np.float32. The default uses the class's default_dtype, which keeps the
+        dtype in the files unless set_default_dtype was called. Each month is converted as it's written into the output,
+        so a converted field never needs a second copy in memory.
+    max_workers
+        The most months to read at once, each in its own process with its own handle to its file. The default of 1
+        reads them one after another in this process. The netCDF library can only be used by one thread at a time, so
+        the months are read in processes rather than threads. The processes are started the first time they're needed
+        and are kept until close is called.
 
     Notes
     -----
@@ -24,11 +51,41 @@ class PlanetaryClimateModelSimulation(AbstractSimulation):
     3. I remove the extra duplicate grid point. The longitude axis has shape (65,) where the first and last points
        are identical, so I only keep the first copy
     4. I roll the data such that the data go from 0 to 360. Though with their grid, it's more like 357 to 357.
+
+    The accessors take optional sols, local_times, lat, and lon windows, and an ls window of solar longitudes that can
+    be used instead of sols. Like the ls window, a lon window wraps across the 0/360 seam if its stop is less than its
+    start. Only the parts of the monthly files that overlap the window are read, so a single sol only touches the file
+    that contains it. Which file holds each sol (and each sol's solar longitude) comes from a MonthlyFileIndex saved
+    next to the data, and files are only opened once they're needed. The open files come from the same process-wide pool
+    as AmesSimulation uses; call close (or use the object as a context manager) to give them back.
     """
 
-    def __init__(self, version: int, mars_year: int):
+    def __init__(self, version: int, mars_year: int, cache_directory: Path = None,
+                 memo_bytes: int = default_memo_bytes, dtype: np.dtype = None, max_workers: int = 1):
+        self._dtype = None if dtype is None else np.dtype(dtype)
+        self._max_workers = max_workers
+        self._executor = None
+        self._solar_longitude_index = None
         self._location = self._make_simulation_files_location(version, mars_year)
-        self._monthly_datasets = self._load_monthly_datasets()
+        self._index = MonthlyFileIndex(self._location)
+        self._monthly_datasets = {}
+        self._cache = None if cache_directory is None else FieldCache(cache_directory, self._index.files)
+        self.memo = ArrayMemo(memo_bytes, self._index.files)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """Release the files this object has opened and stop its worker processes."""
+        for file_index in self._monthly_datasets:
+            dataset_pool.release(self._index.files[file_index])
+        self._monthly_datasets = {}
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
     @staticmethod
     def _make_simulation_files_location(version: int, mars_year: int):
@@ -37,12 +94,15 @@ class PlanetaryClimateModelSimulation(AbstractSimulation):
             raise NotADirectoryError('The request files are not in a directory that exists.')
         return location
 
-    def _load_monthly_datasets(self):
-        files = self._location.glob('diagfi*.nc')
-        return [Dataset(f) for f in files]
+    def _get_monthly_dataset(self, file_index: int) -> Dataset:
+        if file_index not in self._monthly_datasets:
+            dataset = dataset_pool.acquire(self._index.files[file_index])
+            dataset.set_auto_mask(False)
+            self._monthly_datasets[file_index] = dataset
+        return self._monthly_datasets[file_index]
 
     def get_latitude_centers(self):
-        return self._monthly_datasets[0]['latitude'][:].data
+        return self._index.get_latitude()
 
     def get_latitude_edges(self) -> np.ndarray:
         """Get the latitude edges.
@@ -59,7 +119,7 @@ class PlanetaryClimateModelSimulation(AbstractSimulation):
         return np.concatenate((centers + grid_difference/2, [centers[-1] - grid_difference/2]))
 
     def get_longitude_centers(self):
-        lon = self._monthly_datasets[0]['longitude'][:-1].data % 360
+        lon = self._index.get_longitude()[:-1] % 360
         lon = np.roll(lon, lon.shape[0]//2, axis=-1)
         return np.append(lon, 360)
 
@@ -68,34 +128,429 @@ class PlanetaryClimateModelSimulation(AbstractSimulation):
         grid_difference = np.abs(np.diff(centers))[0]
         return np.concatenate(([centers[0] - grid_difference/2], centers + grid_difference/2))
 
-    def get_surface_pressure(self):
-        ps = np.vstack([f['ps'][:, :, :-1].data for f in self._monthly_datasets])
-        ps = np.reshape(ps, (ps.shape[0] // 24, 24, ps.shape[1], ps.shape[2]))
-        ps = np.roll(ps, ps.shape[-1]//2, axis=-1)
-        return np.concatenate((ps, ps[:, :, :, 0][..., None]), axis=-1)
-
-    def get_surface_temperature(self):
-        ts = np.vstack([f['tsurf'][:, :, :-1].data for f in self._monthly_datasets])
-        ts = np.reshape(ts, (ts.shape[0]//24, 24, ts.shape[1], ts.shape[2]))
-        ts = np.roll(ts, ts.shape[-1] // 2, axis=-1)
-        return np.concatenate((ts, ts[:, :, :, 0][..., None]), axis=-1)
-
-    def get_atmospheric_pressure(self):
-        # This array takes up over 1GB or RAM so I'm not making it until I have a reason to
-        pass
-
-    def get_atmospheric_temperature(self):
-        # This array takes up over 1GB or RAM so I'm not making it until I have a reason to
-        pass
-
-    def get_dust_ultraviolet_column_optical_depth(self):
-        tau_dust = np.vstack([f['tau_dust'][:, :, :-1].data for f in self._monthly_datasets])
-        tau_dust = np.reshape(tau_dust, (tau_dust.shape[0] // 24, 24, tau_dust.shape[1], tau_dust.shape[2]))
-        tau_dust = np.roll(tau_dust, tau_dust.shape[-1] // 2, axis=-1)
-        return np.concatenate((tau_dust, tau_dust[:, :, :, 0][..., None]), axis=-1)
-
-    def get_ice_ultraviolet_column_optical_depth(self):
-        tau_h2o_ice = np.vstack([f['tau_h2o_ice'][:, :, :-1].data for f in self._monthly_datasets])
-        tau_h2o_ice = np.reshape(tau_h2o_ice, (tau_h2o_ice.shape[0] // 24, 24, tau_h2o_ice.shape[1], tau_h2o_ice.shape[2]))
-        tau_h2o_ice = np.roll(tau_h2o_ice, tau_h2o_ice.shape[-1] // 2, axis=-1)
-        return np.concatenate((tau_h2o_ice, tau_h2o_ice[:, :, :, 0][..., None]), axis=-1)
+    @property
+    def solar_longitude_index(self) -> SolarLongitudeIndex:
+        """Get the index of which sols are in a solar longitude window."""
+        if self._solar_longitude_index is None:
+            self._solar_longitude_index = SolarLongitudeIndex(self._index.get_solar_longitude())
+        return self._solar_longitude_index
+
+    def get_simulation_sol_centers(self, ls: tuple[float, float] = None) -> np.ndarray:
+        return (np.arange(self._index.n_sols) + 0.5)[self._make_index_slice(self._get_sol_window(None, ls))]
+
+    def get_solar_longitude_centers(self, ls: tuple[float, float] = None) -> np.ndarray:
+        """Get the solar longitude of each sol, which is the value at the middle of the sol.
+
+        Parameters
+        ----------
+        ls
+            The (start, stop) solar longitude [degrees] window to get. None gets all sols.
+
+        """
+        return self._index.get_solar_longitude()[self._make_index_slice(self._get_sol_window(None, ls))]
+
+    def get_simulation_sol_edges(self) -> np.ndarray:
+        return np.arange(self._index.n_sols + 1)
+
+    def get_local_time_centers(self) -> np.ndarray:
+        """Get the hour of each record within a sol.
+
+        The records are instantaneous, so each one is the center of an hour-wide bin.
+
+        """
+        return np.arange(24)
+
+    def get_local_time_edges(self) -> np.ndarray:
+        return np.arange(25) - 0.5
+
+    def get_surface_pressure(self, sols: int | slice = None, local_times: int | slice = None,
+                             lat: tuple[float, float] = None, lon: tuple[float, float] = None,
+                             ls: tuple[float, float] = None) -> np.ndarray:
+        return self._read_grid_variable('ps', sols, local_times, lat, lon, ls)
+
+    def get_surface_temperature(self, sols: int | slice = None, local_times: int | slice = None,
+                                lat: tuple[float, float] = None, lon: tuple[float, float] = None,
+                                ls: tuple[float, float] = None) -> np.ndarray:
+        return self._read_grid_variable('tsurf', sols, local_times, lat, lon, ls)
+
+    def get_ak(self) -> np.ndarray:
+        return self._get_monthly_dataset(0)['ap'][:]
+
+    def get_bk(self) -> np.ndarray:
+        return self._get_monthly_dataset(0)['bp'][:]
+
+    def get_atmospheric_pressure(self, local_times: int | slice = None, lat: tuple[float, float] = None,
+                                 lon: tuple[float, float] = None, ls: tuple[float, float] = None) -> LazySolArray:
+        """Get the pressure at the layer boundaries.
+
+        The full year of this array takes up over 1 GB of RAM, so nothing is computed until the returned array is
+        indexed. Index it by sol, or use its iter_blocks method to get (sol block, array) pairs. If ls is given, its sol
+        axis only covers the sols in the solar longitude window.
+
+        Returns
+        -------
+        A lazy array of shape (sol, local time, lat, lon, level boundary).
+
+        """
+        ak = self.get_ak()
+        bk = self.get_bk()
+        dtype = self._get_dtype(np.result_type(self._get_monthly_dataset(0)['ps'].dtype, ak.dtype, bk.dtype))
+
+        sol_indices = np.arange(self._index.n_sols)[self._make_index_slice(self._get_sol_window(None, ls))]
+
+        def read(sols: slice) -> np.ndarray:
+            sol_window = self._make_contiguous_slice(sol_indices[sols])
+            surface_pressure = self._read_cached_grid_variable('ps', sol_window, local_times, lat, lon)
+            pressure = np.multiply.outer(surface_pressure, bk, out=np.empty(surface_pressure.shape + bk.shape, dtype))
+            pressure += ak
+            return pressure
+
+        shape = (sol_indices.size,) + self._get_grid_shape('ps', local_times, lat, lon)[1:] + ak.shape
+        return LazySolArray(read, shape, dtype)
+
+    def get_atmospheric_temperature(self, local_times: int | slice = None, lat: tuple[float, float] = None,
+                                    lon: tuple[float, float] = None, ls: tuple[float, float] = None) -> LazySolArray:
+        """Get the temperature at the layer midpoints.
+
+        The full year of this array takes up over 1 GB of RAM, so nothing is read until the returned array is indexed.
+        Index it by sol, or use its iter_blocks method to get (sol block, array) pairs. If ls is given, its sol axis
+        only covers the sols in the solar longitude window.
+
+        Returns
+        -------
+        A lazy array of shape (sol, local time, lat, lon, level).
+
+        """
+        return self._make_lazy_grid_variable('temp', local_times, lat, lon, ls)
+
+    def get_surface_elevation(self) -> np.ndarray:
+        """Get the elevation of the surface above the areoid.
+
+        Returns
+        -------
+        The elevation [m] with shape (lat, lon), which is the surface geopotential divided by the gravity.
+
+        """
+        geopotential = self._get_monthly_dataset(0)['phisinit'][:]
+        return geopotential[..., self._get_file_longitude_indices(None)] / mars_gravity
+
+    def get_altitude_edges(self, local_times: int | slice = None, lat: tuple[float, float] = None,
+                           lon: tuple[float, float] = None, ls: tuple[float, float] = None) -> LazySolArray:
+        """Get the altitude of every layer boundary.
+
+        Nothing is computed until the returned array is indexed, and then only for the sols that are indexed. The
+        altitudes are integrated up from the surface with the hypsometric equation (see
+        gcm.altitude.get_altitude_edges). Like the fields read from the files, they're cached if this object has a
+        cache directory, so looking up the same columns again only reads them from the cache.
+
+        Returns
+        -------
+        A lazy array of the altitude [m] above the areoid with shape (sol, local time, lat, lon, level boundary). It's
+        on the same boundaries as get_atmospheric_pressure, so the first boundary is the surface elevation.
+
+        """
+        return self._make_lazy_grid_variable('altitude_edges', local_times, lat, lon, ls)
+
+    def get_altitude_centers(self, local_times: int | slice = None, lat: tuple[float, float] = None,
+                             lon: tuple[float, float] = None, ls: tuple[float, float] = None) -> LazySolArray:
+        """Get the altitude of the middle of every layer.
+
+        This is computed and cached like get_altitude_edges. Each layer's middle is where its pressure is
+        the mean of the pressures at its boundaries.
+
+        Returns
+        -------
+        A lazy array of the altitude [m] above the areoid with shape (sol, local time, lat, lon, level).
+
+        """
+        return self._make_lazy_grid_variable('altitude_centers', local_times, lat, lon, ls)
+
+    def get_dust_ultraviolet_column_optical_depth(self, sols: int | slice = None, local_times: int | slice = None,
+                                                  lat: tuple[float, float] = None, lon: tuple[float, float] = None,
+                                                  ls: tuple[float, float] = None) -> np.ndarray:
+        return self._read_grid_variable('tau_dust', sols, local_times, lat, lon, ls)
+
+    def get_ice_ultraviolet_column_optical_depth(self, sols: int | slice = None, local_times: int | slice = None,
+                                                 lat: tuple[float, float] = None, lon: tuple[float, float] = None,
+                                                 ls: tuple[float, float] = None) -> np.ndarray:
+        return self._read_grid_variable('tau_h2o_ice', sols, local_times, lat, lon, ls)
+
+    def _read_grid_variable(self, name: str, sols: int | slice | np.ndarray, local_times: int | slice,
+                            lat: tuple[float, float], lon: tuple[float, float],
+                            ls: tuple[float, float] = None) -> np.ndarray:
+        sols = self._get_sol_window(sols, ls)
+        # slices aren't hashable, but their repr identifies them. Arrays are abbreviated by repr, so use their values
+        key = repr((name, tuple(sols.tolist()) if isinstance(sols, np.ndarray) else sols, local_times, lat, lon,
+                    self.dtype))
+        return self.memo.get(key, lambda: self._read_cached_grid_variable(name, sols, local_times, lat, lon))
+
+    def _make_lazy_grid_variable(self, name: str, local_times: int | slice, lat: tuple[float, float],
+                                 lon: tuple[float, float], ls: tuple[float, float]) -> LazySolArray:
+        sol_indices = np.arange(self._index.n_sols)[self._make_index_slice(self._get_sol_window(None, ls))]
+
+        # Blocks skip the memo, so iterating over the whole year never holds more than a block in memory
+        def read(sols: slice) -> np.ndarray:
+            sol_window = self._make_contiguous_slice(sol_indices[sols])
+            return self._read_cached_grid_variable(name, sol_window, local_times, lat, lon)
+
+        shape = (sol_indices.size,) + self._get_grid_shape(name, local_times, lat, lon)[1:]
+        return LazySolArray(read, shape, self._get_variable_dtype(name))
+
+    def _read_cached_grid_variable(self, name: str, sols: int | slice | np.ndarray, local_times: int | slice,
+                                   lat: tuple[float, float], lon: tuple[float, float]) -> np.ndarray:
+        if self._cache is None:
+            return self._compute_grid_variable(name, sols, local_times, lat, lon)
+
+        def read(sols: slice) -> np.ndarray:
+            return self._compute_grid_variable(name, sols, None, None, None)
+
+        key = name if self.dtype is None else f'{name}-{self.dtype}'
+        field = self._cache.get(key, lambda: LazySolArray(read, self._get_grid_shape(name, None, None, None),
+                                                           self._get_variable_dtype(name)))
+        window = field[self._make_index_slice(sols), self._make_index_slice(local_times),
+                       self._make_coordinate_slice(self.get_latitude_centers(), lat)]
+        # The longitudes are indexed separately since both they and the sols can be index arrays
+        return window[:, :, :, self._make_longitude_index(lon)]
+
+    def _compute_grid_variable(self, name: str, sols: int | slice | np.ndarray, local_times: int | slice,
+                               lat: tuple[float, float], lon: tuple[float, float]) -> np.ndarray:
+        """Get a window of a variable, either by reading it from the monthly files or by computing it from variables
+        that are read from them."""
+        if name not in ('altitude_edges', 'altitude_centers'):
+            return self._read_file_grid_variable(name, sols, local_times, lat, lon)
+        surface_pressure = self._read_cached_grid_variable('ps', sols, local_times, lat, lon)
+        pressure = np.multiply.outer(surface_pressure, self.get_bk()) + self.get_ak()
+        temperature = self._read_cached_grid_variable('temp', sols, local_times, lat, lon)
+        surface_elevation = self.get_surface_elevation()[self._make_coordinate_slice(self.get_latitude_centers(), lat)]
+        surface_elevation = surface_elevation[:, self._make_longitude_index(lon)]
+        altitude = get_altitude_edges(surface_elevation, pressure, temperature)
+        if name == 'altitude_centers':
+            altitude = get_altitude_centers(altitude, pressure)
+        return altitude.astype(self._get_variable_dtype(name), copy=False)
+
+    def _get_variable_level_shape(self, name: str) -> tuple[int, ...]:
+        if name == 'altitude_edges':
+            return self.get_ak().shape
+        return self._get_monthly_dataset(0)['temp' if name == 'altitude_centers' else name].shape[1:-2]
+
+    def _get_variable_dtype(self, name: str) -> np.dtype:
+        if name in ('altitude_edges', 'altitude_centers'):
+            return self._get_dtype(np.float64)
+        return self._get_dtype(self._get_monthly_dataset(0)[name].dtype)
+
+    def _read_file_grid_variable(self, name: str, sols: int | slice | np.ndarray, local_times: int | slice,
+                                 lat: tuple[float, float], lon: tuple[float, float]) -> np.ndarray:
+        """Read a (time, [level,] latitude, longitude) variable onto this object's (sol, local time, lat, lon[, level])
+        grid.
+
+        Only the hyperslabs that overlap the requested window are read from the monthly files. The output is allocated
+        once, in this object's dtype, and each month is converted as it's written straight into its place in it. The
+        longitude roll and the seam column are done by choosing where each piece of the file is written rather than by
+        copying the data afterwards, so the peak memory is about the size of the output. The months are read in up to
+        max_workers processes.
+
+        Parameters
+        ----------
+        name
+            The name of the variable in the monthly files.
+        sols
+            The sol index (or slice or sorted array of sol indices) of the Mars year to get. None gets all sols.
+        local_times
+            The hour index (or slice of hour indices) to get. None gets all 24 hours.
+        lat
+            The (minimum, maximum) latitude [degrees] to get. None gets all latitudes.
+        lon
+            The (start, stop) longitude [degrees] to get, on this object's 0--360 grid. A window whose stop is less
+            than its start wraps across 0, so (350, 10) gets the 20 degrees around the prime meridian. None gets all
+            longitudes.
+
+        Returns
+        -------
+        The requested data. Integer indices keep their dimension so the array is always 4D (or 5D for variables with
+        a vertical dimension).
+
+        """
+        sol_indices = np.arange(self._index.n_sols)[self._make_index_slice(sols)]
+        hour_indices = np.arange(24)[self._make_index_slice(local_times)]
+        latitude_slice = self._make_coordinate_slice(self.get_latitude_centers(), lat)
+        longitude_indices = self._get_file_longitude_indices(lon)
+        longitude_runs, longitude_duplicates = self._get_longitude_runs(longitude_indices)
+
+        variable = self._get_monthly_dataset(0)[name]
+        level_shape = variable.shape[1:-2]
+        n_latitudes = len(range(*latitude_slice.indices(variable.shape[-2])))
+        shape = (sol_indices.size, hour_indices.size, n_latitudes, longitude_indices.size) + level_shape
+        dtype = self._get_dtype(variable.dtype)
+
+        months = [(file_index, self._make_contiguous_slice(positions),
+                   self._make_contiguous_slice(np.ravel(month_sol_indices[:, None] * 24 + hour_indices)))
+                  for file_index, positions, month_sol_indices in self._index.split_sols(sol_indices)]
+        if self._max_workers == 1 or len(months) < 2:
+            output = np.empty(shape, dtype=dtype)
+            for file_index, sol_positions, records in months:
+                _read_month(self._get_monthly_dataset(file_index)[name], self._to_file_order(output), sol_positions,
+                            records, latitude_slice, longitude_runs)
+        else:
+            output = self._read_months_in_processes(name, months, shape, dtype, latitude_slice, longitude_runs)
+        file_ordered_output = self._to_file_order(output)
+        for duplicate, original in longitude_duplicates:
+            file_ordered_output[..., duplicate] = file_ordered_output[..., original]
+        return output
+
+    def _read_months_in_processes(self, name: str, months: list[tuple[int, slice | np.ndarray, slice | np.ndarray]],
+                                  shape: tuple[int, ...], dtype: np.dtype, latitude_slice: slice,
+                                  longitude_runs: list[tuple[slice, slice]]) -> np.ndarray:
+        """Read each month into its sols of a new output in this object's worker processes.
+
+        Each worker opens its own handle to its monthly file, so nothing is shared with this process's pool. The output
+        is a memory map of a temporary file that every worker maps too, so they write straight into it and it's
+        returned without being copied.
+
+        """
+        descriptor, output_file = tempfile.mkstemp(suffix='.npy')
+        os.close(descriptor)
+        try:
+            output = np.lib.format.open_memmap(output_file, mode='w+', dtype=dtype, shape=shape)
+            futures = [self._get_executor().submit(_read_month_into_file, self._index.files[file_index], name,
+                                                   output_file, sol_positions, records, latitude_slice, longitude_runs)
+                       for file_index, sol_positions, records in months]
+            for future in futures:
+                future.result()
+        finally:
+            # The output stays mapped after its file is removed
+            os.remove(output_file)
+        # A plain array counts toward the memo's size, unlike a memory map of a file that's still on disk
+        return np.asarray(output)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers never inherit the HDF5 library's state, like the datasets this process has open
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    @staticmethod
+    def _to_file_order(output: np.ndarray) -> np.ndarray:
+        # A view with the file's axis order so that each month can be assigned without moving its axes
+        return np.moveaxis(output, range(4, output.ndim), range(2, output.ndim - 2))
+
+    def _get_grid_shape(self, name: str, local_times: int | slice, lat: tuple[float, float],
+                        lon: tuple[float, float]) -> tuple[int, ...]:
+        n_hours = np.arange(24)[self._make_index_slice(local_times)].size
+        n_latitudes = self.get_latitude_centers()[self._make_coordinate_slice(self.get_latitude_centers(), lat)].size
+        n_longitudes = self._get_file_longitude_indices(lon).size
+        return (self._index.n_sols, n_hours, n_latitudes, n_longitudes) + self._get_variable_level_shape(name)
+
+    @staticmethod
+    def _get_longitude_runs(longitude_indices: np.ndarray) -> tuple[list[tuple[slice, slice]], list[tuple[int, int]]]:
+        """Split the file longitude indices into contiguous runs that can each be read with one hyperslab.
+
+        Returns
+        -------
+        The (output slice, file slice) of each run, and the (output index, output index) pairs of longitudes that
+        appear twice and so can be copied from the output instead of being read again.
+
+        """
+        _, first_occurrence = np.unique(longitude_indices, return_index=True)
+        is_first = np.zeros(longitude_indices.shape, dtype=bool)
+        is_first[first_occurrence] = True
+        duplicates = [(i, int(np.flatnonzero(longitude_indices == longitude_indices[i])[0]))
+                      for i in np.flatnonzero(~is_first)]
+
+        runs = []
+        start = None
+        for i in np.flatnonzero(is_first):
+            if start is not None and i == stop and longitude_indices[i] == longitude_indices[stop - 1] + 1:
+                stop += 1
+                continue
+            if start is not None:
+                runs.append((slice(start, stop), slice(longitude_indices[start], longitude_indices[stop - 1] + 1)))
+            start, stop = i, i + 1
+        runs.append((slice(start, stop), slice(longitude_indices[start], longitude_indices[stop - 1] + 1)))
+        return runs, duplicates
+
+    def _get_file_longitude_indices(self, lon: tuple[float, float]) -> np.ndarray:
+        """Get the indices along the file's longitude axis that make up this object's longitude axis.
+
+        The file's duplicate last point is never used. Rolling the data and appending the seam column are equivalent
+        to indexing the file with these indices.
+
+        """
+        n_longitudes = self._index.get_longitude().shape[0] - 1
+        indices = (np.arange(n_longitudes + 1) - n_longitudes // 2) % n_longitudes
+        return indices[self._make_longitude_index(lon)]
+
+    def _get_sol_window(self, sols: int | slice | np.ndarray, ls: tuple[float, float]) -> int | slice | np.ndarray:
+        if ls is None:
+            return sols
+        if sols is not None:
+            raise ValueError('Only one of sols and ls can be given.')
+        return self.solar_longitude_index.get_sols(ls)
+
+    @staticmethod
+    def _make_index_slice(index: int | slice | np.ndarray) -> slice | np.ndarray:
+        if index is None:
+            return slice(None)
+        if isinstance(index, (slice, np.ndarray)):
+            return index
+        return slice(index, index + 1 if index != -1 else None)
+
+    @staticmethod
+    def _make_coordinate_slice(centers: np.ndarray, bounds: tuple[float, float]) -> slice:
+        if bounds is None:
+            return slice(None)
+        indices = np.flatnonzero((centers >= min(bounds)) & (centers <= max(bounds)))
+        if not indices.size:
+            raise ValueError(f'No grid points are within {bounds}.')
+        return slice(indices[0], indices[-1] + 1)
+
+    def _make_longitude_index(self, bounds: tuple[float, float]) -> slice | np.ndarray:
+        """Get the indices of this object's longitudes that are within a window.
+
+        A window whose stop is less than its start (or whose start is negative) wraps across the 0/360 seam, so
+        (350, 10) gets the 20 degrees around the prime meridian, in that order. The seam column at 360 isn't used in a
+        window that wraps since it's the same as the one at 0.
+
+        """
+        if bounds is None:
+            return slice(None)
+        start, stop = bounds
+        if start <= stop and start >= 0:
+            return self._make_coordinate_slice(self.get_longitude_centers(), bounds)
+        centers = self.get_longitude_centers()
+        start = start % 360
+        indices = np.concatenate((np.flatnonzero((centers >= start) & (centers < 360)),
+                                  np.flatnonzero(centers <= stop)))
+        if not indices.size:
+            raise ValueError(f'No grid points are within {bounds}.')
+        return indices
+
+    @staticmethod
+    def _make_contiguous_slice(indices: np.ndarray) -> slice | np.ndarray:
+        if np.all(np.diff(indices) == 1):
+            return slice(indices[0], indices[-1] + 1)
+        return indices
+
+
+def _read_month(variable, file_ordered_output: np.ndarray, sol_positions: slice | np.ndarray,
+                records: slice | np.ndarray, latitude_slice: slice, longitude_runs: list[tuple[slice, slice]]) -> None:
+    """Read the hyperslabs of one month of a variable into its sols of an output that's in the file's axis order
+    after its (sol, local time) axes."""
+    n_sols = np.arange(file_ordered_output.shape[0])[sol_positions].size
+    n_levels = variable.ndim - 3
+    for output_longitudes, file_longitudes in longitude_runs:
+        data = variable[(records,) + (slice(None),) * n_levels + (latitude_slice, file_longitudes)]
+        file_ordered_output[sol_positions, ..., output_longitudes] = \
+            np.reshape(data, (n_sols, file_ordered_output.shape[1]) + data.shape[1:])
+
+
+def _read_month_into_file(file: Path, name: str, output_file: Path, sol_positions: slice | np.ndarray,
+                          records: slice | np.ndarray, latitude_slice: slice,
+                          longitude_runs: list[tuple[slice, slice]]) -> None:
+    """Read one month of a variable into its sols of a memory-mapped .npy output file in a worker process."""
+    output = np.load(output_file, mmap_mode='r+')
+    with Dataset(file) as dataset:
+        dataset.set_auto_mask(False)
+        _read_month(dataset[name], PlanetaryClimateModelSimulation._to_file_order(output), sol_positions, records,
+                    latitude_slice, longitude_runs)
+    output.flush()
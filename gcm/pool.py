@@ -0,0 +1,60 @@
+from pathlib import Path
+import threading
+
+from netCDF4 import Dataset
+
+
+class DatasetPool:
+    """A pool of open netCDF datasets that's shared by every simulation object in a process.
+
+    Each file is opened once no matter how many objects use it. The pool counts how many objects have acquired each
+    file and closes the file when the last one releases it.
+
+    """
+    def __init__(self):
+        self._datasets = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._datasets)
+
+    def acquire(self, file: Path) -> Dataset:
+        """Get an open dataset for a file, opening it only if no one else has it open.
+
+        Parameters
+        ----------
+        file
+            The netCDF file.
+
+        Returns
+        -------
+        The open dataset. Release it with release once it's no longer needed.
+
+        """
+        key = Path(file).resolve()
+        with self._lock:
+            if key not in self._datasets:
+                self._datasets[key] = Dataset(key)
+                self._counts[key] = 0
+            self._counts[key] += 1
+            return self._datasets[key]
+
+    def release(self, file: Path) -> None:
+        """Release a dataset acquired with acquire, closing it if no one else is using it.
+
+        Parameters
+        ----------
+        file
+            The netCDF file.
+
+        """
+        key = Path(file).resolve()
+        with self._lock:
+            self._counts[key] -= 1
+            if not self._counts[key]:
+                del self._counts[key]
+                self._datasets.pop(key).close()
+
+
+dataset_pool = DatasetPool()
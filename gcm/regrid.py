@@ -0,0 +1,126 @@
+import hashlib
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+
+class ConservativeRegridder:
+    """Conservatively regrid fields from one simulation's latitude/longitude grid to another's.
+
+    Parameters
+    ----------
+    source
+        The simulation whose grid the fields are on.
+    target
+        The simulation whose grid to put the fields on.
+    cache_directory
+        If given, the overlap weights are saved in this directory and loaded from it by any later regridder between
+        the same two grids.
+
+    Notes
+    -----
+    Each target cell gets the area-weighted mean of the source cells it overlaps. Both grids are rectilinear, so the
+    fraction of a target cell's area that overlaps a source cell is its latitude overlap (in sine of latitude) times
+    its longitude overlap. The 2D overlap matrix is therefore the outer product of two small 1D matrices, which are
+    all that's built and stored, and regridding is a matrix multiplication along each axis. Longitude is periodic, and
+    a duplicated seam column (like the PCM's) is ignored in the source and filled in the target.
+
+    """
+    def __init__(self, source, target, cache_directory: Path = None):
+        edges = [source.get_latitude_edges(), source.get_longitude_edges(),
+                 target.get_latitude_edges(), target.get_longitude_edges()]
+        if cache_directory is None:
+            self._latitude_weights, self._longitude_weights = self._make_weights(*edges)
+            return
+
+        key = hashlib.sha1(b''.join(np.asarray(e, dtype=float).tobytes() + b'|' for e in edges)).hexdigest()
+        file = Path(cache_directory) / f'conservative_regrid_weights.{key}.npz'
+        if file.exists():
+            with np.load(file) as weights:
+                self._latitude_weights = weights['latitude']
+                self._longitude_weights = weights['longitude']
+        else:
+            self._latitude_weights, self._longitude_weights = self._make_weights(*edges)
+            file.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(file, latitude=self._latitude_weights, longitude=self._longitude_weights)
+
+    def get_latitude_weights(self) -> np.ndarray:
+        """Get the fraction of each target latitude band that comes from each source band.
+
+        Returns
+        -------
+        The weights with shape (target lat, source lat).
+
+        """
+        return self._latitude_weights
+
+    def get_longitude_weights(self) -> np.ndarray:
+        """Get the fraction of each target longitude band that comes from each source band.
+
+        Returns
+        -------
+        The weights with shape (target lon, source lon).
+
+        """
+        return self._longitude_weights
+
+    def regrid(self, field: np.ndarray) -> np.ndarray:
+        """Regrid a field.
+
+        Parameters
+        ----------
+        field
+            The field on the source grid with shape (..., lat, lon). Any leading axes, like sol and local time, are
+            regridded independently.
+
+        Returns
+        -------
+        The field on the target grid with shape (..., lat, lon).
+
+        """
+        return self._latitude_weights @ np.asarray(field) @ self._longitude_weights.T
+
+    def iter_regrid(self, blocks: Iterable[tuple[slice, np.ndarray]]) -> Iterator[tuple[slice, np.ndarray]]:
+        """Regrid a field one block at a time.
+
+        Parameters
+        ----------
+        blocks
+            (sol slice, array) pairs, like those from LazySolArray.iter_blocks.
+
+        Yields
+        ------
+        The sol slice and the regridded block.
+
+        """
+        for sols, block in blocks:
+            yield sols, self.regrid(block)
+
+    @classmethod
+    def _make_weights(cls, source_latitude_edges: np.ndarray, source_longitude_edges: np.ndarray,
+                      target_latitude_edges: np.ndarray, target_longitude_edges: np.ndarray) -> tuple[np.ndarray, ...]:
+        source_latitude = np.sin(np.radians(np.clip(cls._get_cell_bounds(source_latitude_edges), -90, 90)))
+        target_latitude = np.sin(np.radians(np.clip(cls._get_cell_bounds(target_latitude_edges), -90, 90)))
+        latitude_overlap = cls._get_overlap(source_latitude, target_latitude)
+
+        source_longitude = cls._get_cell_bounds(source_longitude_edges)
+        target_longitude = cls._get_cell_bounds(target_longitude_edges)
+        longitude_overlap = sum(cls._get_overlap(source_longitude, target_longitude + shift) for shift in (-360, 0, 360))
+        if source_longitude_edges[-1] - source_longitude_edges[0] > 360 * (1 + 1e-6):
+            longitude_overlap[:, -1] = 0
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return latitude_overlap / np.sum(latitude_overlap, axis=1, keepdims=True), \
+                longitude_overlap / np.sum(longitude_overlap, axis=1, keepdims=True)
+
+    @staticmethod
+    def _get_cell_bounds(edges: np.ndarray) -> np.ndarray:
+        edges = np.asarray(edges, dtype=float)
+        return np.stack([np.minimum(edges[:-1], edges[1:]), np.maximum(edges[:-1], edges[1:])], axis=-1)
+
+    @staticmethod
+    def _get_overlap(source: np.ndarray, target: np.ndarray) -> np.ndarray:
+        lower = np.maximum(target[:, None, 0], source[None, :, 0])
+        upper = np.minimum(target[:, None, 1], source[None, :, 1])
+        return np.maximum(upper - lower, 0)
@@ -0,0 +1,105 @@
+import numpy as np
+
+from gcm.grid import GridAxis
+
+
+class SampleLocations:
+    """The grid indices and interpolation weights of a set of sample points.
+
+    Make these with GridSampler.locate. They can be reused to sample any number of fields on the same grid.
+
+    """
+    def __init__(self, indices: list[tuple[np.ndarray, ...]], weights: list[np.ndarray], shape: tuple[int, ...]):
+        self.indices = indices
+        self.weights = weights
+        self.shape = shape
+
+
+class GridSampler:
+    """Sample gridded simulation fields at many (sol, local time, latitude, longitude) points at once.
+
+    Parameters
+    ----------
+    simulation
+        Any simulation. The sampler is built from its sol, local time, latitude, and longitude edges, and samples
+        fields with shape (sol, local time, lat, lon[, ...]) on that grid.
+
+    Notes
+    -----
+    Sols are in the same units as the simulation's get_simulation_sol_edges. The simulations' time axis is universal
+    time, so each point's local solar time is converted to universal time with its longitude (see LocalTimeMapper)
+    before it's located. Like LocalTimeMapper, a universal time that falls on the other side of midnight wraps around
+    within the same sol. Time and longitude are periodic, so points on either side of midnight or of the longitude
+    seam interpolate across it. Points outside of the sol or latitude range get the value of the closest cell.
+
+    """
+    def __init__(self, simulation):
+        self._axes = (GridAxis(simulation.get_simulation_sol_edges()),
+                      GridAxis(simulation.get_local_time_edges(), period=24),
+                      GridAxis(simulation.get_latitude_edges()),
+                      GridAxis(simulation.get_longitude_edges(), period=360))
+
+    def locate(self, sol: np.ndarray, local_time: np.ndarray, latitude: np.ndarray, longitude: np.ndarray,
+               method: str = 'nearest') -> SampleLocations:
+        """Find where a set of points are on the grid.
+
+        Parameters
+        ----------
+        sol
+            The sol of each point.
+        local_time
+            The local solar time [hours] of each point.
+        latitude
+            The latitude [degrees] of each point.
+        longitude
+            The longitude [degrees] of each point.
+        method
+            "nearest" to use the cell each point is in, or "linear" to multilinearly interpolate between the cell
+            centers that surround it.
+
+        Returns
+        -------
+        The locations of the points. The inputs are broadcast together, and sampled values have their shape.
+
+        """
+        sol, local_time, latitude, longitude = np.broadcast_arrays(sol, local_time, latitude, longitude)
+        shape = sol.shape
+        universal_time = np.mod(local_time - np.asarray(longitude, dtype=float) / 15, 24)
+        coordinates = [np.ravel(c) for c in (sol, universal_time, latitude, longitude)]
+        if method == 'nearest':
+            indices = tuple(axis.get_nearest_indices(c) for axis, c in zip(self._axes, coordinates))
+            return SampleLocations([indices], [np.ones(indices[0].shape)], shape)
+        if method == 'linear':
+            axis_indices = [axis.get_linear_indices(c) for axis, c in zip(self._axes, coordinates)]
+            indices = []
+            weights = []
+            # Each corner of the 4D cell takes either the lower or upper index along each axis
+            for corner in np.ndindex((2,) * len(self._axes)):
+                indices.append(tuple(lower if c == 0 else upper for c, (lower, upper, _) in zip(corner, axis_indices)))
+                weights.append(np.prod([1 - w if c == 0 else w for c, (_, _, w) in zip(corner, axis_indices)],
+                                       axis=0))
+            return SampleLocations(indices, weights, shape)
+        raise ValueError('method must be "nearest" or "linear".')
+
+    @staticmethod
+    def sample(field: np.ndarray, locations: SampleLocations) -> np.ndarray:
+        """Sample a field at previously located points.
+
+        Parameters
+        ----------
+        field
+            The field with shape (sol, local time, lat, lon[, ...]). Any trailing axes, like level, are kept.
+        locations
+            The points to sample, from locate.
+
+        Returns
+        -------
+        The sampled values with shape (points shape[, ...]).
+
+        """
+        field = np.asarray(field)
+        output = None
+        for indices, weights in zip(locations.indices, locations.weights):
+            values = field[indices] * np.reshape(weights, weights.shape + (1,) * (field.ndim - 4))
+            output = values if output is None else output + values
+        return np.reshape(output, locations.shape + field.shape[4:])
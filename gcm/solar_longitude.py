@@ -0,0 +1,71 @@
+import numpy as np
+
+
+class SolarLongitudeIndex:
+    """An index of which sols of a simulation are in a solar longitude window.
+
+    The solar longitudes are sorted once, so finding the sols in any window is a pair of binary searches rather than a
+    comparison against every sol.
+
+    Parameters
+    ----------
+    solar_longitudes
+        The solar longitude [degrees] of each sol. They can increase past 360 (like a simulation that runs for several
+        Mars years) since they're wrapped into [0, 360) before being indexed.
+
+    """
+    def __init__(self, solar_longitudes: np.ndarray):
+        solar_longitudes = np.mod(np.asarray(solar_longitudes, dtype=float), 360)
+        self.n_sols = solar_longitudes.shape[0]
+        self._order = np.argsort(solar_longitudes, kind='stable')
+        self._sorted_solar_longitudes = solar_longitudes[self._order]
+
+    def get_indices(self, window: tuple[float, float]) -> np.ndarray:
+        """Get the indices of the sols within a solar longitude window.
+
+        Parameters
+        ----------
+        window
+            The (start, stop) solar longitude [degrees]. Sols with start <= Ls < stop are in the window. If stop is less
+            than start, the window wraps past 360, so (350, 10) gets the 20 degrees around the northern spring equinox.
+
+        Returns
+        -------
+        The sorted sol indices.
+
+        """
+        start, stop = window
+        if stop - start >= 360:
+            return np.arange(self.n_sols)
+        start, stop = np.mod(start, 360), np.mod(stop, 360)
+        bounds = [(start, stop)] if start <= stop else [(start, 360), (0, stop)]
+        pieces = [self._order[np.searchsorted(self._sorted_solar_longitudes, lower, side='left'):
+                              np.searchsorted(self._sorted_solar_longitudes, upper, side='left')]
+                  for lower, upper in bounds]
+        return np.sort(np.concatenate(pieces))
+
+    def get_sols(self, window: tuple[float, float]) -> slice | np.ndarray:
+        """Get the sols within a solar longitude window in a form that can index the sol axis of a field.
+
+        Parameters
+        ----------
+        window
+            The (start, stop) solar longitude [degrees]. See get_indices.
+
+        Returns
+        -------
+        A slice if the sols are consecutive, like they are for a window that doesn't cross the start of the
+        simulation. Otherwise, the sorted sol indices.
+
+        Raises
+        ------
+        ValueError
+            Raised if no sols are within the window.
+
+        """
+        indices = self.get_indices(window)
+        if not indices.size:
+            raise ValueError(f'No sols have a solar longitude within {window}.')
+        if np.all(np.diff(indices) == 1):
+            return slice(int(indices[0]), int(indices[-1]) + 1)
+        return indices
@@ -0,0 +1,163 @@
+from pathlib import Path
+from typing import Callable
+
+from netCDF4 import Dataset
+import numpy as np
+import pytest
+
+from gcm.ames import AmesSimulation
+from gcm.pcm import PlanetaryClimateModelSimulation
+
+
+class FakeSimulation:
+    """A simulation grid without any files, for testing code that only needs a simulation's cell edges.
+
+    The defaults are 3 sols of 24 hours on a 30 by 45 degree grid whose latitudes go from north to south.
+
+    """
+    def __init__(self, latitude_edges: np.ndarray = None, longitude_edges: np.ndarray = None,
+                 sol_edges: np.ndarray = None, local_time_edges: np.ndarray = None):
+        self._latitude_edges = np.linspace(90, -90, 7) if latitude_edges is None else latitude_edges
+        self._longitude_edges = np.linspace(0, 360, 9) if longitude_edges is None else longitude_edges
+        self._sol_edges = np.arange(4) if sol_edges is None else sol_edges
+        self._local_time_edges = np.arange(25) if local_time_edges is None else local_time_edges
+
+    def get_simulation_sol_edges(self) -> np.ndarray:
+        return self._sol_edges
+
+    def get_local_time_edges(self) -> np.ndarray:
+        return self._local_time_edges
+
+    def get_latitude_edges(self) -> np.ndarray:
+        return self._latitude_edges
+
+    def get_longitude_edges(self) -> np.ndarray:
+        return self._longitude_edges
+
+
+def write_pcm_files(directory: Path, sols_per_month: tuple[int, ...] = (3, 2, 3, 2), n_levels: int = 3) -> None:
+    """Write a tiny PCM simulation, with files named in the opposite order of the sols they hold."""
+    rng = np.random.default_rng(0)
+    latitude = np.linspace(90, -90, 5)
+    longitude = np.linspace(-180, 180, 9)
+    first_sol = 0
+    for month, n_sols in enumerate(sols_per_month):
+        with Dataset(directory / f'diagfi{len(sols_per_month) - month}.nc', 'w') as dataset:
+            dataset.createDimension('Time', n_sols * 24)
+            dataset.createDimension('altitude', n_levels)
+            dataset.createDimension('interlayer', n_levels + 1)
+            dataset.createDimension('latitude', latitude.size)
+            dataset.createDimension('longitude', longitude.size)
+            dataset.createVariable('latitude', 'f4', ('latitude',))[:] = latitude
+            dataset.createVariable('longitude', 'f4', ('longitude',))[:] = longitude
+            dataset.createVariable('ap', 'f8', ('interlayer',))[:] = np.linspace(30, 0, n_levels + 1)
+            dataset.createVariable('bp', 'f8', ('interlayer',))[:] = np.linspace(1, 0, n_levels + 1)
+            time = first_sol + np.arange(n_sols * 24) / 24
+            dataset.createVariable('Time', 'f8', ('Time',))[:] = time
+            dataset.createVariable('Ls', 'f4', ('Time',))[:] = time * 30
+            dataset.createVariable('phisinit', 'f4', ('latitude', 'longitude'))[:] = \
+                rng.random((latitude.size, longitude.size)) * 3720
+            for name in ['ps', 'tsurf', 'tau_dust', 'tau_h2o_ice']:
+                dataset.createVariable(name, 'f4', ('Time', 'latitude', 'longitude'))[:] = \
+                    rng.random((n_sols * 24, latitude.size, longitude.size)) + (600 if name == 'ps' else 0)
+            dataset.createVariable('temp', 'f4', ('Time', 'altitude', 'latitude', 'longitude'))[:] = \
+                150 + 50 * rng.random((n_sols * 24, n_levels, latitude.size, longitude.size))
+        first_sol += n_sols
+
+
+def write_ames_files(directory: Path, n_sols: int = 4, n_levels: int = 4) -> None:
+    """Write a tiny Ames simulation."""
+    rng = np.random.default_rng(1)
+    latitude_edges = np.linspace(-90, 90, 5)
+    longitude_edges = np.linspace(0, 360, 7)
+    with Dataset(directory / 'c48_fixed.nc', 'w') as dataset:
+        dataset.createDimension('lat', latitude_edges.size - 1)
+        dataset.createDimension('lon', longitude_edges.size - 1)
+        dataset.createDimension('bnds', 2)
+        dataset.createDimension('phalf', n_levels + 1)
+        dataset.createVariable('lat', 'f4', ('lat',))[:] = (latitude_edges[1:] + latitude_edges[:-1]) / 2
+        dataset.createVariable('lon', 'f4', ('lon',))[:] = (longitude_edges[1:] + longitude_edges[:-1]) / 2
+        dataset.createVariable('grid_yt_bnds', 'f4', ('lat', 'bnds'))[:] = \
+            np.stack([latitude_edges[:-1], latitude_edges[1:]], axis=-1)
+        dataset.createVariable('grid_xt_bnds', 'f4', ('lon', 'bnds'))[:] = \
+            np.stack([longitude_edges[:-1], longitude_edges[1:]], axis=-1)
+        dataset.createVariable('zsurf', 'f4', ('lat', 'lon'))[:] = rng.random((4, 6)) * 1000
+        dataset.createVariable('alb', 'f4', ('lat', 'lon'))[:] = rng.random((4, 6))
+        dataset.createVariable('pk', 'f8', ('phalf',))[:] = np.append(np.linspace(0.5, 30, n_levels), 0)[::-1]
+        dataset.createVariable('bk', 'f8', ('phalf',))[:] = np.linspace(0, 1, n_levels + 1)
+    with Dataset(directory / 'c48_atmos_average.nc', 'w') as dataset:
+        dataset.createDimension('time', n_sols)
+    with Dataset(directory / 'c48_atmos_diurn.nc', 'w') as dataset:
+        dataset.createDimension('time', n_sols)
+        dataset.createDimension('time_of_day_24', 24)
+        dataset.createDimension('bnds', 2)
+        dataset.createDimension('pfull', n_levels)
+        dataset.createDimension('lat', latitude_edges.size - 1)
+        dataset.createDimension('lon', longitude_edges.size - 1)
+        dataset.createDimension('scalar_axis', 1)
+        time = np.arange(n_sols) * 5 + 670.5
+        dataset.createVariable('time', 'f8', ('time',))[:] = time
+        dataset.createVariable('time_bnds', 'f8', ('time', 'bnds'))[:] = np.stack([time - 2.5, time + 2.5], axis=-1)
+        time_of_day = np.arange(24) + 0.5
+        dataset.createVariable('time_of_day_24', 'f8', ('time_of_day_24',))[:] = time_of_day
+        dataset.createVariable('time_of_day_edges_24', 'f8', ('time_of_day_24', 'bnds'))[:] = \
+            np.stack([time_of_day - 0.5, time_of_day + 0.5], axis=-1)
+        dataset.createVariable('areo', 'f8', ('time', 'time_of_day_24', 'scalar_axis'))[:] = \
+            np.broadcast_to(np.arange(n_sols)[:, None, None] * 60 + 330., (n_sols, 24, 1))
+        shape = (n_sols, 24, latitude_edges.size - 1, longitude_edges.size - 1)
+        dataset.createVariable('ps', 'f4', ('time', 'time_of_day_24', 'lat', 'lon'))[:] = 600 + 100 * rng.random(shape)
+        dataset.createVariable('ts', 'f4', ('time', 'time_of_day_24', 'lat', 'lon'))[:] = 200 + 50 * rng.random(shape)
+        level_shape = shape[:2] + (n_levels,) + shape[2:]
+        for name, offset, scale in [('temp', 150, 50), ('dustref', 0, 1e-3), ('cldref', 0, 1e-3)]:
+            dataset.createVariable(name, 'f4', ('time', 'time_of_day_24', 'pfull', 'lat', 'lon'))[:] = \
+                offset + scale * rng.random(level_shape)
+
+
+@pytest.fixture
+def pcm_directory(tmp_path) -> Path:
+    directory = tmp_path / 'pcm'
+    directory.mkdir()
+    write_pcm_files(directory)
+    return directory
+
+
+@pytest.fixture
+def pcm(pcm_directory, monkeypatch) -> PlanetaryClimateModelSimulation:
+    monkeypatch.setattr(PlanetaryClimateModelSimulation, '_make_simulation_files_location',
+                        staticmethod(lambda version, mars_year: pcm_directory))
+    with PlanetaryClimateModelSimulation(1, 30) as simulation:
+        yield simulation
+
+
+@pytest.fixture
+def read_pcm_baseline(pcm_directory) -> Callable[[str], np.ndarray]:
+    """Get a function that reads a whole PCM variable the way the original accessors did: stacking the months,
+    rolling the longitudes, and appending the seam column."""
+    def read(name: str) -> np.ndarray:
+        datasets = sorted((Dataset(file) for file in pcm_directory.glob('diagfi*.nc')),
+                          key=lambda dataset: float(dataset['Time'][0]))
+        field = np.vstack([dataset[name][..., :-1].data for dataset in datasets])
+        for dataset in datasets:
+            dataset.close()
+        field = np.reshape(field, (field.shape[0] // 24, 24) + field.shape[1:])
+        field = np.moveaxis(field, range(2, field.ndim - 2), range(4, field.ndim))
+        field = np.roll(field, field.shape[3] // 2, axis=3)
+        return np.concatenate((field, field[:, :, :, :1]), axis=3)
+
+    return read
+
+
+@pytest.fixture
+def ames_directory(tmp_path) -> Path:
+    directory = tmp_path / 'ames'
+    directory.mkdir()
+    write_ames_files(directory)
+    return directory
+
+
+@pytest.fixture
+def ames(ames_directory, monkeypatch) -> AmesSimulation:
+    monkeypatch.setattr(AmesSimulation, '_make_simulation_files_location',
+                        staticmethod(lambda version, mars_year: ames_directory))
+    with AmesSimulation(2, 30) as simulation:
+        yield simulation
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from gcm.altitude import get_altitude_centers, get_altitude_edges, mars_gas_constant, mars_gravity
+
+
+class TestGetAltitudeEdges:
+    @pytest.fixture
+    def pressure(self) -> np.ndarray:
+        # Boundaries from the surface up to a top at zero pressure, like the PCM's levels
+        return np.array([[600, 300, 100, 10, 0], [500, 250, 80, 5, 0]], dtype=float)
+
+    @pytest.fixture
+    def temperature(self) -> np.ndarray:
+        return np.array([[210, 200, 180, 150], [220, 190, 170, 140]], dtype=float)
+
+    def test_isothermal_layer_gives_expected_answer(self):
+        edges = get_altitude_edges(1000, np.array([600, 600 / np.e]), np.array([200]))
+        assert np.allclose(edges, [1000, 1000 + mars_gas_constant * 200 / mars_gravity])
+
+    def test_top_down_boundaries_match_bottom_up_boundaries(self, pressure, temperature):
+        edges = get_altitude_edges(np.array([-2000, 3000]), pressure, temperature)
+        flipped = get_altitude_edges(np.array([-2000, 3000]), pressure[:, ::-1], temperature[:, ::-1])
+        assert np.array_equal(edges, flipped[:, ::-1])
+
+    def test_zero_pressure_top_is_finite(self, pressure, temperature):
+        edges = get_altitude_edges(0, pressure, temperature)
+        assert np.all(np.isfinite(edges)) and np.all(np.diff(edges, axis=-1) > 0)
+
+
+class TestGetAltitudeCenters:
+    def test_centers_are_where_the_pressure_is_the_mean_of_the_edges(self):
+        pressure = np.array([600, 200])
+        edges = get_altitude_edges(0, pressure, np.array([200]))
+        scale_height = mars_gas_constant * 200 / mars_gravity
+        assert np.allclose(get_altitude_centers(edges, pressure), scale_height * np.log(600 / 400))
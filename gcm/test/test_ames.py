@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from gcm.ames import AmesSimulation
+
+
+def count_surface_pressure_reads(monkeypatch) -> list[int]:
+    """Record how many sols of surface pressure each read from the diurn file gets."""
+    read_sols = []
+    read = AmesSimulation._read_diurn_variable
+
+    def count(simulation, name, sols=slice(None), *args):
+        output = read(simulation, name, sols, *args)
+        if name == 'ps':
+            read_sols.append(output.shape[0])
+        return output
+
+    monkeypatch.setattr(AmesSimulation, '_read_diurn_variable', count)
+    return read_sols
+
+
+class TestOpticalDepthKernels:
+    @pytest.fixture
+    def opacity(self, ames) -> np.ndarray:
+        return np.asarray(ames.get_dust_visible_extinction_optical_depth_per_pascal(), dtype=np.float64)
+
+    @pytest.fixture
+    def pressure(self, ames) -> np.ndarray:
+        return np.asarray(ames.get_atmospheric_pressure(), dtype=np.float64)
+
+    @pytest.fixture
+    def level(self, pressure) -> float:
+        # The level is inside the third layer of every column, so that layer only partly counts
+        assert np.all(pressure[..., 2] < 400) and np.all(pressure[..., 3] > 400)
+        return 400.
+
+    def test_column_optical_depth_matches_the_explicit_integral(self, ames, opacity, pressure):
+        expected = np.sum(opacity * np.diff(pressure, axis=-1), axis=-1)
+        assert np.allclose(ames.get_dust_visible_column_optical_depth(), expected, rtol=1e-5)
+
+    def test_optical_depth_above_a_level_inside_a_layer_matches_the_explicit_integral(self, ames, opacity, pressure,
+                                                                                       level):
+        expected = np.sum(opacity * np.diff(np.minimum(pressure, level), axis=-1), axis=-1)
+        assert np.allclose(ames.get_column_optical_depth_above('dustref', level), expected, rtol=1e-5)
+
+    def test_optical_depth_below_a_level_inside_a_layer_matches_the_explicit_integral(self, ames, opacity, pressure,
+                                                                                       level):
+        expected = np.sum(opacity * np.diff(np.maximum(pressure, level), axis=-1), axis=-1)
+        assert np.allclose(ames.get_column_optical_depth_below('dustref', level), expected, rtol=1e-5)
+
+    def test_above_and_below_add_up_to_the_column(self, ames, level):
+        above = ames.get_column_optical_depth_above('dustref', level)
+        below = ames.get_column_optical_depth_below('dustref', level)
+        assert np.allclose(above + below, ames.get_dust_visible_column_optical_depth(), rtol=1e-5)
+
+    def test_cumulative_optical_depth_matches_the_explicit_integral(self, ames, opacity, pressure):
+        expected = np.cumsum(opacity * np.diff(pressure, axis=-1), axis=-1)
+        cumulative = ames.get_cumulative_optical_depth('dustref')
+        assert np.all(cumulative[..., 0] == 0) and np.allclose(cumulative[..., 1:], expected, rtol=1e-5)
+
+    @pytest.mark.parametrize('accumulate_in_float64', [True, False])
+    def test_output_has_the_dtype_of_the_field(self, ames, accumulate_in_float64):
+        column_optical_depth = ames.get_dust_visible_column_optical_depth(accumulate_in_float64=accumulate_in_float64)
+        assert column_optical_depth.dtype == np.float32
+
+    def test_one_sol_blocks_match_the_explicit_integral(self, ames, opacity, pressure):
+        expected = np.sum(opacity * np.diff(pressure, axis=-1), axis=-1)
+        assert np.allclose(ames.get_column_optical_depth('dustref', max_bytes=1), expected, rtol=1e-5)
+
+
+class TestGetFieldAtPressures:
+    def test_layer_pressures_give_the_layer_values(self, ames):
+        pressure = ames.get_atmospheric_pressure()[0, 0, 0, 0]
+        layer_pressures = (pressure[1:] + pressure[:-1]) / 2
+        temperature = ames.get_field_at_pressures('temp', layer_pressures)
+        assert np.allclose(temperature[0, 0, 0, 0], ames.get_atmospheric_temperature()[0, 0, 0, 0])
+
+    def test_each_block_only_reads_its_own_surface_pressure(self, ames, monkeypatch):
+        read_sols = count_surface_pressure_reads(monkeypatch)
+        with AmesSimulation(2, 30, memo_bytes=0) as simulation:
+            simulation.get_field_at_pressures('temp', np.array([300.]), max_bytes=1)
+        assert sum(read_sols) == 4
+
+
+class TestGetFieldAtAltitudes:
+    def test_layer_altitudes_give_the_layer_values(self, ames):
+        altitudes = ames.get_altitude_centers()[0, 0, 0, 0]
+        temperature = ames.get_field_at_altitudes('temp', altitudes)
+        assert np.allclose(temperature[0, 0, 0, 0], ames.get_atmospheric_temperature()[0, 0, 0, 0])
+
+    def test_solar_longitude_window_gives_the_same_sols(self, ames):
+        altitudes = np.array([2000., 5000.])
+        windowed = ames.get_field_at_altitudes('temp', altitudes, ls=(0, 100))
+        assert np.array_equal(windowed, ames.get_field_at_altitudes('temp', altitudes)[1:3], equal_nan=True)
+
+    def test_cached_altitudes_give_the_same_answer(self, ames, tmp_path):
+        altitudes = np.array([2000., 5000.])
+        with AmesSimulation(2, 30, cache_directory=tmp_path / 'cache') as simulation:
+            cached = simulation.get_field_at_altitudes('temp', altitudes, ls=(0, 100))
+        assert np.array_equal(cached, ames.get_field_at_altitudes('temp', altitudes, ls=(0, 100)), equal_nan=True)
+
+    def test_each_block_only_reads_its_own_surface_pressure(self, ames, monkeypatch):
+        read_sols = count_surface_pressure_reads(monkeypatch)
+        with AmesSimulation(2, 30, memo_bytes=0) as simulation:
+            simulation.get_field_at_altitudes('temp', np.array([2000.]), max_bytes=1)
+        assert sum(read_sols) == 4
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from gcm.climatology import SolarLongitudeClimatology
+
+
+class TestSolarLongitudeClimatology:
+    @pytest.fixture
+    def solar_longitude_edges(self) -> np.ndarray:
+        return np.linspace(0, 360, 5)
+
+    @pytest.fixture
+    def latitude_edges(self) -> np.ndarray:
+        return np.linspace(-90, 90, 4)
+
+    @pytest.fixture
+    def histogram_edges(self) -> np.ndarray:
+        return np.linspace(0, 1, 11)
+
+    @pytest.fixture
+    def climatology(self, solar_longitude_edges, latitude_edges, histogram_edges) -> SolarLongitudeClimatology:
+        return SolarLongitudeClimatology(solar_longitude_edges, latitude_edges, histogram_edges)
+
+    @pytest.fixture
+    def values(self) -> np.ndarray:
+        return np.random.default_rng(0).random((50, 6, 8))
+
+    @pytest.fixture
+    def solar_longitude(self) -> np.ndarray:
+        return np.linspace(-30, 700, 50)[:, None, None]
+
+    @pytest.fixture
+    def latitude(self) -> np.ndarray:
+        return np.linspace(-85, 85, 6)[:, None]
+
+    def test_blocks_give_same_statistics_as_all_data_at_once(self, climatology, values, solar_longitude, latitude):
+        for block in [slice(0, 7), slice(7, 30), slice(30, 50)]:
+            climatology.add(values[block], solar_longitude[block], latitude)
+
+        values, solar_longitude, latitude = np.broadcast_arrays(values, solar_longitude, latitude)
+        in_bin = (np.mod(solar_longitude, 360) >= 90) & (np.mod(solar_longitude, 360) < 180) & (latitude < -30)
+        assert climatology.count[1, 0] == np.sum(in_bin)
+        assert climatology.mean[1, 0] == pytest.approx(np.mean(values[in_bin]))
+        assert climatology.get_variance(ddof=1)[1, 0] == pytest.approx(np.var(values[in_bin], ddof=1))
+        assert climatology.minimum[1, 0] == np.min(values[in_bin])
+        assert climatology.maximum[1, 0] == np.max(values[in_bin])
+        assert np.array_equal(climatology.histogram[1, 0], np.histogram(values[in_bin], np.linspace(0, 1, 11))[0])
+
+    def test_merge_gives_same_statistics_as_adding_everything(self, climatology, solar_longitude_edges,
+                                                              latitude_edges, histogram_edges, values,
+                                                              solar_longitude, latitude):
+        other = SolarLongitudeClimatology(solar_longitude_edges, latitude_edges, histogram_edges)
+        climatology.add(values[:20], solar_longitude[:20], latitude)
+        other.add(values[20:], solar_longitude[20:], latitude)
+        climatology.merge(other)
+
+        expected = SolarLongitudeClimatology(solar_longitude_edges, latitude_edges, histogram_edges)
+        expected.add(values, solar_longitude, latitude)
+        assert np.array_equal(climatology.count, expected.count)
+        assert np.allclose(climatology.mean, expected.mean)
+        assert np.allclose(climatology.get_variance(), expected.get_variance())
+        assert np.array_equal(climatology.histogram, expected.histogram)
+
+    def test_empty_bins_have_nan_mean(self, climatology):
+        climatology.add(np.array([0.5]), 10, 0)
+        assert np.isnan(climatology.mean[2, 2])
+        assert climatology.mean[0, 1] == 0.5
+
+    def test_nan_values_are_ignored(self, climatology):
+        climatology.add(np.array([0.5, np.nan]), 10, 0)
+        assert climatology.count[0, 1] == 1
+
+    def test_merging_different_bins_raises_value_error(self, climatology, latitude_edges, histogram_edges):
+        other = SolarLongitudeClimatology(np.linspace(0, 360, 7), latitude_edges, histogram_edges)
+        with pytest.raises(ValueError):
+            climatology.merge(other)
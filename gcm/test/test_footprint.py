@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from gcm.footprint import FootprintAverager
+from gcm.test.conftest import FakeSimulation
+
+
+class TestFootprintAverager:
+    @pytest.fixture
+    def averager(self) -> FootprintAverager:
+        return FootprintAverager(FakeSimulation())
+
+    @pytest.fixture
+    def field(self) -> np.ndarray:
+        return np.arange(6 * 8, dtype=float).reshape((6, 8))
+
+    def test_pixel_inside_one_cell_gets_that_cells_value(self, averager, field):
+        average = averager.average(field, [[40, 40, 50, 50]], [[10, 20, 20, 10]])
+        assert average == pytest.approx([field[1, 0]])
+
+    def test_weights_of_each_pixel_sum_to_1(self, averager):
+        rng = np.random.default_rng(0)
+        centers = rng.uniform([-80, 0], [80, 360], (20, 2))
+        offsets = np.array([[-3, -3], [-3, 3], [3, 3], [3, -3]])
+        corners = centers[:, None, :] + offsets
+        weights = averager.get_weights(corners[..., 0], corners[..., 1])
+        assert np.allclose(np.add.reduceat(weights.weights, weights.pixel_starts), 1)
+
+    def test_pixel_straddling_the_seam_averages_both_sides(self, averager, field):
+        average = averager.average(field, [[10, 10, 20, 20]], [[350, 10, 10, 350]])
+        assert average == pytest.approx([(field[2, 7] + field[2, 0]) / 2])
+
+    def test_polar_pixel_overlaps_every_longitude(self, averager, field):
+        latitude_field = np.broadcast_to(np.arange(6, dtype=float)[:, None], field.shape)
+        weights = averager.get_weights([[85, 85, 85, 85]], [[0, 90, 180, 270]])
+        assert np.array_equal(np.unique(weights.longitude_indices), np.arange(8))
+        assert averager.average(latitude_field, [[85, 85, 85, 85]], [[0, 90, 180, 270]]) == pytest.approx([0])
+
+    def test_weights_are_reused_for_the_same_corners(self, averager):
+        weights = averager.get_weights([[40, 40, 50, 50]], [[10, 20, 20, 10]])
+        assert averager.get_weights([[40, 40, 50, 50]], [[10, 20, 20, 10]]) is weights
+
+    def test_least_recently_used_weights_are_evicted(self):
+        averager = FootprintAverager(FakeSimulation(), n_cached_geometries=1)
+        weights = averager.get_weights([[40, 40, 50, 50]], [[10, 20, 20, 10]])
+        averager.get_weights([[10, 10, 20, 20]], [[10, 20, 20, 10]])
+        assert averager.get_weights([[40, 40, 50, 50]], [[10, 20, 20, 10]]) is not weights
+
+    def test_local_time_is_converted_to_universal_time_at_each_cell(self, averager):
+        field = np.arange(3 * 24 * 6 * 8, dtype=float).reshape((3, 24, 6, 8))
+        # 1 pm is 11:30 am universal time in the cell centered on 22.5 degrees and 8:30 am in the next one east
+        average = averager.average(field, [[40, 40, 50, 50]], [[40, 50, 50, 40]], sol_indices=1, local_times=13)
+        assert average == pytest.approx([(field[1, 11, 1, 0] + field[1, 8, 1, 1]) / 2])
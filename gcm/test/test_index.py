@@ -0,0 +1,52 @@
+import os
+from pathlib import Path
+
+from netCDF4 import Dataset
+import numpy as np
+import pytest
+
+from gcm.index import MonthlyFileIndex
+
+
+class TestMonthlyFileIndex:
+    @pytest.fixture
+    def index(self, pcm_directory) -> MonthlyFileIndex:
+        return MonthlyFileIndex(pcm_directory)
+
+    def test_files_are_ordered_by_time_rather_than_name(self, index):
+        # The synthetic months are named in the opposite order of the sols they hold
+        assert [file.name for file in index.files] == ['diagfi4.nc', 'diagfi3.nc', 'diagfi2.nc', 'diagfi1.nc']
+        assert np.array_equal(index.sol_offsets, [0, 3, 5, 8, 10])
+
+    def test_locate_gives_expected_file_and_record(self, index):
+        file_indices, records = index.locate(np.array([0, 4, 9]), np.array([1, 2, 23]))
+        assert np.array_equal(file_indices, [0, 1, 3]) and np.array_equal(records, [1, 26, 47])
+
+    def test_solar_longitude_is_the_middle_record_of_each_sol(self, index):
+        assert np.allclose(index.get_solar_longitude(), (np.arange(10) + 0.5) * 30)
+
+    def test_saved_index_is_used_by_later_instances(self, index, pcm_directory, monkeypatch):
+        def fail(*args):
+            raise AssertionError('The index was rebuilt.')
+
+        monkeypatch.setattr(MonthlyFileIndex, '_build', fail)
+        assert MonthlyFileIndex(pcm_directory).files == index.files
+
+    def test_changed_file_rebuilds_the_index(self, index, pcm_directory):
+        file = pcm_directory / 'diagfi4.nc'
+        with Dataset(file, 'a') as dataset:
+            dataset['Ls'][:] = 100
+        os.utime(file, ns=(file.stat().st_atime_ns, file.stat().st_mtime_ns + 10**9))
+        assert np.allclose(MonthlyFileIndex(pcm_directory).get_solar_longitude()[:3], 100)
+
+    def test_read_only_directory_keeps_the_index_in_memory(self, pcm_directory, monkeypatch):
+        def fail(*args, **kwargs):
+            raise PermissionError('Read-only file system')
+
+        monkeypatch.setattr(Path, 'write_text', fail)
+        index = MonthlyFileIndex(pcm_directory)
+        assert index.n_sols == 10 and not (pcm_directory / MonthlyFileIndex.filename).exists()
+
+    def test_missing_files_raise_file_not_found_error(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            MonthlyFileIndex(tmp_path)
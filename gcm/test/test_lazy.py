@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from gcm.lazy import LazySolArray, get_sols_per_block, iterate_sol_blocks
+
+
+class TestGetSolsPerBlock:
+    def test_budget_gives_expected_answer(self):
+        assert get_sols_per_block(100, 1000) == 10
+
+    def test_sol_bigger_than_the_budget_still_gives_one_sol(self):
+        assert get_sols_per_block(1000, 10) == 1
+
+
+class TestIterateSolBlocks:
+    def test_blocks_cover_every_sol_once(self):
+        assert list(iterate_sol_blocks(7, 3)) == [slice(0, 3), slice(3, 6), slice(6, 7)]
+
+    def test_empty_blocks_raise_value_error(self):
+        with pytest.raises(ValueError):
+            list(iterate_sol_blocks(7, 0))
+
+
+class TestLazySolArray:
+    @pytest.fixture
+    def field(self) -> np.ndarray:
+        return np.random.default_rng(0).random((10, 4, 3))
+
+    @pytest.fixture
+    def reads(self) -> list:
+        return []
+
+    @pytest.fixture
+    def lazy_field(self, field, reads) -> LazySolArray:
+        def read(sols: slice) -> np.ndarray:
+            reads.append(sols)
+            return field[sols]
+
+        return LazySolArray(read, field.shape, field.dtype)
+
+    def test_nothing_is_read_until_it_is_indexed(self, lazy_field, reads):
+        assert lazy_field.shape == (10, 4, 3) and lazy_field.nbytes == 10 * 4 * 3 * 8 and not reads
+
+    def test_integer_index_only_reads_one_sol(self, lazy_field, field, reads):
+        assert np.array_equal(lazy_field[3, 1], field[3, 1]) and reads == [slice(3, 4)]
+
+    def test_negative_integer_index_gives_expected_sol(self, lazy_field, field):
+        assert np.array_equal(lazy_field[-1], field[-1])
+
+    def test_slice_gives_expected_answer(self, lazy_field, field):
+        assert np.array_equal(lazy_field[2:9:3, :, 1], field[2:9:3, :, 1])
+
+    def test_empty_slice_gives_empty_array(self, lazy_field):
+        assert lazy_field[5:5].shape == (0, 4, 3)
+
+    def test_asarray_reads_everything(self, lazy_field, field):
+        assert np.array_equal(np.asarray(lazy_field, dtype=np.float32), field.astype(np.float32))
+
+    def test_blocks_reassemble_the_array(self, lazy_field, field, reads):
+        blocks = list(lazy_field.iter_blocks(4))
+        assert [sols for sols, _ in blocks] == reads == [slice(0, 4), slice(4, 8), slice(8, 10)]
+        assert np.array_equal(np.concatenate([block for _, block in blocks]), field)
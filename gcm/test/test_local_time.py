@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from gcm.local_time import LocalTimeMapper
+
+
+class TestLocalTimeMapper:
+    @pytest.fixture
+    def time_centers(self) -> np.ndarray:
+        return np.arange(24) + 0.5
+
+    @pytest.fixture
+    def field(self) -> np.ndarray:
+        return np.random.default_rng(0).random((3, 24, 4, 24, 2))
+
+    def test_fixed_local_time_gives_expected_answer(self, time_centers, field):
+        mapper = LocalTimeMapper(np.arange(24) * 15, time_centers)
+        maps = mapper.get_fixed_local_time(field, [14.5], interpolate=False)
+        # At 90 degrees, 2:30 pm local time is 8:30 am universal time
+        assert maps.shape == (3, 1, 4, 24, 2)
+        assert np.array_equal(maps[:, 0, :, 6], field[:, 8, :, 6])
+
+    def test_interpolation_between_hours_gives_expected_answer(self, time_centers, field):
+        mapper = LocalTimeMapper([7.5], time_centers)
+        maps = mapper.get_fixed_local_time(field[..., :1, :], [0.5])
+        # 0:30 local time at 7.5 degrees is 0:00 universal time, half way between the last and first indices
+        assert np.allclose(maps[:, 0], (field[:, 23, :, :1] + field[:, 0, :, :1]) / 2)
+
+    def test_local_to_universal_undoes_universal_to_local(self, time_centers, field):
+        mapper = LocalTimeMapper(np.arange(24) * 15, time_centers)
+        assert np.array_equal(mapper.local_to_universal(mapper.universal_to_local(field)), field)
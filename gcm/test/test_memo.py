@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pytest
+
+from gcm.memo import ArrayMemo
+from gcm.pcm import PlanetaryClimateModelSimulation
+
+
+class TestArrayMemo:
+    @pytest.fixture
+    def memo(self) -> ArrayMemo:
+        return ArrayMemo(100)
+
+    def test_repeated_key_gives_the_same_read_only_array(self, memo):
+        first = memo.get('a', lambda: np.zeros(10, dtype=np.uint8))
+        second = memo.get('a', lambda: np.ones(10, dtype=np.uint8))
+        assert second is first and not first.flags.writeable
+        assert (memo.hits, memo.misses, memo.nbytes) == (1, 1, 10)
+
+    def test_least_recently_used_array_is_evicted(self, memo):
+        memo.get('a', lambda: np.zeros(40, dtype=np.uint8))
+        memo.get('b', lambda: np.zeros(40, dtype=np.uint8))
+        memo.get('a', lambda: np.zeros(40, dtype=np.uint8))
+        memo.get('c', lambda: np.zeros(40, dtype=np.uint8))
+        assert len(memo) == 2 and memo.evictions == 1 and memo.nbytes == 80
+        memo.get('a', lambda: np.ones(40, dtype=np.uint8))
+        assert memo.hits == 2
+
+    def test_array_too_big_to_memoize_is_still_read_only(self, memo):
+        array = memo.get('a', lambda: np.zeros(101, dtype=np.uint8))
+        assert not array.flags.writeable and len(memo) == 0
+
+    def test_zero_bytes_turns_the_memo_off(self):
+        memo = ArrayMemo(0)
+        memo.get('a', lambda: np.zeros(1, dtype=np.uint8))
+        assert len(memo) == 0 and memo.misses == 1
+
+    def test_memory_maps_do_not_count_toward_the_size(self, memo, tmp_path):
+        np.save(tmp_path / 'a.npy', np.zeros(1000, dtype=np.uint8))
+        memo.get('a', lambda: np.load(tmp_path / 'a.npy', mmap_mode='r'))
+        assert len(memo) == 1 and memo.nbytes == 0
+
+    def test_changed_source_file_clears_the_memo(self, tmp_path):
+        file = tmp_path / 'source.nc'
+        file.write_bytes(b'0')
+        memo = ArrayMemo(100, [file])
+        memo.get('a', lambda: np.zeros(10, dtype=np.uint8))
+        os.utime(file, ns=(file.stat().st_atime_ns, file.stat().st_mtime_ns + 10**9))
+        assert memo.get('a', lambda: np.ones(10, dtype=np.uint8))[0] == 1
+
+    def test_lazy_field_blocks_skip_the_memo(self, pcm):
+        temperature = pcm.get_atmospheric_temperature()
+        for _ in temperature.iter_blocks(4):
+            pass
+        assert temperature[:2].flags.writeable and len(pcm.memo) == 0
+
+    @pytest.mark.parametrize('memo_bytes', [0, 2**30])
+    def test_accessor_is_read_only_whether_or_not_it_is_memoized(self, pcm, memo_bytes):
+        with PlanetaryClimateModelSimulation(1, 30, memo_bytes=memo_bytes) as simulation:
+            assert not simulation.get_surface_pressure().flags.writeable
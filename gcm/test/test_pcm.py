@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from gcm.pcm import PlanetaryClimateModelSimulation
+
+
+class TestLongitudeWindow:
+    def test_window_within_the_grid_gives_expected_longitudes(self, pcm, read_pcm_baseline):
+        longitudes = pcm.get_longitude_centers()
+        inside = (longitudes >= 90) & (longitudes <= 180)
+        assert np.array_equal(pcm.get_surface_pressure(lon=(90, 180)), read_pcm_baseline('ps')[..., inside])
+
+    def test_window_across_the_seam_gives_both_sides_in_order(self, pcm, read_pcm_baseline):
+        # The synthetic grid is every 45 degrees, so this gets 315 then 0 and 45
+        expected = read_pcm_baseline('ps')[..., [7, 0, 1]]
+        assert np.array_equal(pcm.get_surface_pressure(lon=(300, 60)), expected)
+
+    def test_negative_start_wraps_across_the_seam(self, pcm):
+        assert np.array_equal(pcm.get_surface_pressure(lon=(-60, 60)), pcm.get_surface_pressure(lon=(300, 60)))
+
+    def test_window_across_the_seam_works_for_lazy_fields(self, pcm, read_pcm_baseline):
+        expected = read_pcm_baseline('temp')[2:4, :, :, [7, 0, 1]]
+        assert np.array_equal(pcm.get_atmospheric_temperature(lon=(300, 60))[2:4], expected)
+
+    def test_window_without_grid_points_raises_value_error(self, pcm):
+        with pytest.raises(ValueError):
+            pcm.get_surface_pressure(lon=(10, 20))
+
+    def test_window_across_the_seam_works_with_a_cache(self, pcm, tmp_path, read_pcm_baseline):
+        with PlanetaryClimateModelSimulation(1, 30, cache_directory=tmp_path / 'cache') as simulation:
+            surface_pressure = simulation.get_surface_pressure(sols=np.array([0, 3, 4]), lon=(300, 60))
+        assert np.array_equal(surface_pressure, read_pcm_baseline('ps')[[0, 3, 4]][..., [7, 0, 1]])
+
+
+class TestReadFileGridVariable:
+    def test_surface_pressure_matches_the_original_accessor(self, pcm, read_pcm_baseline):
+        assert np.array_equal(pcm.get_surface_pressure(), read_pcm_baseline('ps'))
+
+    def test_atmospheric_temperature_has_levels_last(self, pcm, read_pcm_baseline):
+        assert np.array_equal(pcm.get_atmospheric_temperature()[:], read_pcm_baseline('temp'))
+
+    def test_stepped_local_times_give_expected_hours(self, pcm, read_pcm_baseline):
+        surface_temperature = pcm.get_surface_temperature(local_times=slice(1, 24, 6))
+        assert np.array_equal(surface_temperature, read_pcm_baseline('tsurf')[:, 1::6])
+
+    def test_sols_in_different_files_give_expected_sols(self, pcm, read_pcm_baseline):
+        sols = np.array([1, 2, 6, 9])
+        assert np.array_equal(pcm.get_surface_pressure(sols=sols, local_times=5),
+                              read_pcm_baseline('ps')[sols, 5:6])
+
+    def test_latitude_window_gives_expected_latitudes(self, pcm, read_pcm_baseline):
+        inside = np.abs(pcm.get_latitude_centers()) <= 45
+        assert np.array_equal(pcm.get_surface_pressure(lat=(-45, 45)), read_pcm_baseline('ps')[:, :, inside])
+
+    def test_dtype_converts_the_output(self, pcm, read_pcm_baseline):
+        with PlanetaryClimateModelSimulation(1, 30, dtype=np.float64) as simulation:
+            surface_pressure = simulation.get_surface_pressure(sols=slice(2, 5))
+        assert surface_pressure.dtype == np.float64
+        assert np.array_equal(surface_pressure, read_pcm_baseline('ps')[2:5])
+
+
+class TestReadMonthsInProcesses:
+    def test_surface_pressure_matches_the_original_accessor(self, pcm, read_pcm_baseline):
+        with PlanetaryClimateModelSimulation(1, 30, max_workers=2) as simulation:
+            assert np.array_equal(simulation.get_surface_pressure(), read_pcm_baseline('ps'))
+
+    def test_windowed_levels_match_the_original_accessor(self, pcm, read_pcm_baseline):
+        with PlanetaryClimateModelSimulation(1, 30, dtype=np.float64, max_workers=4) as simulation:
+            temperature = simulation.get_atmospheric_temperature(local_times=slice(2, 20, 3), lat=(-45, 45),
+                                                                 lon=(300, 60))
+            inside = np.abs(simulation.get_latitude_centers()) <= 45
+            assert np.array_equal(temperature[1:9],
+                                  read_pcm_baseline('temp')[1:9, 2:20:3][:, :, inside][:, :, :, [7, 0, 1]])
+            assert temperature.dtype == np.float64
+
+    def test_workers_are_reused_until_the_simulation_is_closed(self, pcm, read_pcm_baseline):
+        simulation = PlanetaryClimateModelSimulation(1, 30, memo_bytes=0, max_workers=2)
+        simulation.get_surface_pressure(sols=slice(2, 4))
+        executor = simulation._executor
+        surface_pressure = simulation.get_surface_pressure(sols=slice(4, 9))
+        assert simulation._executor is executor
+        simulation.close()
+        assert simulation._executor is None
+        assert np.array_equal(surface_pressure, read_pcm_baseline('ps')[4:9])
+
+    def test_output_is_an_array_rather_than_a_memory_map(self, pcm):
+        with PlanetaryClimateModelSimulation(1, 30, memo_bytes=0, max_workers=2) as simulation:
+            surface_pressure = simulation.get_surface_pressure()
+        assert type(surface_pressure) is np.ndarray
+
+
+class TestGetLongitudeRuns:
+    def test_rolled_indices_give_two_runs_and_the_seam_duplicate(self):
+        runs, duplicates = PlanetaryClimateModelSimulation._get_longitude_runs(np.array([4, 5, 6, 7, 0, 1, 2, 3, 4]))
+        assert runs == [(slice(0, 4), slice(4, 8)), (slice(4, 8), slice(0, 4))]
+        assert duplicates == [(8, 0)]
+
+
+class TestLazyAtmosphericFields:
+    def test_pressure_is_the_hybrid_level_formula(self, pcm, read_pcm_baseline):
+        expected = np.multiply.outer(read_pcm_baseline('ps'), pcm.get_bk()) + pcm.get_ak()
+        assert np.allclose(pcm.get_atmospheric_pressure()[:], expected)
+
+    def test_blocks_match_indexing_the_whole_array(self, pcm):
+        temperature = pcm.get_atmospheric_temperature(local_times=3)
+        blocks = np.concatenate([block for _, block in temperature.iter_blocks(4)])
+        assert temperature.shape == blocks.shape and np.array_equal(blocks, temperature[:])
@@ -0,0 +1,47 @@
+from netCDF4 import Dataset
+import pytest
+
+from gcm.pcm import PlanetaryClimateModelSimulation
+from gcm.pool import DatasetPool, dataset_pool
+
+
+class TestDatasetPool:
+    @pytest.fixture
+    def pool(self) -> DatasetPool:
+        return DatasetPool()
+
+    @pytest.fixture
+    def file(self, tmp_path):
+        file = tmp_path / 'file.nc'
+        with Dataset(file, 'w') as dataset:
+            dataset.createDimension('x', 1)
+        return file
+
+    def test_acquiring_a_file_twice_gives_the_same_dataset(self, pool, file):
+        assert pool.acquire(file) is pool.acquire(file) and len(pool) == 1
+
+    def test_paths_to_the_same_file_share_a_dataset(self, pool, file, monkeypatch):
+        monkeypatch.chdir(file.parent)
+        assert pool.acquire(file) is pool.acquire(file.name)
+
+    def test_dataset_stays_open_until_the_last_release(self, pool, file):
+        dataset = pool.acquire(file)
+        pool.acquire(file)
+        pool.release(file)
+        assert dataset.isopen() and len(pool) == 1
+        pool.release(file)
+        assert not dataset.isopen() and len(pool) == 0
+
+    def test_released_file_is_reopened_when_acquired_again(self, pool, file):
+        dataset = pool.acquire(file)
+        pool.release(file)
+        assert pool.acquire(file) is not dataset
+
+    def test_simulations_share_datasets_and_release_them_when_closed(self, pcm):
+        with PlanetaryClimateModelSimulation(1, 30) as simulation:
+            simulation.get_surface_pressure()
+            pcm.get_surface_pressure()
+            assert len(dataset_pool) == 4
+        assert len(dataset_pool) == 4
+        pcm.close()
+        assert len(dataset_pool) == 0
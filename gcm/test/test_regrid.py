@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from gcm.regrid import ConservativeRegridder
+from gcm.test.conftest import FakeSimulation
+
+
+class TestConservativeRegridder:
+    @pytest.fixture
+    def source(self) -> FakeSimulation:
+        return FakeSimulation(np.linspace(-90, 90, 7), np.linspace(0, 360, 9))
+
+    @pytest.fixture
+    def target(self) -> FakeSimulation:
+        # Descending latitudes that overshoot the poles, and a duplicated seam column, like the PCM grid
+        longitude_centers = np.linspace(0, 360, 13)
+        return FakeSimulation(np.linspace(100, -100, 9), np.append(longitude_centers - 15, 375))
+
+    @pytest.fixture
+    def field(self) -> np.ndarray:
+        return np.random.default_rng(0).random((2, 3, 6, 8))
+
+    def test_constant_field_stays_constant(self, source, target):
+        regridder = ConservativeRegridder(source, target)
+        assert np.allclose(regridder.regrid(np.full((6, 8), 4.0)), 4)
+
+    def test_global_area_weighted_mean_is_conserved(self, source, field):
+        target = FakeSimulation(np.linspace(-90, 90, 4), np.linspace(-30, 330, 4))
+        regridded = ConservativeRegridder(source, target).regrid(field)
+
+        def get_global_mean(values: np.ndarray, latitude_edges: np.ndarray) -> np.ndarray:
+            area = np.diff(np.sin(np.radians(latitude_edges)))
+            return np.sum(np.mean(values, axis=-1) * area, axis=-1) / np.sum(area)
+
+        assert np.allclose(get_global_mean(regridded, np.linspace(-90, 90, 4)),
+                           get_global_mean(field, np.linspace(-90, 90, 7)))
+
+    def test_seam_column_is_duplicated(self, source, target, field):
+        regridded = ConservativeRegridder(source, target).regrid(field)
+        assert regridded.shape == (2, 3, 8, 13)
+        assert np.allclose(regridded[..., 0], regridded[..., -1])
+
+    def test_weights_are_loaded_from_cache(self, source, target, tmp_path):
+        first = ConservativeRegridder(source, target, cache_directory=tmp_path)
+        second = ConservativeRegridder(source, target, cache_directory=tmp_path)
+        assert len(list(tmp_path.iterdir())) == 1
+        assert np.array_equal(first.get_longitude_weights(), second.get_longitude_weights())
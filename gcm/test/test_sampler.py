@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from gcm.sampler import GridSampler
+from gcm.test.conftest import FakeSimulation
+
+
+class TestGridSampler:
+    @pytest.fixture
+    def sampler(self) -> GridSampler:
+        return GridSampler(FakeSimulation())
+
+    @pytest.fixture
+    def field(self) -> np.ndarray:
+        return np.arange(3 * 24 * 6 * 8, dtype=float).reshape((3, 24, 6, 8))
+
+    def test_nearest_sample_gives_value_of_containing_cell(self, sampler, field):
+        locations = sampler.locate(np.array([1.5, 2.9]), np.array([5.2, 23.9]), np.array([80, -1]),
+                                   np.array([0, 359]))
+        assert np.array_equal(sampler.sample(field, locations), [field[1, 5, 0, 0], field[2, 23, 3, 7]])
+
+    def test_local_time_is_converted_to_universal_time(self, sampler, field):
+        # 1 pm at 112.5 degrees east is 5:30 am universal time
+        locations = sampler.locate(1.5, 13, 15, 112.5)
+        assert sampler.sample(field, locations) == field[1, 5, 2, 2]
+
+    def test_nearest_sample_wraps_longitude(self, sampler, field):
+        locations = sampler.locate(0.5, 0.5, 0, np.array([-10, 350, 710]))
+        assert np.all(sampler.sample(field, locations) == field[0, 1, 3, 7])
+
+    def test_linear_sample_at_cell_centers_gives_cell_values(self, sampler, field):
+        locations = sampler.locate(1.5, 7, 15, 22.5, method='linear')
+        assert sampler.sample(field, locations) == pytest.approx(field[1, 5, 2, 0])
+
+    def test_linear_sample_interpolates_across_longitude_seam(self, sampler, field):
+        locations = sampler.locate(1.5, 5.5, 15, 0, method='linear')
+        expected = (field[1, 5, 2, 0] + field[1, 5, 2, 7]) / 2
+        assert sampler.sample(field, locations) == pytest.approx(expected)
+
+    def test_linear_sample_interpolates_across_midnight(self, sampler, field):
+        locations = sampler.locate(1.5, 1.5, 15, 22.5, method='linear')
+        expected = (field[1, 0, 2, 0] + field[1, 23, 2, 0]) / 2
+        assert sampler.sample(field, locations) == pytest.approx(expected)
+
+    def test_sample_keeps_trailing_axes(self, sampler, field):
+        field = np.stack([field, field * 2], axis=-1)
+        locations = sampler.locate(np.ones((2, 3)), 5, 15, 22.5, method='linear')
+        assert sampler.sample(field, locations).shape == (2, 3, 2)
+
+    def test_unknown_method_raises_value_error(self, sampler):
+        with pytest.raises(ValueError):
+            sampler.locate(1, 1, 1, 1, method='cubic')
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from gcm.solar_longitude import SolarLongitudeIndex
+
+
+class TestSolarLongitudeIndex:
+    @pytest.fixture
+    def index(self) -> SolarLongitudeIndex:
+        # A year that starts just before the northern spring equinox, like many simulations do
+        return SolarLongitudeIndex(np.arange(36) * 10 + 335)
+
+    def test_window_gives_expected_sols(self, index):
+        assert index.get_sols((240, 270)) == slice(27, 30)
+
+    def test_window_that_wraps_past_360_gives_expected_sols(self, index):
+        assert np.array_equal(index.get_indices((350, 10)), [2, 3])
+
+    def test_window_that_wraps_past_the_start_of_the_year_gives_both_ends(self, index):
+        assert np.array_equal(index.get_sols((320, 350)), [0, 1, 35])
+
+    def test_window_of_a_whole_year_gives_every_sol(self, index):
+        assert np.array_equal(index.get_indices((30, 390)), np.arange(36))
+
+    def test_empty_window_raises_value_error(self, index):
+        with pytest.raises(ValueError):
+            index.get_sols((11, 12))
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from gcm.lazy import LazySolArray
+from gcm.vertical import interpolate_columns, interpolate_to_levels
+
+
+class TestInterpolateColumns:
+    @pytest.fixture
+    def pressure(self) -> np.ndarray:
+        # Decreasing along the level axis, like the PCM's levels
+        return np.sort(np.random.default_rng(0).random((4, 5, 10)) * 600 + 1, axis=-1)[..., ::-1]
+
+    @pytest.fixture
+    def field(self) -> np.ndarray:
+        return np.random.default_rng(1).random((4, 5, 10))
+
+    @pytest.fixture
+    def levels(self) -> np.ndarray:
+        return np.array([0.1, 3, 30, 300, 590, 1000])
+
+    def test_log_pressure_interpolation_matches_numpy_interp(self, field, pressure, levels):
+        interpolated = interpolate_columns(field, pressure, levels, log=True)
+        for column in np.ndindex(field.shape[:-1]):
+            expected = np.interp(np.log(levels), np.log(pressure[column][::-1]), field[column][::-1], left=np.nan,
+                                 right=np.nan)
+            assert np.allclose(interpolated[column], expected, equal_nan=True)
+
+    def test_levels_on_the_grid_give_the_field(self, field, pressure):
+        interpolated = interpolate_columns(field, pressure, pressure[2, 3])
+        assert np.allclose(interpolated[2, 3], field[2, 3])
+
+    def test_blocks_of_sols_match_all_sols_at_once(self, field, pressure, levels):
+        lazy_field = LazySolArray(lambda sols: field[sols], field.shape, field.dtype)
+        interpolated = interpolate_to_levels(lazy_field, pressure, levels, log=True, max_bytes=1)
+        assert np.array_equal(interpolated, interpolate_columns(field, pressure, levels, log=True), equal_nan=True)
@@ -0,0 +1,104 @@
+import numpy as np
+
+from gcm.lazy import LazySolArray, default_max_bytes, get_sols_per_block, iterate_sol_blocks
+
+
+def interpolate_columns(field: np.ndarray, coordinate: np.ndarray, levels: np.ndarray, log: bool = False,
+                        fill_value: float = np.nan) -> np.ndarray:
+    """Linearly interpolate every column of a field onto the same vertical levels.
+
+    Parameters
+    ----------
+    field
+        The field with shape (..., level).
+    coordinate
+        The vertical coordinate of each point of the field, like pressure or altitude, with the same shape as field. It
+        must be monotonic along the level axis, and go the same direction in every column.
+    levels
+        The 1D vertical coordinates to interpolate onto.
+    log
+        If True, interpolate linearly in the log of the coordinate, like is usually done for pressure.
+    fill_value
+        The value of levels that are outside of a column, like pressures below the surface.
+
+    Returns
+    -------
+    The interpolated field with shape (..., levels).
+
+    Notes
+    -----
+    Every column is searched at once with a single call to np.searchsorted. Each column's coordinates are shifted by
+    a different offset so that, laid end to end, they form one sorted array, and the levels are shifted by the same
+    offsets before they're searched for.
+
+    """
+    field = np.asarray(field)
+    coordinate = np.asarray(coordinate, dtype=float)
+    levels = np.asarray(levels, dtype=float)
+    if log:
+        coordinate = np.log(coordinate)
+        levels = np.log(levels)
+
+    n_levels = coordinate.shape[-1]
+    columns = np.reshape(coordinate, (-1, n_levels))
+    values = np.reshape(field, (-1, n_levels))
+    output = np.full((columns.shape[0], levels.size), fill_value, dtype=np.result_type(field.dtype, np.float32))
+    if not columns.size:
+        return np.reshape(output, field.shape[:-1] + levels.shape)
+    if columns[0, -1] < columns[0, 0]:
+        columns = columns[:, ::-1]
+        values = values[:, ::-1]
+
+    # Put each column in its own band that's wider than any column so that no two bands overlap
+    lowest = np.min(columns)
+    span = np.max(columns) - lowest + 1
+    offsets = np.arange(columns.shape[0])[:, None] * span
+    queries = np.clip(levels - lowest, -0.5, span - 0.5) + offsets
+    indices = np.searchsorted(np.ravel(columns - lowest + offsets), np.ravel(queries), side='right')
+    lower = np.clip(np.reshape(indices, queries.shape) - np.arange(columns.shape[0])[:, None] * n_levels - 1,
+                    0, n_levels - 2)
+
+    lower_coordinate = np.take_along_axis(columns, lower, axis=1)
+    upper_coordinate = np.take_along_axis(columns, lower + 1, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weights = (levels - lower_coordinate) / (upper_coordinate - lower_coordinate)
+    interpolated = np.take_along_axis(values, lower, axis=1) * (1 - weights) + \
+        np.take_along_axis(values, lower + 1, axis=1) * weights
+    inside = (levels >= columns[:, :1]) & (levels <= columns[:, -1:])
+    output[inside] = interpolated[inside]
+    return np.reshape(output, field.shape[:-1] + levels.shape)
+
+
+def interpolate_to_levels(field: np.ndarray | LazySolArray, coordinate: np.ndarray | LazySolArray,
+                          levels: np.ndarray, log: bool = False, fill_value: float = np.nan,
+                          max_bytes: int = default_max_bytes) -> np.ndarray:
+    """Interpolate a whole field onto vertical levels one block of sols at a time.
+
+    Parameters
+    ----------
+    field
+        The field with shape (sol, ..., level). It can be a LazySolArray or a memory map, in which case only one block
+        of it is ever in memory.
+    coordinate
+        The vertical coordinate of each point of the field, with the same shape as field. It can also be lazy.
+    levels
+        The 1D vertical coordinates to interpolate onto.
+    log
+        If True, interpolate linearly in the log of the coordinate.
+    fill_value
+        The value of levels that are outside of a column.
+    max_bytes
+        The approximate amount of memory to use at once, not counting the output.
+
+    Returns
+    -------
+    The interpolated field with shape (sol, ..., levels).
+
+    """
+    levels = np.asarray(levels, dtype=float)
+    output = np.empty(field.shape[:-1] + levels.shape, dtype=np.result_type(field.dtype, np.float32))
+    # The block, its coordinate, and the shifted copies of the coordinate are all in memory at once
+    bytes_per_sol = 6 * int(np.prod(field.shape[1:])) * np.dtype(np.float64).itemsize
+    for sols in iterate_sol_blocks(field.shape[0], get_sols_per_block(bytes_per_sol, max_bytes)):
+        output[sols] = interpolate_columns(field[sols], coordinate[sols], levels, log, fill_value)
+    return output
@@ -2,9 +2,16 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from gcm.ames import AmesSimulation
+from gcm.parallel import map_simulations, print_progress
 from gcm.pcm import PlanetaryClimateModelSimulation
 
 
+def get_sol_367_optical_depths(simulation: PlanetaryClimateModelSimulation) -> tuple[np.ndarray, ...]:
+    dust = simulation.get_dust_ultraviolet_column_optical_depth(sols=367)[0]
+    ice = simulation.get_ice_ultraviolet_column_optical_depth(sols=367)[0]
+    return dust, ice, simulation.get_longitude_edges(), simulation.get_latitude_edges()
+
+
 if __name__ == '__main__':
     ames_mars_year = 30
     ames = AmesSimulation(2, ames_mars_year)
@@ -49,13 +56,12 @@ if __name__ == '__main__':
     plt.savefig(f'/media/kyle/iuvs/images/gcm/ames_ice_diurnal_evolution_simulation2-my{ames_mars_year}.png', dpi=300)
     plt.close(fig)
 
-    for pcm_mars_year in [33, 34, 35]:
-        pcm = PlanetaryClimateModelSimulation(2, pcm_mars_year)
-
-        pcm_dust = pcm.get_dust_ultraviolet_column_optical_depth()
-        pcm_ice = pcm.get_ice_ultraviolet_column_optical_depth()
+    pcm_mars_years = [33, 34, 35]
+    pcm_optical_depths = map_simulations(get_sol_367_optical_depths, [('pcm', 2, year) for year in pcm_mars_years],
+                                         progress=print_progress)
 
-        pcm_x, pcm_y = np.meshgrid(pcm.get_longitude_edges(), pcm.get_latitude_edges())
+    for pcm_mars_year, (pcm_dust, pcm_ice, pcm_lon_edges, pcm_lat_edges) in zip(pcm_mars_years, pcm_optical_depths):
+        pcm_x, pcm_y = np.meshgrid(pcm_lon_edges, pcm_lat_edges)
 
         lat_min = -90
         lat_max = 90
@@ -66,7 +72,7 @@ if __name__ == '__main__':
         fig.suptitle(f'PCM UV dust optical depth (MY{pcm_mars_year}, sol 366)')
 
         for lt in range(24):
-            pcm = ax[lt // 6, lt % 6].pcolormesh(pcm_x, pcm_y, pcm_dust[367, (lt+8) % 24], cmap='cividis', vmin=dust_vmin, vmax=dust_vmax)
+            pcm = ax[lt // 6, lt % 6].pcolormesh(pcm_x, pcm_y, pcm_dust[(lt+8) % 24], cmap='cividis', vmin=dust_vmin, vmax=dust_vmax)
             ax[lt // 6, lt % 6].set_xlim(lon_min, lon_max)
             ax[lt // 6, lt % 6].set_ylim(lat_min, lat_max)
             ax[lt // 6, lt % 6].set_xticks([])
@@ -79,7 +85,7 @@ if __name__ == '__main__':
         fig.suptitle(f'PCM UV ice optical depth (MY{pcm_mars_year}, sol 366)')
 
         for lt in range(24):
-            pcm = ax[lt // 6, lt % 6].pcolormesh(pcm_x, pcm_y, pcm_ice[367, (lt+8) % 24], cmap='viridis', vmin=ice_vmin, vmax=ice_vmax)
+            pcm = ax[lt // 6, lt % 6].pcolormesh(pcm_x, pcm_y, pcm_ice[(lt+8) % 24], cmap='viridis', vmin=ice_vmin, vmax=ice_vmax)
             ax[lt // 6, lt % 6].set_xlim(lon_min, lon_max)
             ax[lt // 6, lt % 6].set_ylim(lat_min, lat_max)
             ax[lt // 6, lt % 6].set_xticks([])
@@ -1,4 +1,7 @@
 import abc
+from typing import Callable
+
+import numpy as np
 
 
 class AbstractRadiativeProperties(metaclass=abc.ABCMeta):
@@ -7,6 +10,43 @@ class AbstractRadiativeProperties(metaclass=abc.ABCMeta):
     This is not designed to be directly instantiated.
 
     """
+    # The dtype of the properties of every object that isn't given its own. None keeps the dtype in the files.
+    default_dtype = None
+
+    @classmethod
+    def set_default_dtype(cls, dtype: np.dtype | None) -> None:
+        """Set the dtype of the properties returned by objects that weren't given their own dtype.
+
+        Calling this on AbstractRadiativeProperties changes every kind of radiative properties; calling it on a
+        subclass only changes that kind.
+
+        Parameters
+        ----------
+        dtype
+            The dtype, like np.float32. None returns properties in the dtype they have in the files.
+
+        """
+        cls.default_dtype = None if dtype is None else np.dtype(dtype)
+
+    @property
+    def dtype(self) -> np.dtype | None:
+        """Get the dtype this object's properties are returned as, or None if they keep the dtype in the files."""
+        return self._dtype if self._dtype is not None else type(self).default_dtype
+
+    def _convert(self, array: np.ndarray) -> np.ndarray:
+        return array if self.dtype is None else array.astype(self.dtype, copy=False)
+
+    def _get_converted_table(self, name: str, read: Callable[[], np.ndarray]) -> np.ndarray:
+        """Get a table in this object's dtype, converting it only the first time it's requested in that dtype.
+
+        The converted table is kept, so the getters can return views of it without copying anything again.
+
+        """
+        tables = self.__dict__.setdefault('_converted_tables', {})
+        if name not in tables or tables[name][0] != self.dtype:
+            tables[name] = (self.dtype, self._convert(read()))
+        return tables[name][1]
+
     @abc.abstractmethod
     def get_particle_sizes(self):
         pass
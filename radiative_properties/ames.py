@@ -48,6 +48,10 @@ class AmesRadiativeProperties(AbstractRadiativeProperties):
         The aerosol to get the radiative properties of. Can be "dust" or "ice".
     version
         The version of the aerosol's radiative properties.
+    dtype
+        The dtype to return the cross sections and asymmetry parameters as, like np.float32. The default uses the
+        class's default_dtype, which keeps the dtype in the file unless set_default_dtype was called. The file is
+        converted once, the first time it's used in a dtype, and the getters return strided views of it.
 
     Raises
     ------
@@ -55,16 +59,21 @@ class AmesRadiativeProperties(AbstractRadiativeProperties):
         Raised if the input aerosol and version don't point to a valid file.
 
     """
-    def __init__(self, aerosol: str, version: int):
+    def __init__(self, aerosol: str, version: int, dtype: np.dtype = None):
+        self._dtype = None if dtype is None else np.dtype(dtype)
         self._location = Path('/media/kyle/iuvs/radiative_properties/ames')
+        self.filepath = self._find_file(aerosol, version)
         self.radprop = self.open_file(aerosol, version)
 
-    def open_file(self, aerosol: str, version: int):
+    def _find_file(self, aerosol: str, version: int) -> Path:
         file_pattern = f'{aerosol}{version:02}*'
         filepath = list(self._location.glob(file_pattern))
         if not filepath:
             raise FileNotFoundError(f'Cannot find a file with at location {self._location}')
-        return np.load(str(filepath[0]))
+        return filepath[0]
+
+    def open_file(self, aerosol: str, version: int):
+        return np.load(str(self._find_file(aerosol, version)))
 
     def get_particle_size_centers(self) -> np.ndarray:
         bins = self.radprop.shape[0] // 3
@@ -123,14 +132,15 @@ class AmesRadiativeProperties(AbstractRadiativeProperties):
     def get_wavelengths(self) -> np.ndarray:
         return self.get_wavelength_centers()
 
+    def _get_properties(self) -> np.ndarray:
+        # Each particle size has 3 rows: extinction, scattering, and asymmetry parameter
+        return self._get_converted_table('radprop', lambda: self.radprop[:self.radprop.shape[0] // 3 * 3])
+
     def get_scattering_cross_sections(self) -> np.ndarray:
-        indices = np.arange(self.radprop.shape[0] // 3) * 3 + 1
-        return self.radprop[indices]
+        return self._get_properties()[1::3]
 
     def get_extinction_cross_sections(self) -> np.ndarray:
-        indices = np.arange(self.radprop.shape[0] // 3) * 3
-        return self.radprop[indices]
+        return self._get_properties()[0::3]
 
     def get_asymmetry_parameters(self) -> np.ndarray:
-        indices = np.arange(self.radprop.shape[0] // 3) * 3 + 2
-        return self.radprop[indices]
+        return self._get_properties()[2::3]
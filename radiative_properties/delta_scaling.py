@@ -0,0 +1,187 @@
+import numpy as np
+
+from radiative_properties.phase_function import evaluate_legendre_series
+
+
+def get_delta_m_moments(coefficients: np.ndarray, n_streams: int) -> tuple[np.ndarray, np.ndarray]:
+    """Truncate and delta-M scale Legendre coefficients for a discrete ordinate solver (Wiscombe 1977).
+
+    Parameters
+    ----------
+    coefficients
+        The Legendre coefficients with shape (..., moment), using the convention of evaluate_legendre_series (the
+        first coefficient is 1 and the second is 3 times the asymmetry parameter). The leading axes can be anything,
+        like (particle size, wavelength) or the (column, layer, wavelength) of a whole stack of GCM columns.
+    n_streams
+        The number of streams of the solver, which is the number of moments it uses.
+
+    Returns
+    -------
+    The scaled coefficients with shape (..., n_streams), and the fraction of the scattering that's moved into the
+    forward delta function with shape (...).
+
+    Notes
+    -----
+    With chi_l = c_l / (2l + 1), the truncation fraction is f = chi_n_streams and the scaled moments are
+    chi'_l = (chi_l - f) / (1 - f). If there aren't more moments than streams, nothing is truncated and f is 0.
+
+    """
+    coefficients = np.asarray(coefficients)
+    dtype = np.result_type(coefficients.dtype, np.float32)
+    degrees = np.arange(n_streams)
+    if coefficients.shape[-1] <= n_streams:
+        fraction = np.zeros(coefficients.shape[:-1], dtype=dtype)
+        return _pad_moments(coefficients, n_streams).astype(dtype, copy=False), fraction
+    fraction = (coefficients[..., n_streams] / (2 * n_streams + 1)).astype(dtype, copy=False)
+    scaled = (coefficients[..., :n_streams] - (2 * degrees + 1) * fraction[..., None]) / (1 - fraction[..., None])
+    return scaled.astype(dtype, copy=False), fraction
+
+
+def get_delta_fit_moments(coefficients: np.ndarray, n_streams: int, forward_peak_angle: float = 5,
+                          tables_per_block: int = 256) -> tuple[np.ndarray, np.ndarray]:
+    """Truncate Legendre coefficients with the delta-fit method (Hu et al. 2000).
+
+    The truncated phase function is the n_streams moment series that best fits the full one, in a least squares sense
+    weighted by 1 / P**2 (so that relative errors count the same everywhere), outside of the forward peak. Whatever
+    scattering the fit doesn't account for is moved into the forward delta function.
+
+    Parameters
+    ----------
+    coefficients
+        The Legendre coefficients with shape (..., moment). See get_delta_m_moments.
+    n_streams
+        The number of streams of the solver, which is the number of moments it uses.
+    forward_peak_angle
+        The scattering angle [degrees] of the edge of the forward peak. Angles closer to the forward direction are
+        left out of the fit.
+    tables_per_block
+        The number of phase functions that are fit at once. Each one needs about 8 * n_streams * (2 * moment) bytes
+        while it's fit.
+
+    Returns
+    -------
+    The scaled coefficients with shape (..., n_streams), and the fraction of the scattering that's moved into the
+    forward delta function with shape (...).
+
+    """
+    coefficients = np.asarray(coefficients)
+    dtype = np.result_type(coefficients.dtype, np.float32)
+    if coefficients.shape[-1] <= n_streams:
+        return get_delta_m_moments(coefficients, n_streams)
+
+    # Gaussian quadrature points resolve every moment of the full phase function
+    mu, _ = np.polynomial.legendre.leggauss(2 * coefficients.shape[-1])
+    mu = mu[mu < np.cos(np.radians(forward_peak_angle))]
+    polynomials = np.polynomial.legendre.legvander(mu, n_streams - 1)
+
+    flat_coefficients = np.reshape(coefficients, (-1, coefficients.shape[-1]))
+    fit = np.empty((flat_coefficients.shape[0], n_streams))
+    for start in range(0, flat_coefficients.shape[0], tables_per_block):
+        block = flat_coefficients[start:start + tables_per_block].astype(float)
+        phase_functions = evaluate_legendre_series(block[:, None, :], mu)
+        weights = 1 / np.maximum(np.abs(phase_functions), np.finfo(float).tiny) ** 2
+        # Solve each block's weighted normal equations together
+        weighted_polynomials = polynomials * weights[..., None]
+        normal_matrices = np.einsum('bai,aj->bij', weighted_polynomials, polynomials)
+        right_hand_sides = np.einsum('bai,ba->bi', weighted_polynomials, phase_functions)
+        fit[start:start + tables_per_block] = np.linalg.solve(normal_matrices, right_hand_sides[..., None])[..., 0]
+
+    fit = np.reshape(fit, coefficients.shape[:-1] + (n_streams,))
+    # The fit's first coefficient is the fraction of the scattering it accounts for
+    fraction = 1 - fit[..., 0]
+    scaled = fit / fit[..., :1]
+    return scaled.astype(dtype, copy=False), fraction.astype(dtype, copy=False)
+
+
+def scale_optical_properties(optical_depths: np.ndarray, single_scattering_albedos: np.ndarray,
+                             truncation_fractions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Scale optical depths and single scattering albedos for the scattering that was moved into the forward peak.
+
+    Parameters
+    ----------
+    optical_depths
+        The optical depth of each layer.
+    single_scattering_albedos
+        The single scattering albedo of each layer. It must broadcast with optical_depths.
+    truncation_fractions
+        The truncation fraction of each layer's phase function, like the output of get_delta_m_moments. It must
+        broadcast with optical_depths.
+
+    Returns
+    -------
+    The scaled optical depths, (1 - ssa * f) * tau, and the scaled single scattering albedos,
+    (1 - f) * ssa / (1 - ssa * f).
+
+    """
+    scattered_forward = single_scattering_albedos * truncation_fractions
+    return (1 - scattered_forward) * optical_depths, \
+        (1 - truncation_fractions) * single_scattering_albedos / (1 - scattered_forward)
+
+
+def _pad_moments(coefficients: np.ndarray, n_moments: int) -> np.ndarray:
+    padding = [(0, 0)] * (coefficients.ndim - 1) + [(0, n_moments - coefficients.shape[-1])]
+    return np.pad(coefficients, padding)
+
+
+class DeltaScaledProperties:
+    """The truncated Legendre coefficients of a set of radiative properties, for any number of streams.
+
+    The tables for each number of streams are computed the first time they're requested and are kept, so every layer
+    and column that's solved with the same number of streams shares them.
+
+    Parameters
+    ----------
+    radiative_properties
+        Anything with a get_legendre_coefficients method that returns (..., moment) coefficients, like
+        WolffRadiativeProperties or SizeDistributionProperties.
+    method
+        How to truncate the coefficients. Can be "delta-m" or "delta-fit".
+
+    Raises
+    ------
+    ValueError
+        Raised if the method isn't one of the known methods.
+
+    """
+    def __init__(self, radiative_properties, method: str = 'delta-m'):
+        if method not in ('delta-m', 'delta-fit'):
+            raise ValueError(f'The method must be "delta-m" or "delta-fit", not {method}.')
+        self._radiative_properties = radiative_properties
+        self._method = method
+        self._tables = {}
+
+    def _get_tables(self, n_streams: int) -> tuple[np.ndarray, np.ndarray]:
+        if n_streams not in self._tables:
+            truncate = get_delta_m_moments if self._method == 'delta-m' else get_delta_fit_moments
+            self._tables[n_streams] = truncate(self._radiative_properties.get_legendre_coefficients(), n_streams)
+        return self._tables[n_streams]
+
+    def get_legendre_coefficients(self, n_streams: int) -> np.ndarray:
+        """Get the scaled Legendre coefficients.
+
+        Parameters
+        ----------
+        n_streams
+            The number of streams of the solver.
+
+        Returns
+        -------
+        The coefficients with shape (..., n_streams).
+
+        """
+        return self._get_tables(n_streams)[0]
+
+    def get_truncation_fractions(self, n_streams: int) -> np.ndarray:
+        """Get the fraction of the scattering that's moved into the forward delta function.
+
+        Parameters
+        ----------
+        n_streams
+            The number of streams of the solver.
+
+        Returns
+        -------
+        The fractions, with the shape of the coefficients without their moment axis.
+
+        """
+        return self._get_tables(n_streams)[1]
@@ -0,0 +1,136 @@
+import numpy as np
+
+from radiative_properties.abstract import AbstractRadiativeProperties
+
+
+class InterpolationWeights:
+    """The table cells and bilinear weights of many (particle size, wavelength) points.
+
+    These are made by RadiativePropertyInterpolator.get_weights and can be used to interpolate any number of tables on
+    the same grid, so the grid is only searched once however many properties are needed.
+
+    Parameters
+    ----------
+    flat_indices
+        The index of each point's 4 surrounding table entries in a table whose (particle size, wavelength) axes are
+        flattened into one, with shape (4, point).
+    weights
+        The weight of each of those entries, with shape (4, point).
+    shape
+        The shape of the points.
+
+    """
+    def __init__(self, flat_indices: np.ndarray, weights: np.ndarray, shape: tuple[int, ...]):
+        self.flat_indices = flat_indices
+        self.weights = weights
+        self.shape = shape
+
+
+class RadiativePropertyInterpolator:
+    """Interpolate radiative properties to arbitrary particle sizes and wavelengths.
+
+    The interpolation is bilinear in the log of the particle size and the log of the wavelength, which is how the
+    properties vary most smoothly across the grids of the files. Each table is read from the radiative properties
+    once and every point is interpolated with a few gathers rather than a loop.
+
+    Parameters
+    ----------
+    radiative_properties
+        The radiative properties to interpolate. Their particle sizes and wavelengths must both be increasing.
+
+    Notes
+    -----
+    Points outside of the grid use the value at its closest edge rather than being extrapolated.
+
+    """
+    def __init__(self, radiative_properties: AbstractRadiativeProperties):
+        self._radiative_properties = radiative_properties
+        self._log_particle_sizes = np.log(np.asarray(radiative_properties.get_particle_sizes(), dtype=float))
+        self._log_wavelengths = np.log(np.asarray(radiative_properties.get_wavelengths(), dtype=float))
+        self._tables = {}
+
+    def get_weights(self, particle_sizes: np.ndarray, wavelengths: np.ndarray) -> InterpolationWeights:
+        """Get the interpolation weights of many points at once.
+
+        Parameters
+        ----------
+        particle_sizes
+            The particle size [microns] of each point.
+        wavelengths
+            The wavelength [microns] of each point. It must broadcast with particle_sizes.
+
+        Returns
+        -------
+        The weights, which can be given to any of this object's other methods.
+
+        """
+        particle_sizes, wavelengths = np.broadcast_arrays(np.asarray(particle_sizes, dtype=float),
+                                                          np.asarray(wavelengths, dtype=float))
+        size_indices, size_weights = self._get_axis_weights(self._log_particle_sizes, np.ravel(particle_sizes))
+        wavelength_indices, wavelength_weights = self._get_axis_weights(self._log_wavelengths, np.ravel(wavelengths))
+        n_wavelengths = self._log_wavelengths.size
+        flat_indices = np.stack([size_indices * n_wavelengths + wavelength_indices,
+                                 size_indices * n_wavelengths + wavelength_indices + 1,
+                                 (size_indices + 1) * n_wavelengths + wavelength_indices,
+                                 (size_indices + 1) * n_wavelengths + wavelength_indices + 1])
+        weights = np.stack([(1 - size_weights) * (1 - wavelength_weights), (1 - size_weights) * wavelength_weights,
+                            size_weights * (1 - wavelength_weights), size_weights * wavelength_weights])
+        return InterpolationWeights(flat_indices, weights, particle_sizes.shape)
+
+    @staticmethod
+    def _get_axis_weights(log_grid: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Get the index of the grid point below each value and the weight of the grid point above it."""
+        if log_grid.size == 1:
+            return np.zeros(values.shape, dtype=int), np.zeros(values.shape)
+        log_values = np.clip(np.log(values), log_grid[0], log_grid[-1])
+        indices = np.clip(np.searchsorted(log_grid, log_values, side='right') - 1, 0, log_grid.size - 2)
+        weights = (log_values - log_grid[indices]) / (log_grid[indices + 1] - log_grid[indices])
+        return indices, weights
+
+    def interpolate(self, table: np.ndarray, weights: InterpolationWeights) -> np.ndarray:
+        """Interpolate any table on the grid of the radiative properties.
+
+        Parameters
+        ----------
+        table
+            The table with shape (particle size, wavelength, ...), like the Legendre coefficients.
+        weights
+            The weights of the points to interpolate to.
+
+        Returns
+        -------
+        The table at each point with shape (point shape, ...). It's in the table's dtype, or float32 if the table is an
+        integer type.
+
+        """
+        table = np.asarray(table)
+        dtype = np.result_type(table.dtype, np.float32)
+        flat_table = np.reshape(table, (-1,) + table.shape[2:])
+        corner_weights = np.expand_dims(weights.weights.astype(dtype, copy=False), tuple(range(2, table.ndim)))
+        # Adding the corners one at a time keeps only one gathered corner in memory at once
+        output = flat_table[weights.flat_indices[0]] * corner_weights[0]
+        for corner in range(1, 4):
+            output += flat_table[weights.flat_indices[corner]] * corner_weights[corner]
+        return np.reshape(output, weights.shape + table.shape[2:])
+
+    def _get_table(self, name: str) -> np.ndarray:
+        if name not in self._tables:
+            self._tables[name] = getattr(self._radiative_properties, f'get_{name}')()
+        return self._tables[name]
+
+    def get_extinction_cross_sections(self, weights: InterpolationWeights) -> np.ndarray:
+        return self.interpolate(self._get_table('extinction_cross_sections'), weights)
+
+    def get_scattering_cross_sections(self, weights: InterpolationWeights) -> np.ndarray:
+        return self.interpolate(self._get_table('scattering_cross_sections'), weights)
+
+    def get_single_scattering_albedos(self, weights: InterpolationWeights) -> np.ndarray:
+        """Get the single scattering albedo at each point.
+
+        It's the ratio of the interpolated scattering and extinction cross sections, so it always agrees with them.
+
+        """
+        return self.get_scattering_cross_sections(weights) / self.get_extinction_cross_sections(weights)
+
+    def get_asymmetry_parameters(self, weights: InterpolationWeights) -> np.ndarray:
+        return self.interpolate(self._get_table('asymmetry_parameters'), weights)
@@ -0,0 +1,95 @@
+import numpy as np
+
+
+# The number of points whose coefficients are summed together. Their coefficients should fit in the CPU cache.
+_points_per_block = 2 ** 14
+
+
+def evaluate_legendre_series(coefficients: np.ndarray, cos_scattering_angles: np.ndarray,
+                             n_moments: int = None) -> np.ndarray:
+    """Evaluate phase functions from their Legendre coefficients at arbitrary scattering angles.
+
+    Parameters
+    ----------
+    coefficients
+        The Legendre coefficients with shape (..., moment), like the output of
+        WolffRadiativeProperties.get_legendre_coefficients. The phase function is sum_l coefficients[l] * P_l(mu), so
+        the first coefficient is 1 for a phase function normalized to 4 pi, and the second is 3 times the asymmetry
+        parameter. The coefficients of particle sizes and wavelengths between those of a file can be made with
+        RadiativePropertyInterpolator.interpolate.
+    cos_scattering_angles
+        The cosine of each scattering angle. It must broadcast with the shape of coefficients without its last axis,
+        so coefficients[..., None, :] and a 1D array of angles give every phase function at every angle.
+    n_moments
+        The number of moments to sum. None sums all of them.
+
+    Returns
+    -------
+    The phase function at each point.
+
+    Notes
+    -----
+    The Legendre polynomials are made with Bonnet's recurrence, (l + 1) P_l+1 = (2l + 1) mu P_l - l P_l-1, so each
+    point only ever needs the current and previous polynomial and every point is evaluated at once.
+
+    """
+    coefficients = np.asarray(coefficients)
+    n_moments = coefficients.shape[-1] if n_moments is None else min(n_moments, coefficients.shape[-1])
+    dtype = np.result_type(coefficients.dtype, np.float32)
+    mu = np.asarray(cos_scattering_angles, dtype=float).astype(dtype, copy=False)
+
+    shape = np.broadcast_shapes(coefficients.shape[:-1], mu.shape)
+    phase_function = np.zeros(shape, dtype=dtype)
+    if not phase_function.size:
+        return phase_function
+    # Broadcasting only makes views, and the points are summed a block at a time so that each block's coefficients
+    # are still in the CPU cache when the next moment is read from them
+    coefficients = np.broadcast_to(coefficients[..., :n_moments], shape + (n_moments,))
+    mu = np.broadcast_to(mu, shape)
+    if not shape:
+        return _evaluate_legendre_block(coefficients, mu, phase_function)
+    rows_per_block = max(_points_per_block * shape[0] // phase_function.size, 1)
+    for start in range(0, shape[0], rows_per_block):
+        block = slice(start, start + rows_per_block)
+        _evaluate_legendre_block(coefficients[block], mu[block], phase_function[block])
+    return phase_function
+
+
+def _evaluate_legendre_block(coefficients: np.ndarray, mu: np.ndarray, output: np.ndarray) -> np.ndarray:
+    # P_-1 is taken to be 0 so that the recurrence makes P_1 from P_0 like any other polynomial
+    previous = np.zeros_like(mu)
+    current = np.ones_like(mu)
+    for moment in range(coefficients.shape[-1]):
+        output += coefficients[..., moment] * current
+        previous, current = current, ((2 * moment + 1) * mu * current - moment * previous) / (moment + 1)
+    return output
+
+
+def get_phase_functions(coefficients: np.ndarray, cos_scattering_angles: np.ndarray,
+                        n_moments: int = None) -> tuple[np.ndarray, np.ndarray]:
+    """Get phase functions at arbitrary scattering angles along with how well they're normalized.
+
+    Parameters
+    ----------
+    coefficients
+        The Legendre coefficients with shape (..., moment). See evaluate_legendre_series.
+    cos_scattering_angles
+        The cosine of each scattering angle. See evaluate_legendre_series.
+    n_moments
+        The number of moments to sum. None sums all of them.
+
+    Returns
+    -------
+    The phase function at each point, and the integral of each phase function over all directions divided by 4 pi,
+    which should be 1. The integral has the shape of coefficients without its last axis.
+
+    Notes
+    -----
+    Every Legendre polynomial but P_0 integrates to 0 over the sphere, so the integral of the (truncated) series is
+    exactly its first coefficient, however many moments are summed. Truncating can make the phase function negative
+    in places, but it doesn't change its normalization.
+
+    """
+    coefficients = np.asarray(coefficients)
+    phase_functions = evaluate_legendre_series(coefficients, cos_scattering_angles, n_moments)
+    return phase_functions, coefficients[..., 0].astype(phase_functions.dtype, copy=False)
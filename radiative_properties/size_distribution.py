@@ -0,0 +1,211 @@
+import hashlib
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from caching.file_cache import FieldCache
+from radiative_properties.abstract import AbstractRadiativeProperties
+
+
+def get_lognormal_distribution(particle_sizes: np.ndarray, effective_radii: np.ndarray,
+                               effective_variances: np.ndarray) -> np.ndarray:
+    """Get the log of a lognormal size distribution, up to a constant for each distribution.
+
+    Parameters
+    ----------
+    particle_sizes
+        The particle radii [microns] to evaluate the distribution at.
+    effective_radii
+        The effective radius [microns] of each distribution. It must broadcast with particle_sizes.
+    effective_variances
+        The (unitless) effective variance of each distribution. It must broadcast with particle_sizes.
+
+    Returns
+    -------
+    The log of the number of particles per unit radius.
+
+    Notes
+    -----
+    The distribution has ln(sigma)**2 = ln(1 + veff) and a geometric mean radius of reff / (1 + veff)**2.5 (Hansen &
+    Travis 1974).
+
+    """
+    log_variance = np.log1p(effective_variances)
+    log_mean_radius = np.log(effective_radii) - 2.5 * log_variance
+    return -np.log(particle_sizes) - (np.log(particle_sizes) - log_mean_radius) ** 2 / (2 * log_variance)
+
+
+def get_gamma_distribution(particle_sizes: np.ndarray, effective_radii: np.ndarray,
+                           effective_variances: np.ndarray) -> np.ndarray:
+    """Get the log of a gamma size distribution, up to a constant for each distribution.
+
+    Parameters
+    ----------
+    particle_sizes
+        The particle radii [microns] to evaluate the distribution at.
+    effective_radii
+        The effective radius [microns] of each distribution. It must broadcast with particle_sizes.
+    effective_variances
+        The (unitless) effective variance of each distribution. It must broadcast with particle_sizes.
+
+    Returns
+    -------
+    The log of the number of particles per unit radius.
+
+    Notes
+    -----
+    This is the "standard gamma distribution" of Hansen & Travis (1974): r**((1 - 3 veff) / veff) exp(-r / (reff veff)).
+
+    """
+    return (1 - 3 * effective_variances) / effective_variances * np.log(particle_sizes) - \
+        particle_sizes / (effective_radii * effective_variances)
+
+
+size_distributions = {'lognormal': get_lognormal_distribution, 'gamma': get_gamma_distribution}
+
+
+class SizeDistributionProperties:
+    """Radiative properties averaged over particle size distributions on a grid of effective radii and variances.
+
+    The cross sections are averages over the number of particles. The asymmetry parameter and Legendre coefficients
+    are averages weighted by how much each particle size scatters, so the Legendre coefficients stay normalized. Every
+    point of the grid is integrated at once, as one matrix product against the tables.
+
+    Parameters
+    ----------
+    radiative_properties
+        The radiative properties to integrate. The integral is a trapezoidal sum over their particle sizes, so it's
+        only as fine as their grid.
+    effective_radii
+        The 1D effective radii [microns] of the distributions.
+    effective_variances
+        The 1D effective variances of the distributions.
+    distribution
+        The shape of the distributions. Can be "lognormal" or "gamma".
+    cache_directory
+        A directory to cache the integrated tables in. If it's given, each table is computed the first time it's
+        requested and afterwards is memory mapped from disk. The tables are recomputed if the file of the radiative
+        properties changes.
+
+    Raises
+    ------
+    ValueError
+        Raised if the distribution isn't one of the known shapes.
+
+    """
+    def __init__(self, radiative_properties: AbstractRadiativeProperties, effective_radii: np.ndarray,
+                 effective_variances: np.ndarray, distribution: str = 'lognormal', cache_directory: Path = None):
+        if distribution not in size_distributions:
+            raise ValueError(f'The distribution must be one of {list(size_distributions)}, not {distribution}.')
+        self._radiative_properties = radiative_properties
+        self._effective_radii = np.asarray(effective_radii, dtype=float)
+        self._effective_variances = np.asarray(effective_variances, dtype=float)
+        self._distribution = distribution
+        self._cache = None if cache_directory is None else \
+            FieldCache(cache_directory, [radiative_properties.filepath])
+        self._tables = {}
+        self._weights = None
+
+    def get_effective_radii(self) -> np.ndarray:
+        return self._effective_radii
+
+    def get_effective_variances(self) -> np.ndarray:
+        return self._effective_variances
+
+    def get_size_weights(self) -> np.ndarray:
+        """Get how much each particle size of the tables counts towards each distribution.
+
+        Returns
+        -------
+        The weights with shape (effective radius, effective variance, particle size). Each distribution's weights add
+        up to 1.
+
+        """
+        if self._weights is None:
+            particle_sizes = np.asarray(self._radiative_properties.get_particle_sizes(), dtype=float)
+            # The trapezoidal rule gives each size half of the spacing on each side of it
+            half_spacings = np.diff(particle_sizes) / 2
+            widths = np.zeros(particle_sizes.shape)
+            widths[:-1] += half_spacings
+            widths[1:] += half_spacings
+            log_number = size_distributions[self._distribution](particle_sizes, self._effective_radii[:, None, None],
+                                                                self._effective_variances[None, :, None])
+            number = np.exp(log_number - np.max(log_number, axis=-1, keepdims=True))
+            weights = number * widths
+            self._weights = weights / np.sum(weights, axis=-1, keepdims=True)
+        return self._weights
+
+    def get_extinction_cross_sections(self) -> np.ndarray:
+        """Get the mean extinction cross section of the particles in each distribution.
+
+        Returns
+        -------
+        The cross sections with shape (effective radius, effective variance, wavelength).
+
+        """
+        return self._get_table('extinction_cross_sections',
+                               lambda: self._integrate(self._radiative_properties.get_extinction_cross_sections()))
+
+    def get_scattering_cross_sections(self) -> np.ndarray:
+        """Get the mean scattering cross section of the particles in each distribution.
+
+        Returns
+        -------
+        The cross sections with shape (effective radius, effective variance, wavelength).
+
+        """
+        return self._get_table('scattering_cross_sections',
+                               lambda: self._integrate(self._radiative_properties.get_scattering_cross_sections()))
+
+    def get_single_scattering_albedos(self) -> np.ndarray:
+        return self.get_scattering_cross_sections() / self.get_extinction_cross_sections()
+
+    def get_asymmetry_parameters(self) -> np.ndarray:
+        """Get the asymmetry parameter of each distribution.
+
+        Returns
+        -------
+        The asymmetry parameters with shape (effective radius, effective variance, wavelength).
+
+        """
+        return self._get_table('asymmetry_parameters', lambda: self._integrate_scattering_weighted(
+            self._radiative_properties.get_asymmetry_parameters()))
+
+    def get_legendre_coefficients(self) -> np.ndarray:
+        """Get the Legendre coefficients of the phase function of each distribution.
+
+        This only works for radiative properties that have Legendre coefficients, like Wolff's.
+
+        Returns
+        -------
+        The coefficients with shape (effective radius, effective variance, wavelength, moment).
+
+        """
+        return self._get_table('legendre_coefficients', lambda: self._integrate_scattering_weighted(
+            self._radiative_properties.get_legendre_coefficients()))
+
+    def _integrate(self, table: np.ndarray) -> np.ndarray:
+        """Integrate a (particle size, wavelength, ...) table over every distribution."""
+        table = np.asarray(table, dtype=float)
+        return np.tensordot(self.get_size_weights(), table, axes=(-1, 0))
+
+    def _integrate_scattering_weighted(self, table: np.ndarray) -> np.ndarray:
+        scattering_cross_sections = np.asarray(self._radiative_properties.get_scattering_cross_sections(), dtype=float)
+        table = np.asarray(table, dtype=float)
+        weighted_table = table * np.expand_dims(scattering_cross_sections, tuple(range(2, table.ndim)))
+        return self._integrate(weighted_table) / np.expand_dims(self._integrate(scattering_cross_sections),
+                                                                tuple(range(3, table.ndim + 1)))
+
+    def _get_table(self, name: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        if name not in self._tables:
+            dtype = self._radiative_properties.dtype
+            dtype = np.dtype(np.float64) if dtype is None else dtype
+            self._tables[name] = compute().astype(dtype, copy=False) if self._cache is None else \
+                self._cache.get(self._make_key(name), lambda: compute().astype(dtype, copy=False))
+        return self._tables[name]
+
+    def _make_key(self, name: str) -> str:
+        grid = hashlib.sha1(self._effective_radii.tobytes() + b'|' + self._effective_variances.tobytes()).hexdigest()
+        dtype = self._radiative_properties.dtype
+        return f'{name}-{self._distribution}-{grid}' + ('' if dtype is None else f'-{dtype}')
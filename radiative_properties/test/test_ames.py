@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from radiative_properties.ames import AmesRadiativeProperties
+
+
+@pytest.fixture
+def radprop() -> np.ndarray:
+    return np.random.default_rng(0).random((3 * 4, 12))
+
+
+@pytest.fixture
+def properties(radprop, monkeypatch):
+    monkeypatch.setattr(AmesRadiativeProperties, '_find_file', lambda self, aerosol, version: None)
+    monkeypatch.setattr(AmesRadiativeProperties, 'open_file', lambda self, aerosol, version: radprop)
+    return AmesRadiativeProperties('dust', 1, dtype=np.float32)
+
+
+class TestAmesRadiativeProperties:
+    def test_properties_are_every_third_row(self, properties, radprop):
+        assert np.array_equal(properties.get_extinction_cross_sections(), radprop[[0, 3, 6, 9]].astype(np.float32))
+        assert np.array_equal(properties.get_scattering_cross_sections(), radprop[[1, 4, 7, 10]].astype(np.float32))
+        assert np.array_equal(properties.get_asymmetry_parameters(), radprop[[2, 5, 8, 11]].astype(np.float32))
+
+    def test_file_is_only_converted_once(self, properties):
+        extinction = properties.get_extinction_cross_sections()
+        assert extinction.dtype == np.float32
+        assert np.shares_memory(extinction, properties.get_extinction_cross_sections())
+        assert np.may_share_memory(extinction, properties.get_asymmetry_parameters())
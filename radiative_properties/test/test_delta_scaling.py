@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from radiative_properties.delta_scaling import DeltaScaledProperties, get_delta_fit_moments, get_delta_m_moments, \
+    scale_optical_properties
+
+
+@pytest.fixture
+def asymmetry_parameters() -> np.ndarray:
+    return np.array([0.5, 0.7, 0.85])
+
+
+@pytest.fixture
+def henyey_greenstein_coefficients(asymmetry_parameters) -> np.ndarray:
+    degrees = np.arange(200)
+    return (2 * degrees + 1) * asymmetry_parameters[:, None] ** degrees
+
+
+class TestGetDeltaMMoments:
+    def test_henyey_greenstein_phase_function_gives_expected_answer(self, henyey_greenstein_coefficients,
+                                                                    asymmetry_parameters):
+        scaled, fraction = get_delta_m_moments(henyey_greenstein_coefficients, 16)
+        assert np.allclose(fraction, asymmetry_parameters ** 16)
+        assert np.allclose(scaled[:, 1] / 3, (asymmetry_parameters - fraction) / (1 - fraction))
+
+    def test_fewer_moments_than_streams_are_not_truncated(self, henyey_greenstein_coefficients):
+        scaled, fraction = get_delta_m_moments(henyey_greenstein_coefficients[:, :4], 8)
+        assert np.all(fraction == 0) and np.array_equal(scaled[:, :4], henyey_greenstein_coefficients[:, :4])
+
+
+class TestGetDeltaFitMoments:
+    def test_phase_function_with_fewer_moments_than_streams_is_fit_exactly(self, henyey_greenstein_coefficients):
+        coefficients = np.concatenate([henyey_greenstein_coefficients[:, :8], np.zeros((3, 30))], axis=-1)
+        scaled, fraction = get_delta_fit_moments(coefficients, 16)
+        assert np.allclose(fraction, 0) and np.allclose(scaled, coefficients[:, :16])
+
+    def test_scaled_moments_are_normalized(self, henyey_greenstein_coefficients):
+        scaled, _ = get_delta_fit_moments(henyey_greenstein_coefficients, 16, tables_per_block=2)
+        assert np.allclose(scaled[:, 0], 1)
+
+
+class TestScaleOpticalProperties:
+    def test_nothing_truncated_gives_the_input(self):
+        optical_depths, single_scattering_albedos = scale_optical_properties(np.ones((2, 3)), 0.9, 0)
+        assert np.allclose(optical_depths, 1) and np.allclose(single_scattering_albedos, 0.9)
+
+    def test_scattering_optical_depth_loses_the_truncated_fraction(self):
+        optical_depths, single_scattering_albedos = scale_optical_properties(2, 0.9, 0.2)
+        assert np.isclose(optical_depths * single_scattering_albedos, 2 * 0.9 * 0.8)
+
+
+class TestDeltaScaledProperties:
+    def test_unknown_method_raises_value_error(self):
+        with pytest.raises(ValueError):
+            DeltaScaledProperties(None, 'delta-isotropic')
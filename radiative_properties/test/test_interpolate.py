@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from radiative_properties.interpolate import RadiativePropertyInterpolator
+
+
+class FakeRadiativeProperties:
+    def __init__(self):
+        rng = np.random.default_rng(0)
+        self.extinction_cross_sections = rng.random((4, 5)) + 1
+        self.scattering_cross_sections = self.extinction_cross_sections * rng.random((4, 5))
+
+    @staticmethod
+    def get_particle_sizes() -> np.ndarray:
+        return np.array([0.1, 0.5, 1, 5])
+
+    @staticmethod
+    def get_wavelengths() -> np.ndarray:
+        return np.array([0.2, 0.3, 1, 10, 50])
+
+    def get_extinction_cross_sections(self) -> np.ndarray:
+        return self.extinction_cross_sections
+
+    def get_scattering_cross_sections(self) -> np.ndarray:
+        return self.scattering_cross_sections
+
+
+class TestRadiativePropertyInterpolator:
+    @pytest.fixture
+    def properties(self) -> FakeRadiativeProperties:
+        return FakeRadiativeProperties()
+
+    @pytest.fixture
+    def interpolator(self, properties) -> RadiativePropertyInterpolator:
+        return RadiativePropertyInterpolator(properties)
+
+    def test_grid_points_give_the_table(self, interpolator, properties):
+        weights = interpolator.get_weights(properties.get_particle_sizes()[:, None], properties.get_wavelengths())
+        assert np.allclose(interpolator.get_extinction_cross_sections(weights), properties.extinction_cross_sections)
+
+    def test_point_between_grid_points_gives_expected_answer(self, interpolator, properties):
+        # Half way between 0.1 and 0.5 microns in log space, and exactly on 1 micron
+        weights = interpolator.get_weights(np.sqrt(0.05), 1)
+        expected = np.mean(properties.extinction_cross_sections[:2, 2])
+        assert np.isclose(interpolator.get_extinction_cross_sections(weights), expected)
+
+    def test_points_outside_the_grid_use_its_edge(self, interpolator, properties):
+        weights = interpolator.get_weights([0.01, 100], [0.01, 100])
+        assert np.allclose(interpolator.get_extinction_cross_sections(weights),
+                           properties.extinction_cross_sections[[0, -1], [0, -1]])
+
+    def test_single_scattering_albedo_is_ratio_of_cross_sections(self, interpolator):
+        weights = interpolator.get_weights(np.geomspace(0.1, 5, 7), np.geomspace(0.2, 50, 7))
+        assert np.allclose(interpolator.get_single_scattering_albedos(weights),
+                           interpolator.get_scattering_cross_sections(weights) /
+                           interpolator.get_extinction_cross_sections(weights))
+
+    def test_extra_table_axes_are_kept(self, interpolator):
+        weights = interpolator.get_weights(np.ones((2, 3)), 1)
+        assert interpolator.interpolate(np.ones((4, 5, 8), dtype=np.float32), weights).shape == (2, 3, 8)
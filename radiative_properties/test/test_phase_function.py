@@ -0,0 +1,35 @@
+import numpy as np
+from numpy.polynomial import legendre
+import pytest
+
+from radiative_properties.phase_function import evaluate_legendre_series, get_phase_functions
+
+
+class TestEvaluateLegendreSeries:
+    @pytest.fixture
+    def coefficients(self) -> np.ndarray:
+        coefficients = np.random.default_rng(0).random((3, 4, 20))
+        coefficients[..., 0] = 1
+        return coefficients
+
+    @pytest.fixture
+    def cos_scattering_angles(self) -> np.ndarray:
+        return np.cos(np.radians(np.linspace(0, 180, 37)))
+
+    def test_every_angle_matches_numpy_legval(self, coefficients, cos_scattering_angles):
+        phase_functions = evaluate_legendre_series(coefficients[..., None, :], cos_scattering_angles)
+        for index in np.ndindex(coefficients.shape[:-1]):
+            assert np.allclose(phase_functions[index], legendre.legval(cos_scattering_angles, coefficients[index]))
+
+    def test_truncation_only_sums_the_first_moments(self, coefficients, cos_scattering_angles):
+        phase_functions = evaluate_legendre_series(coefficients[..., None, :], cos_scattering_angles, n_moments=5)
+        assert np.allclose(phase_functions[1, 2], legendre.legval(cos_scattering_angles, coefficients[1, 2, :5]))
+
+    def test_one_angle_per_phase_function_gives_expected_shape(self, coefficients):
+        assert evaluate_legendre_series(coefficients, np.zeros((3, 4))).shape == (3, 4)
+
+
+class TestGetPhaseFunctions:
+    def test_isotropic_phase_function_is_normalized(self):
+        phase_functions, normalization = get_phase_functions(np.array([1, 0, 0]), np.linspace(-1, 1, 5))
+        assert np.allclose(phase_functions, 1) and normalization == 1
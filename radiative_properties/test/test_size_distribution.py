@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from radiative_properties.size_distribution import SizeDistributionProperties
+
+
+class FakeRadiativeProperties:
+    def __init__(self, filepath: Path):
+        self.filepath = filepath
+        self.dtype = None
+        self.particle_sizes = np.geomspace(0.05, 20, 400)
+        self.scattering_cross_sections = np.pi * self.particle_sizes[:, None] ** 2 * np.array([1, 2])
+        rng = np.random.default_rng(0)
+        self.legendre_coefficients = np.concatenate([np.ones((400, 2, 1)), rng.random((400, 2, 4))], axis=-1)
+
+    def get_particle_sizes(self) -> np.ndarray:
+        return self.particle_sizes
+
+    def get_scattering_cross_sections(self) -> np.ndarray:
+        return self.scattering_cross_sections
+
+    def get_legendre_coefficients(self) -> np.ndarray:
+        return self.legendre_coefficients
+
+
+class TestSizeDistributionProperties:
+    @pytest.fixture
+    def properties(self, tmp_path) -> FakeRadiativeProperties:
+        filepath = tmp_path / 'dust01.fits'
+        filepath.write_bytes(b'')
+        return FakeRadiativeProperties(filepath)
+
+    @pytest.mark.parametrize('distribution', ['lognormal', 'gamma'])
+    def test_distributions_have_the_expected_effective_radius_and_variance(self, properties, distribution):
+        integrated = SizeDistributionProperties(properties, [0.5, 1.5], [0.1, 0.3], distribution)
+        weights = integrated.get_size_weights()
+        area = np.sum(weights * properties.particle_sizes ** 2, axis=-1)
+        effective_radii = np.sum(weights * properties.particle_sizes ** 3, axis=-1) / area
+        effective_variances = np.sum(weights * properties.particle_sizes ** 2 *
+                                     (properties.particle_sizes - effective_radii[..., None]) ** 2, axis=-1) / \
+            area / effective_radii ** 2
+        assert np.allclose(effective_radii, [[0.5], [1.5]], rtol=0.01)
+        assert np.allclose(effective_variances, [0.1, 0.3], rtol=0.01)
+
+    def test_legendre_coefficients_stay_normalized(self, properties):
+        integrated = SizeDistributionProperties(properties, [0.5, 1.5], [0.1, 0.3])
+        assert np.allclose(integrated.get_legendre_coefficients()[..., 0], 1)
+
+    def test_cached_table_matches_computed_table(self, properties, tmp_path):
+        computed = SizeDistributionProperties(properties, [1], [0.2]).get_scattering_cross_sections()
+        SizeDistributionProperties(properties, [1], [0.2], cache_directory=tmp_path).get_scattering_cross_sections()
+        cached = SizeDistributionProperties(properties, [1], [0.2], cache_directory=tmp_path)
+        assert isinstance(cached.get_scattering_cross_sections(), np.memmap)
+        assert np.array_equal(cached.get_scattering_cross_sections(), computed)
+
+    def test_unknown_distribution_raises_value_error(self, properties):
+        with pytest.raises(ValueError):
+            SizeDistributionProperties(properties, [1], [0.2], 'bimodal')
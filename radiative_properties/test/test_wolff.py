@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from astropy.io import fits
+import numpy as np
+import pytest
+
+from radiative_properties.wolff import WolffRadiativeProperties
+
+
+@pytest.fixture
+def wolff_file(tmp_path, monkeypatch) -> Path:
+    rng = np.random.default_rng(0)
+    primary = fits.PrimaryHDU()
+    primary.header['date'] = '2020-01-01'
+    extensions = {'forw': rng.random((4, 5, 3)), 'pmom': rng.random((8, 4, 5)), 'phsfn': rng.random((7, 4, 5)),
+                  'expansion': rng.random((7, 4, 5)), 'particle_sizes': np.geomspace(0.1, 5, 4),
+                  'wavelengths': np.geomspace(0.2, 50, 5), 'scattering_angle': np.linspace(0, 180, 7)}
+    filepath = tmp_path / 'dust01.fits.gz'
+    fits.HDUList([primary] + [fits.ImageHDU(data, name=name) for name, data in extensions.items()]).writeto(filepath)
+    monkeypatch.setattr(WolffRadiativeProperties, '_find_file', lambda self, aerosol, version: filepath)
+    return filepath
+
+
+class TestWolffRadiativeProperties:
+    def test_cached_file_gives_the_same_properties(self, wolff_file, tmp_path):
+        with WolffRadiativeProperties('dust', 1) as properties:
+            coefficients = properties.get_legendre_coefficients().copy()
+            asymmetry_parameters = properties.get_asymmetry_parameters().copy()
+        with WolffRadiativeProperties('dust', 1, cache_directory=tmp_path / 'cache') as properties:
+            assert np.array_equal(properties.get_legendre_coefficients(), coefficients)
+            assert np.array_equal(properties.get_asymmetry_parameters(), asymmetry_parameters)
+
+    def test_cached_file_is_only_written_once(self, wolff_file, tmp_path):
+        WolffRadiativeProperties('dust', 1, cache_directory=tmp_path / 'cache').close()
+        cached_file = next((tmp_path / 'cache').iterdir())
+        modification_time = cached_file.stat().st_mtime_ns
+        with WolffRadiativeProperties('dust', 1, cache_directory=tmp_path / 'cache') as properties:
+            assert properties.get_file_creation_date() == '2020-01-01'
+        assert cached_file.stat().st_mtime_ns == modification_time
+
+    def test_cached_moments_are_contiguous_views(self, wolff_file, tmp_path):
+        with WolffRadiativeProperties('dust', 1, cache_directory=tmp_path / 'cache') as properties:
+            coefficients = properties.get_legendre_coefficients()
+            assert coefficients.shape == (4, 5, 8) and coefficients.flags['C_CONTIGUOUS']
+            assert np.shares_memory(coefficients, properties.get_legendre_coefficients())
+
+    @pytest.mark.parametrize('cached', [False, True])
+    def test_converted_tables_are_only_converted_once(self, wolff_file, tmp_path, cached):
+        cache_directory = tmp_path / 'cache' if cached else None
+        with WolffRadiativeProperties('dust', 1, dtype=np.float32, cache_directory=cache_directory) as properties:
+            coefficients = properties.get_legendre_coefficients()
+            assert coefficients.dtype == np.float32 and properties.get_legendre_coefficients() is coefficients
+            # The forward scattering properties are interleaved views of the same converted table
+            assert np.may_share_memory(properties.get_scattering_cross_sections(),
+                                       properties.get_asymmetry_parameters())
+
+    def test_default_dtype_set_later_is_used(self, wolff_file, monkeypatch):
+        with WolffRadiativeProperties('dust', 1) as properties:
+            assert properties.get_phase_functions().dtype.itemsize == 8
+            monkeypatch.setattr(WolffRadiativeProperties, 'default_dtype', np.dtype(np.float32))
+            assert properties.get_phase_functions().dtype == np.float32
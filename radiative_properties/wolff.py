@@ -1,8 +1,10 @@
+import os
 from pathlib import Path
 
 from astropy.io import fits
 import numpy as np
 
+from caching.file_cache import get_file_signature
 from radiative_properties.abstract import AbstractRadiativeProperties
 
 
@@ -15,6 +17,15 @@ class WolffRadiativeProperties(AbstractRadiativeProperties):
         The aerosol to get the radiative properties of. Can be "dust" or "ice".
     version
         The version of the aerosol's radiative properties.
+    dtype
+        The dtype to return the radiative properties as, like np.float32. The default uses the class's default_dtype,
+        which keeps the dtype in the file unless set_default_dtype was called. Each table is converted once, the first
+        time it's used in a dtype, and is kept so that later calls return it (or views of it) without copying.
+    cache_directory
+        A directory to keep an uncompressed copy of the file in. If it's given, the file is converted the first time
+        it's used: it's decompressed, and the phase functions and Legendre coefficients are stored with their
+        (particle size, wavelength, ...) axis order. Afterwards the copy is memory mapped, so opening it is nearly
+        instant and the getters return views of it rather than copies. The copy is remade if the file changes.
 
     Raises
     ------
@@ -22,16 +33,74 @@ class WolffRadiativeProperties(AbstractRadiativeProperties):
         Raised if the input aerosol and version don't point to a valid file.
 
     """
-    def __init__(self, aerosol: str, version: int):
+    # The extensions whose first axis is moved to the end by the getters
+    _moment_extensions = ('phsfn', 'pmom', 'expansion')
+
+    def __init__(self, aerosol: str, version: int, dtype: np.dtype = None, cache_directory: Path = None):
+        self._dtype = None if dtype is None else np.dtype(dtype)
         self._location = Path('/media/kyle/iuvs/radiative_properties/wolff')
-        self.hdul = self._open_file(aerosol, version)
+        self.filepath = self._find_file(aerosol, version)
+        # The cached copy already has the axis order that the getters return
+        self._transposed = cache_directory is not None
+        self.hdul = self._open_file(self.filepath) if cache_directory is None else \
+            self._open_file(self._get_cached_file(Path(cache_directory)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    def _open_file(self, aerosol: str, version: int):
+    def close(self) -> None:
+        """Close the file. Arrays that were returned from it can't be used afterwards if it was memory mapped."""
+        self.hdul.close()
+
+    def _find_file(self, aerosol: str, version: int) -> Path:
         file_pattern = f'{aerosol}{version:02}*'
         filepath = list(self._location.glob(file_pattern))
         if not filepath:
             raise FileNotFoundError(f'Cannot find a file with at location {self._location}')
-        return fits.open(filepath[0])
+        return filepath[0]
+
+    @staticmethod
+    def _open_file(filepath: Path):
+        # Only the extensions that are used are ever read, and uncompressed files are memory mapped rather than read
+        return fits.open(filepath, memmap=True, lazy_load_hdus=True)
+
+    def _get_cached_file(self, cache_directory: Path) -> Path:
+        """Get the uncompressed, transposed copy of the file, making it first if it doesn't exist or is stale."""
+        stem = self.filepath.name.split('.')[0]
+        cached_file = cache_directory / f'{stem}.{get_file_signature([self.filepath])}.fits'
+        if not cached_file.exists():
+            cache_directory.mkdir(parents=True, exist_ok=True)
+            for stale_file in cache_directory.glob(f'{stem}.*.fits'):
+                stale_file.unlink(missing_ok=True)
+            self._write_cached_file(cached_file)
+        return cached_file
+
+    def _write_cached_file(self, cached_file: Path) -> None:
+        hdus = []
+        with fits.open(self.filepath) as source:
+            for hdu in source:
+                if not isinstance(hdu, (fits.PrimaryHDU, fits.ImageHDU, fits.CompImageHDU)):
+                    hdus.append(hdu.copy())
+                    continue
+                data = hdu.data
+                if hdu.name.lower() in self._moment_extensions:
+                    data = np.ascontiguousarray(np.moveaxis(data, 0, -1))
+                # The data is already scaled, so the copy mustn't scale it again
+                header = hdu.header.copy()
+                for keyword in ('BSCALE', 'BZERO', 'BLANK'):
+                    header.remove(keyword, ignore_missing=True)
+                hdus.append(fits.PrimaryHDU(data, header) if isinstance(hdu, fits.PrimaryHDU) else
+                            fits.ImageHDU(data, header, name=hdu.name))
+            # Write to a temporary name first so that a crash never leaves a partial copy behind
+            temporary_file = cached_file.with_name(f'{cached_file.name}.{os.getpid()}.tmp')
+            fits.HDUList(hdus).writeto(temporary_file, overwrite=True)
+        os.replace(temporary_file, cached_file)
+
+    def _move_moment_axis(self, table: np.ndarray) -> np.ndarray:
+        return table if self._transposed else np.moveaxis(table, 0, -1)
 
     def _get_file_forward_scattering_properties(self) -> np.ndarray:
         return self.hdul['forw'].data
@@ -79,23 +148,28 @@ class WolffRadiativeProperties(AbstractRadiativeProperties):
     def get_scattering_angles(self) -> np.ndarray:
         return self.hdul['scattering_angle'].data
 
+    def _get_forward_scattering_properties(self) -> np.ndarray:
+        return self._get_converted_table('forw', self._get_file_forward_scattering_properties)
+
     def get_scattering_cross_sections(self) -> np.ndarray:
-        return self._get_file_forward_scattering_properties()[..., 1]
+        return self._get_forward_scattering_properties()[..., 1]
 
     def get_extinction_cross_sections(self) -> np.ndarray:
-        return self._get_file_forward_scattering_properties()[..., 0]
+        return self._get_forward_scattering_properties()[..., 0]
 
     def get_asymmetry_parameters(self) -> np.ndarray:
-        return self._get_file_forward_scattering_properties()[..., 2]
+        return self._get_forward_scattering_properties()[..., 2]
 
     def get_phase_functions(self) -> np.ndarray:
-        return np.moveaxis(self._get_file_phase_function(), 0, -1)
+        return self._get_converted_table('phsfn', lambda: self._move_moment_axis(self._get_file_phase_function()))
 
     def get_legendre_coefficients(self) -> np.ndarray:
-        return np.moveaxis(self._get_file_legendre_coefficients(), 0, -1)
+        return self._get_converted_table('pmom',
+                                         lambda: self._move_moment_axis(self._get_file_legendre_coefficients()))
 
     def get_phase_function_reexpansions(self) -> np.ndarray:
-        return np.moveaxis(self._get_file_phase_function_reexpansion(), 0, -1)
+        return self._get_converted_table(
+            'expansion', lambda: self._move_moment_axis(self._get_file_phase_function_reexpansion()))
 
     def _get_header(self) -> fits.header.Header:
         return self.hdul['primary'].header